@@ -13,9 +13,8 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import collections
 import math
-import tulipy
-import numpy as np
 
 import octobot_commons.constants as commons_constants
 import octobot_commons.enums as commons_enums
@@ -24,6 +23,71 @@ import octobot_evaluators.evaluators as evaluators
 import octobot_evaluators.util as evaluators_util
 
 
+class RollingSegments:
+    """
+    Ring buffer of the latest candles values and running sum of each segment (the last segment values):
+    segments means are updated in O(number of segments) on each candle
+    """
+    # running sums are recomputed from buffered values after this number of pushes not to accumulate floating
+    # point errors
+    SUMS_REFRESH_INTERVAL = 1000
+
+    def __init__(self, segments, max_size=None):
+        self.values = collections.deque(maxlen=max_size or max(segments, default=0))
+        # a segment can't be larger than the buffer
+        self._windows = {segment: min(segment, self.values.maxlen) for segment in segments}
+        self._sums = {}
+        # nan values are not summed: segments including nan values have a nan mean, as np.mean
+        self._nan_counts = {}
+        self._pushes_since_refresh = 0
+        self._refresh_sums()
+
+    def reset(self, values):
+        self.values.clear()
+        self.values.extend(values)
+        self._refresh_sums()
+
+    def push(self, value):
+        if self._pushes_since_refresh >= self.SUMS_REFRESH_INTERVAL:
+            self.values.append(value)
+            self._refresh_sums()
+            return
+        for segment, window in self._windows.items():
+            if len(self.values) >= window:
+                # the oldest segment value is evicted
+                self._update_sum(segment, self.values[-window], -1)
+            self._update_sum(segment, value, 1)
+        self.values.append(value)
+        self._pushes_since_refresh += 1
+
+    def mean(self, segment):
+        values_count = min(self._windows[segment], len(self.values))
+        if values_count == 0 or self._nan_counts[segment]:
+            # nothing to average or nan in segment, as np.mean
+            return math.nan
+        return self._sums[segment] / values_count
+
+    def _update_sum(self, segment, value, sign):
+        if math.isnan(value):
+            self._nan_counts[segment] += sign
+        else:
+            self._sums[segment] += sign * value
+
+    def _refresh_sums(self):
+        for segment, window in self._windows.items():
+            segment_values = list(self.values)[-window:] if self.values else []
+            self._nan_counts[segment] = sum(1 for value in segment_values if math.isnan(value))
+            self._sums[segment] = math.fsum(value for value in segment_values if not math.isnan(value))
+        self._pushes_since_refresh = 0
+
+
+def _is_next_candle(previous_candle_time, candle, time_frame):
+    return previous_candle_time is not None and \
+        candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value] - previous_candle_time == \
+        commons_enums.TimeFramesMinutes[commons_enums.TimeFrames(time_frame)] * \
+        commons_constants.MINUTE_TO_SECONDS
+
+
 class InstantFluctuationsEvaluator(evaluators.RealTimeEvaluator):
     """
     Idea: moves are lasting approx 12min
@@ -54,6 +118,11 @@ class InstantFluctuationsEvaluator(evaluators.RealTimeEvaluator):
         self.MIN_TRIGGERING_DELTA = 0.15
         self.candle_segments = [10, 8, 6, 5, 4, 3, 2, 1]
 
+        # rolling state, updated on each closed candle
+        self.rolling_prices = RollingSegments(self.candle_segments)
+        self.rolling_volumes = RollingSegments(self.candle_segments)
+        self.last_candle_time = None
+
     def init_user_inputs(self, inputs: dict) -> None:
         """
         Called right before starting the tentacle, should define all the tentacle's user inputs unless
@@ -75,19 +144,26 @@ class InstantFluctuationsEvaluator(evaluators.RealTimeEvaluator):
 
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle):
-        volume_data = self.get_symbol_candles(exchange, exchange_id, symbol, time_frame). \
-            get_symbol_volume_candles(self.candle_segments[0])
-        close_data = self.get_symbol_candles(exchange, exchange_id, symbol, time_frame). \
-            get_symbol_close_candles(self.candle_segments[0])
-        for segment in self.candle_segments:
-            volume_data = [d for d in volume_data[-segment:] if d is not None]
-            price_data = [d for d in close_data[-segment:] if d is not None]
-            self.average_volumes[segment] = np.mean(volume_data)
-            self.average_prices[segment] = np.mean(price_data)
+        if _is_next_candle(self.last_candle_time, candle, time_frame):
+            self.rolling_prices.push(candle[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value])
+            self.rolling_volumes.push(candle[commons_enums.PriceIndexes.IND_PRICE_VOL.value])
+        else:
+            # first candle or missed candles: (re)initialize rolling state from candles history
+            symbol_candles = self.get_symbol_candles(exchange, exchange_id, symbol, time_frame)
+            self.rolling_volumes.reset(
+                d for d in symbol_candles.get_symbol_volume_candles(self.candle_segments[0]) if d is not None
+            )
+            self.rolling_prices.reset(
+                d for d in symbol_candles.get_symbol_close_candles(self.candle_segments[0]) if d is not None
+            )
+        self.last_candle_time = candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value]
 
         try:
-            self.last_volume = volume_data[-1]
-            self.last_price = close_data[-1]
+            self.last_volume = self.rolling_volumes.values[-1]
+            self.last_price = self.rolling_prices.values[-1]
+            for segment in self.candle_segments:
+                self.average_volumes[segment] = self.rolling_volumes.mean(segment)
+                self.average_prices[segment] = self.rolling_prices.mean(segment)
             await self._trigger_evaluation(cryptocurrency, symbol,
                                            evaluators_util.get_eval_time(full_candle=candle, time_frame=time_frame))
         except IndexError:
@@ -182,11 +258,16 @@ class InstantFluctuationsEvaluator(evaluators.RealTimeEvaluator):
 
 
 class InstantMAEvaluator(evaluators.RealTimeEvaluator):
+    # moving average is only computed when more than period candles are available among the last MAX_CANDLES_COUNT
+    MAX_CANDLES_COUNT = 20
 
     def __init__(self, tentacles_setup_config):
         super().__init__(tentacles_setup_config)
         self.last_candle_data = {}
         self.last_moving_average_values = {}
+        # rolling state by symbol, updated on each closed candle
+        self.rolling_prices = {}
+        self.last_candle_times = {}
         self.period = 6
         self.time_frame = None
         self.price_threshold = 0.05
@@ -212,30 +293,36 @@ class InstantMAEvaluator(evaluators.RealTimeEvaluator):
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle):
         self.eval_note = 0
-        new_data = self.get_symbol_candles(exchange, exchange_id, symbol, time_frame). \
-            get_symbol_close_candles(20)
-        should_eval = symbol not in self.last_candle_data or \
-                      not self._compare_data(new_data, self.last_candle_data[symbol])
-        self.last_candle_data[symbol] = new_data
-        if should_eval:
-            if len(self.last_candle_data[symbol]) > self.period:
-                self.last_moving_average_values[symbol] = tulipy.sma(self.last_candle_data[symbol],
-                                                                     self.period)
-                await self._evaluate_current_price(self.last_candle_data[symbol][-1], cryptocurrency, symbol,
-                                                   evaluators_util.get_eval_time(full_candle=candle,
-                                                                                 time_frame=time_frame))
+        if symbol in self.rolling_prices and _is_next_candle(self.last_candle_times[symbol], candle, time_frame):
+            self.rolling_prices[symbol].push(candle[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value])
+        else:
+            # first candle or missed candles: (re)initialize rolling state from candles history
+            self.rolling_prices[symbol] = RollingSegments([self.period], max_size=self.MAX_CANDLES_COUNT)
+            self.rolling_prices[symbol].reset(
+                self.get_symbol_candles(exchange, exchange_id, symbol, time_frame).
+                get_symbol_close_candles(self.MAX_CANDLES_COUNT)
+            )
+        self.last_candle_times[symbol] = candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value]
+        close_prices = self.rolling_prices[symbol].values
+        if close_prices:
+            self.last_candle_data[symbol] = close_prices[-1]
+        if len(close_prices) > self.period:
+            self.last_moving_average_values[symbol] = self.rolling_prices[symbol].mean(self.period)
+            await self._evaluate_current_price(self.last_candle_data[symbol], cryptocurrency, symbol,
+                                               evaluators_util.get_eval_time(full_candle=candle,
+                                                                             time_frame=time_frame))
 
     async def kline_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, kline):
-        if symbol in self.last_moving_average_values and len(self.last_moving_average_values[symbol]) > 0:
+        if symbol in self.last_moving_average_values:
             self.eval_note = 0
             last_price = kline[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value]
-            if last_price != self.last_candle_data[symbol][-1]:
+            if last_price != self.last_candle_data[symbol]:
                 await self._evaluate_current_price(last_price, cryptocurrency, symbol,
                                                    evaluators_util.get_eval_time(kline=kline))
 
     async def _evaluate_current_price(self, last_price, cryptocurrency, symbol, time):
-        last_ma_value = self.last_moving_average_values[symbol][-1]
+        last_ma_value = self.last_moving_average_values[symbol]
         if last_ma_value == 0:
             self.eval_note = 0
         else:
@@ -283,13 +370,3 @@ class InstantMAEvaluator(evaluators.RealTimeEvaluator):
     def set_default_config(self):
         super().set_default_config()
         self.specific_config[commons_constants.CONFIG_TIME_FRAME] = "1m"
-
-    @staticmethod
-    def _compare_data(new_data, old_data):
-        try:
-            if new_data[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value][-1] != \
-                    old_data[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value][-1]:
-                return False
-            return True
-        except Exception:
-            return False
@@ -0,0 +1,109 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import mock
+import pytest
+import numpy as np
+import tulipy
+
+import octobot_commons.enums as commons_enums
+import tentacles.Evaluator.RealTime.instant_fluctuations_evaluator.instant_fluctuations as instant_fluctuations
+
+
+@pytest.mark.parametrize("sums_refresh_interval", [
+    instant_fluctuations.RollingSegments.SUMS_REFRESH_INTERVAL, 7
+])
+def test_rolling_segments_means(sums_refresh_interval):
+    segments = [10, 8, 6, 5, 4, 3, 2, 1]
+    random_generator = np.random.default_rng(42)
+    values = list(random_generator.uniform(1, 1000, size=5000))
+    with mock.patch.object(instant_fluctuations.RollingSegments, "SUMS_REFRESH_INTERVAL", sums_refresh_interval):
+        rolling_segments = instant_fluctuations.RollingSegments(segments)
+        rolling_segments.reset(values[:3])
+        for segment in segments:
+            assert rolling_segments.mean(segment) == pytest.approx(np.mean(values[:3][-segment:]), rel=1e-12)
+        for index in range(3, len(values)):
+            rolling_segments.push(values[index])
+            for segment in segments:
+                # same as means computed from the whole history
+                assert rolling_segments.mean(segment) == \
+                    pytest.approx(np.mean(values[:index + 1][-segment:]), rel=1e-12)
+    assert len(rolling_segments.values) == 10
+
+
+def test_rolling_segments_empty():
+    rolling_segments = instant_fluctuations.RollingSegments([3, 1])
+    assert np.isnan(rolling_segments.mean(3))
+    rolling_segments.reset([])
+    assert np.isnan(rolling_segments.mean(1))
+    rolling_segments.push(2)
+    assert rolling_segments.mean(3) == rolling_segments.mean(1) == 2
+
+
+def test_rolling_segments_max_size():
+    rolling_segments = instant_fluctuations.RollingSegments([3], max_size=5)
+    rolling_segments.reset(range(10))
+    assert list(rolling_segments.values) == [5, 6, 7, 8, 9]
+    assert rolling_segments.mean(3) == 8
+    # segments can't be larger than the buffer
+    rolling_segments = instant_fluctuations.RollingSegments([8], max_size=5)
+    rolling_segments.reset(range(10))
+    assert rolling_segments.mean(8) == 7
+    rolling_segments.push(10)
+    assert rolling_segments.mean(8) == 8
+
+
+def test_rolling_segments_with_nan():
+    rolling_segments = instant_fluctuations.RollingSegments([3, 1])
+    rolling_segments.reset([1, 2, 3])
+    rolling_segments.push(np.nan)
+    assert np.isnan(rolling_segments.mean(3))
+    assert np.isnan(rolling_segments.mean(1))
+    rolling_segments.push(4)
+    assert np.isnan(rolling_segments.mean(3))
+    assert rolling_segments.mean(1) == 4
+    rolling_segments.push(5)
+    rolling_segments.push(6)
+    # nan is out of every segment
+    assert rolling_segments.mean(3) == 5
+    assert rolling_segments.mean(1) == 6
+
+
+def test_instant_ma_evaluator_moving_average():
+    evaluator = instant_fluctuations.InstantMAEvaluator(mock.Mock())
+    evaluator._evaluate_current_price = mock.AsyncMock()
+    random_generator = np.random.default_rng(42)
+    closes = random_generator.uniform(1, 1000, size=100)
+    symbol_candles = mock.Mock(get_symbol_close_candles=mock.Mock(side_effect=lambda count: closes[:5][-count:]))
+    evaluator.get_symbol_candles = mock.Mock(return_value=symbol_candles)
+
+    async def _check():
+        for index in range(4, len(closes)):
+            candle = [0] * 6
+            candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value] = index * 60
+            candle[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value] = closes[index]
+            await evaluator.ohlcv_callback("binance", "1", "BTC", "BTC/USDT", "1m", candle)
+            history = closes[:index + 1][-evaluator.MAX_CANDLES_COUNT:]
+            if len(history) > evaluator.period:
+                # same as the moving average computed from candles history
+                assert evaluator.last_moving_average_values["BTC/USDT"] == \
+                    pytest.approx(tulipy.sma(history, evaluator.period)[-1], rel=1e-12)
+            else:
+                assert "BTC/USDT" not in evaluator.last_moving_average_values
+        # history is only read on the first candle
+        symbol_candles.get_symbol_close_candles.assert_called_once_with(evaluator.MAX_CANDLES_COUNT)
+
+    asyncio.run(_check())
@@ -29,6 +29,47 @@ import octobot_tentacles_manager.configuration as tm_configuration
 import octobot_trading.api as trading_api
 
 
+class UpdatedTimeFramesFilter:
+    """
+    Keeps track of each time frame candles data at its last re-evaluation to only re-evaluate time frames
+    with new data.
+    New data is:
+    - for the shortest time frame: a new closed candle or an updated in construction candle
+    - for higher time frames: a new closed candle only. Their in construction candle is updated on every trade
+    and would always trigger a re-evaluation: their evaluations are reused until their next candle close.
+    """
+
+    def __init__(self):
+        self.data_identifier_by_time_frame = {}
+
+    def get_updated_time_frames(self, symbol_data, exchange_name, symbol, time_frames) -> list:
+        updated_time_frames = []
+        shortest_time_frame = time_frame_manager.find_min_time_frame(time_frames) if time_frames else None
+        for time_frame in time_frames:
+            key = (exchange_name, symbol, time_frame)
+            data_identifier = self._get_data_identifier(symbol_data, time_frame, time_frame == shortest_time_frame)
+            # always consider time frames without identifiable data as updated
+            if data_identifier is None or self.data_identifier_by_time_frame.get(key) != data_identifier:
+                self.data_identifier_by_time_frame[key] = data_identifier
+                updated_time_frames.append(time_frame)
+        return updated_time_frames
+
+    @staticmethod
+    def _get_data_identifier(symbol_data, time_frame, include_in_construction_candle):
+        if symbol_data is None:
+            return None
+        try:
+            last_candle_times = trading_api.get_symbol_time_candles(symbol_data, time_frame, limit=1)
+            if not len(last_candle_times):
+                return None
+            in_construction_candle = tuple(trading_api.get_symbol_klines(symbol_data, time_frame)) \
+                if include_in_construction_candle and trading_api.has_symbol_klines(symbol_data, time_frame) \
+                else None
+            return float(last_candle_times[-1]), in_construction_candle
+        except KeyError:
+            return None
+
+
 class SimpleStrategyEvaluator(evaluators.StrategyEvaluator):
     SOCIAL_EVALUATORS_NOTIFICATION_TIMEOUT_KEY = "social_evaluators_notification_timeout"
     RE_EVAL_TA_ON_RT_OR_SOCIAL = "re_evaluate_TA_when_social_or_realtime_notification"
@@ -41,6 +82,7 @@ class SimpleStrategyEvaluator(evaluators.StrategyEvaluator):
         self.social_evaluators_default_timeout = None
         self.re_evaluate_TA_when_social_or_realtime_notification = True
         self.background_social_evaluators = []
+        self.updated_time_frames_filter = UpdatedTimeFramesFilter()
 
     def init_user_inputs(self, inputs: dict) -> None:
         """
@@ -165,18 +207,26 @@ class SimpleStrategyEvaluator(evaluators.StrategyEvaluator):
                     and evaluator_name not in self.background_social_evaluators:
                 if evaluators_util.check_valid_eval_note(eval_note, eval_type=eval_note_type,
                                                          expected_eval_type=evaluators_constants.EVALUATOR_EVAL_DEFAULT_TYPE):
-                    # trigger re-evaluation
                     exchange_id = trading_api.get_exchange_id_from_matrix_id(exchange_name, matrix_id)
-                    await evaluators_channel.trigger_technical_evaluators_re_evaluation_with_updated_data(matrix_id,
-                                                                                                          evaluator_name,
-                                                                                                          evaluator_type,
-                                                                                                          exchange_name,
-                                                                                                          cryptocurrency,
-                                                                                                          symbol,
-                                                                                                          exchange_id,
-                                                                                                          self.strategy_time_frames)
-                    # do not continue this evaluation
-                    return
+                    updated_time_frames = self.updated_time_frames_filter.get_updated_time_frames(
+                        self.get_exchange_symbol_data(exchange_name, exchange_id, symbol),
+                        exchange_name, symbol, self.strategy_time_frames
+                    )
+                    if updated_time_frames:
+                        # trigger re-evaluation of updated time frames only, others evaluations are reused
+                        await evaluators_channel.trigger_technical_evaluators_re_evaluation_with_updated_data(
+                            matrix_id,
+                            evaluator_name,
+                            evaluator_type,
+                            exchange_name,
+                            cryptocurrency,
+                            symbol,
+                            exchange_id,
+                            updated_time_frames
+                        )
+                        # do not continue this evaluation
+                        return
+                    # no new data since last re-evaluation: use current technical evaluations
             counter = 0
             total_evaluation = 0
 
@@ -234,6 +284,7 @@ class TechnicalAnalysisStrategyEvaluator(evaluators.StrategyEvaluator):
         super().__init__(tentacles_setup_config)
         self.allowed_evaluator_types = [evaluators_enums.EvaluatorMatrixTypes.TA.value,
                                         evaluators_enums.EvaluatorMatrixTypes.REAL_TIME.value]
+        self.updated_time_frames_filter = UpdatedTimeFramesFilter()
         config = tentacles_manager_api.get_tentacle_config(self.tentacles_setup_config, self.__class__)
         if config:
             self.weight_by_time_frames = TechnicalAnalysisStrategyEvaluator._get_weight_by_time_frames(
@@ -305,17 +356,24 @@ class TechnicalAnalysisStrategyEvaluator(evaluators.StrategyEvaluator):
             }
 
             if evaluator_type == evaluators_enums.EvaluatorMatrixTypes.REAL_TIME.value:
-                # trigger re-evaluation
                 exchange_id = trading_api.get_exchange_id_from_matrix_id(exchange_name, matrix_id)
-                await evaluators_channel.trigger_technical_evaluators_re_evaluation_with_updated_data(matrix_id,
-                                                                                                      evaluator_name,
-                                                                                                      evaluator_type,
-                                                                                                      exchange_name,
-                                                                                                      cryptocurrency,
-                                                                                                      symbol,
-                                                                                                      exchange_id,
-                                                                                                      self.strategy_time_frames)
-                # do not continue this evaluation
+                updated_time_frames = self.updated_time_frames_filter.get_updated_time_frames(
+                    self.get_exchange_symbol_data(exchange_name, exchange_id, symbol),
+                    exchange_name, symbol, self.strategy_time_frames
+                )
+                if updated_time_frames:
+                    # trigger re-evaluation of updated time frames only, others evaluations are reused
+                    await evaluators_channel.trigger_technical_evaluators_re_evaluation_with_updated_data(
+                        matrix_id,
+                        evaluator_name,
+                        evaluator_type,
+                        exchange_name,
+                        cryptocurrency,
+                        symbol,
+                        exchange_id,
+                        updated_time_frames
+                    )
+                # do not continue this evaluation: real-time evaluations are not used by this strategy
                 return
 
             total_evaluation = 0
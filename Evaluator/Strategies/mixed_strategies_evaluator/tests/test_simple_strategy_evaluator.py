@@ -13,11 +13,19 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import collections
 import decimal
+import mock
 import pytest
 
+import octobot.backtesting.abstract_backtesting_test as abstract_backtesting_test
+import octobot_tentacles_manager.api as tentacles_manager_api
+import octobot_trading.api as trading_api
 import tests.functional_tests.strategy_evaluators_tests.abstract_strategy_test as abstract_strategy_test
+import tentacles.Evaluator.RealTime as RealTime
 import tentacles.Evaluator.Strategies as Strategies
+import tentacles.Evaluator.Strategies.mixed_strategies_evaluator.mixed_strategies as mixed_strategies
+import tentacles.Evaluator.TA as TA
 import tentacles.Trading.Mode as Mode
 
 # All test coroutines will be treated as marked.
@@ -73,6 +81,38 @@ class SimpleStrategyEvaluatorTest(abstract_strategy_test.AbstractStrategyTest):
         # market: 8.665472458575891
         await self.run_test_sharp_uptrend(decimal.Decimal(str(14.212)), decimal.Decimal(str(13.007)))
 
+    async def count_technical_evaluations(self):
+        """
+        :return: the RSIMomentumEvaluator evaluations count by time frame and re-evaluation flag of a backtesting
+        using a 1h InstantFluctuationsEvaluator
+        """
+        tentacles_manager_api.update_activation_configuration(
+            self.tentacles_setup_config, {RealTime.InstantFluctuationsEvaluator.get_name(): True}, False,
+            add_missing_elements=True
+        )
+        evaluations = collections.Counter()
+        origin_ohlcv_callback = TA.RSIMomentumEvaluator.ohlcv_callback
+        origin_init_user_inputs = RealTime.InstantFluctuationsEvaluator.init_user_inputs
+
+        async def _counted_ohlcv_callback(evaluator, exchange, exchange_id, cryptocurrency, symbol, time_frame,
+                                          candle, inc_in_construction_data):
+            evaluations[(time_frame, inc_in_construction_data)] += 1
+            await origin_ohlcv_callback(evaluator, exchange, exchange_id, cryptocurrency, symbol, time_frame,
+                                        candle, inc_in_construction_data)
+
+        def _1h_init_user_inputs(evaluator, inputs):
+            # 1m candles are not available in backtesting
+            evaluator.time_frame = "1h"
+            origin_init_user_inputs(evaluator, inputs)
+
+        with mock.patch.object(TA.RSIMomentumEvaluator, "ohlcv_callback", _counted_ohlcv_callback), \
+             mock.patch.object(RealTime.InstantFluctuationsEvaluator, "init_user_inputs", _1h_init_user_inputs):
+            independent_backtesting = await self._run_backtesting_with_current_config(
+                abstract_backtesting_test.DATA_FILES[abstract_backtesting_test.DEFAULT_SYMBOL]
+            )
+            await independent_backtesting.stop()
+        return evaluations
+
     async def test_up_then_down(self):
         # market: 1.1543668450702853
         await self.run_test_up_then_down(decimal.Decimal(str(2.674)))
@@ -104,3 +144,23 @@ async def test_sharp_uptrend(strategy_tester):
 
 async def test_up_then_down(strategy_tester):
     await strategy_tester.test_up_then_down()
+
+
+async def test_real_time_notifications_re_evaluations(strategy_tester):
+    updates = iter(range(1000000))
+    # backtesting has no in construction candle: emulate live in construction candles, updated on every trade
+    with mock.patch.object(trading_api, "has_symbol_klines", mock.Mock(return_value=True)), \
+         mock.patch.object(trading_api, "get_symbol_klines", mock.Mock(side_effect=lambda *_: [next(updates)])):
+        evaluations = await strategy_tester.count_technical_evaluations()
+        with mock.patch.object(mixed_strategies.UpdatedTimeFramesFilter, "get_updated_time_frames",
+                               mock.Mock(side_effect=lambda _, __, ___, time_frames: list(time_frames))):
+            unfiltered_evaluations = await strategy_tester.count_technical_evaluations()
+    # same closed candles evaluations
+    for time_frame in ("1h", "4h", "1d"):
+        assert evaluations[(time_frame, False)] == unfiltered_evaluations[(time_frame, False)] > 0
+    # real-time notifications re-evaluate the shortest time frame
+    assert evaluations[("1h", True)] == unfiltered_evaluations[("1h", True)] > 0
+    # higher time frames are only re-evaluated after a new candle close
+    assert evaluations[("4h", True)] < unfiltered_evaluations[("4h", True)]
+    assert evaluations[("1d", True)] < unfiltered_evaluations[("1d", True)]
+    assert evaluations[("1d", True)] <= evaluations[("1d", False)]
@@ -0,0 +1,72 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import mock
+import numpy as np
+
+import octobot_commons.enums as commons_enums
+import octobot_trading.api as trading_api
+
+import tentacles.Evaluator.Strategies.mixed_strategies_evaluator.mixed_strategies as mixed_strategies
+
+
+def test_get_updated_time_frames():
+    time_frames = [commons_enums.TimeFrames.ONE_MINUTE, commons_enums.TimeFrames.ONE_HOUR]
+    symbol_data = mock.Mock()
+    candle_times = {
+        commons_enums.TimeFrames.ONE_MINUTE: np.array([60.]),
+        commons_enums.TimeFrames.ONE_HOUR: np.array([3600.]),
+    }
+    klines = {
+        commons_enums.TimeFrames.ONE_MINUTE: [120, 1, 2, 3, 4, 5],
+        commons_enums.TimeFrames.ONE_HOUR: [7200, 1, 2, 3, 4, 5],
+    }
+    updated_time_frames_filter = mixed_strategies.UpdatedTimeFramesFilter()
+    with mock.patch.object(trading_api, "get_symbol_time_candles",
+                           mock.Mock(side_effect=lambda _, tf, limit: candle_times[tf])), \
+         mock.patch.object(trading_api, "has_symbol_klines", mock.Mock(side_effect=lambda _, tf: tf in klines)), \
+         mock.patch.object(trading_api, "get_symbol_klines", mock.Mock(side_effect=lambda _, tf: klines[tf])):
+        # first call: everything is new
+        assert updated_time_frames_filter.get_updated_time_frames(symbol_data, "binance", "BTC/USDT", time_frames) \
+            == time_frames
+        # nothing changed
+        assert updated_time_frames_filter.get_updated_time_frames(symbol_data, "binance", "BTC/USDT", time_frames) \
+            == []
+        # other symbol
+        assert updated_time_frames_filter.get_updated_time_frames(symbol_data, "binance", "ETH/USDT", time_frames) \
+            == time_frames
+        # in construction candle update
+        klines[commons_enums.TimeFrames.ONE_MINUTE][4] = 6
+        assert updated_time_frames_filter.get_updated_time_frames(symbol_data, "binance", "BTC/USDT", time_frames) \
+            == [commons_enums.TimeFrames.ONE_MINUTE]
+        # higher time frames in construction candle update: evaluations are reused until the next candle close
+        klines[commons_enums.TimeFrames.ONE_HOUR][4] = 6
+        assert updated_time_frames_filter.get_updated_time_frames(symbol_data, "binance", "BTC/USDT", time_frames) \
+            == []
+        # new closed candle
+        candle_times[commons_enums.TimeFrames.ONE_HOUR] = np.array([7200.])
+        assert updated_time_frames_filter.get_updated_time_frames(symbol_data, "binance", "BTC/USDT", time_frames) \
+            == [commons_enums.TimeFrames.ONE_HOUR]
+        assert updated_time_frames_filter.get_updated_time_frames(symbol_data, "binance", "BTC/USDT", time_frames) \
+            == []
+        # missing candles data: always updated
+        candle_times.pop(commons_enums.TimeFrames.ONE_HOUR)
+        for _ in range(2):
+            assert updated_time_frames_filter.get_updated_time_frames(symbol_data, "binance", "BTC/USDT",
+                                                                      time_frames) \
+                == [commons_enums.TimeFrames.ONE_HOUR]
+    # missing symbol data: always updated
+    assert updated_time_frames_filter.get_updated_time_frames(None, "binance", "BTC/USDT", time_frames) == time_frames
+    assert updated_time_frames_filter.get_updated_time_frames(None, "binance", "BTC/USDT", time_frames) == time_frames
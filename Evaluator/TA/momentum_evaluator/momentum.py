@@ -13,6 +13,8 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import collections
+import copy
 import math
 import numpy
 import tulipy
@@ -79,12 +81,17 @@ class RSIMomentumEvaluator(evaluators.TAEvaluator):
         candle_data = trading_api.get_symbol_close_candles(self.get_exchange_symbol_data(exchange, exchange_id, symbol),
                                                            time_frame,
                                                            include_in_construction=inc_in_construction_data)
-        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle)
+        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle,
+                            indicators_cache_run_id=None if inc_in_construction_data
+                            else EvaluatorUtil.IndicatorsCache.get_run_id(self.matrix_id, exchange))
 
-    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle):
+    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle, indicators_cache_run_id=None):
         updated_value = False
         if candle_data is not None and len(candle_data) > self.period_length:
-            rsi_v = tulipy.rsi(candle_data, period=self.period_length)
+            rsi_v = EvaluatorUtil.IndicatorsCache.get_indicator(
+                indicators_cache_run_id, symbol, time_frame, candle[enums.PriceIndexes.IND_PRICE_TIME.value],
+                "close", tulipy.rsi, candle_data, self.period_length
+            )
             if len(rsi_v) and not math.isnan(rsi_v[-1]):
                 if self.is_trend_change_identifier:
                     long_trend = EvaluatorUtil.TrendAnalysis.get_trend(rsi_v, self.long_term_averages)
@@ -227,12 +234,16 @@ class RSIWeightMomentumEvaluator(evaluators.TAEvaluator):
             fast_threshold[self.FAST_THRESHOLDS] = sorted(fast_threshold[self.FAST_THRESHOLDS],
                                                           key=lambda a: a[self.FAST_THRESHOLD])
 
-    def _get_rsi_averages(self, symbol_candles, time_frame, include_in_construction):
+    def _get_rsi_averages(self, symbol_candles, symbol, time_frame, include_in_construction,
+                          indicators_cache_run_id=None, candle_time=None):
         # compute the slow and fast RSI average
         candle_data = trading_api.get_symbol_close_candles(symbol_candles, time_frame,
                                                            include_in_construction=include_in_construction)
         if len(candle_data) > self.period_length:
-            rsi_v = tulipy.rsi(candle_data, period=self.period_length)
+            rsi_v = EvaluatorUtil.IndicatorsCache.get_indicator(
+                indicators_cache_run_id, symbol, time_frame, candle_time,
+                "close", tulipy.rsi, candle_data, self.period_length
+            )
             rsi_v = data_util.drop_nan(rsi_v)
             if len(rsi_v):
                 slow_average = numpy.mean(rsi_v[-self.slow_eval_count:])
@@ -264,8 +275,13 @@ class RSIWeightMomentumEvaluator(evaluators.TAEvaluator):
         try:
             symbol_candles = self.get_exchange_symbol_data(exchange, exchange_id, symbol)
             # compute the slow and fast RSI average
-            slow_rsi, fast_rsi, rsi_v = self._get_rsi_averages(symbol_candles, time_frame,
-                                                               include_in_construction=inc_in_construction_data)
+            slow_rsi, fast_rsi, rsi_v = self._get_rsi_averages(
+                symbol_candles, symbol, time_frame,
+                include_in_construction=inc_in_construction_data,
+                indicators_cache_run_id=None if inc_in_construction_data
+                else EvaluatorUtil.IndicatorsCache.get_run_id(self.matrix_id, exchange),
+                candle_time=candle[enums.PriceIndexes.IND_PRICE_TIME.value]
+            )
             current_candle_time = trading_api.get_symbol_time_candles(symbol_candles, time_frame,
                                                                       include_in_construction=inc_in_construction_data)[
                 -1]
@@ -313,13 +329,18 @@ class BBMomentumEvaluator(evaluators.TAEvaluator):
                                                            time_frame,
                                                            self.period_length,
                                                            include_in_construction=inc_in_construction_data)
-        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle)
+        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle,
+                            indicators_cache_run_id=None if inc_in_construction_data
+                            else EvaluatorUtil.IndicatorsCache.get_run_id(self.matrix_id, exchange))
 
-    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle):
+    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle, indicators_cache_run_id=None):
         self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
         if len(candle_data) >= self.period_length:
             # compute bollinger bands
-            lower_band, middle_band, upper_band = tulipy.bbands(candle_data, self.period_length, 2)
+            lower_band, middle_band, upper_band = EvaluatorUtil.IndicatorsCache.get_indicator(
+                indicators_cache_run_id, symbol, time_frame, candle[enums.PriceIndexes.IND_PRICE_TIME.value],
+                "close", tulipy.bbands, candle_data, self.period_length, 2
+            )
 
             # if close to lower band => low value => bad,
             # therefore if close to middle, value is keeping up => good
@@ -393,13 +414,18 @@ class EMAMomentumEvaluator(evaluators.TAEvaluator):
                                                            time_frame,
                                                            self.period_length,
                                                            include_in_construction=inc_in_construction_data)
-        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle)
+        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle,
+                            indicators_cache_run_id=None if inc_in_construction_data
+                            else EvaluatorUtil.IndicatorsCache.get_run_id(self.matrix_id, exchange))
 
-    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle):
+    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle, indicators_cache_run_id=None):
         self.eval_note = 0
         if len(candle_data) >= self.period_length:
             # compute ema
-            ema_values = tulipy.ema(candle_data, self.period_length)
+            ema_values = EvaluatorUtil.IndicatorsCache.get_indicator(
+                indicators_cache_run_id, symbol, time_frame, candle[enums.PriceIndexes.IND_PRICE_TIME.value],
+                "close", tulipy.ema, candle_data, self.period_length
+            )
             if candle_data[-1] >= (ema_values[-1] * (1 + self.price_threshold_multiplier)):
                 self.eval_note = 1
             elif candle_data[-1] <= (ema_values[-1] * (1 - self.price_threshold_multiplier)):
@@ -409,12 +435,132 @@ class EMAMomentumEvaluator(evaluators.TAEvaluator):
                                                                                 time_frame=time_frame))
 
 
+class IncrementalADX:
+    """
+    ADX (tulipy.adx implementation), instant and slow close EMAs and ADX threshold crossings held as incremental
+    state: pushing a candle is O(1) regardless of the candles history length.
+    NaN ADX values are ignored, as if they were removed from the ADX values.
+    """
+
+    def __init__(self, period, threshold, last_adx_values_count, instant_ema_period=2, slow_ema_period=20):
+        self.period = period
+        self.threshold = threshold
+        self.smoothing = (period - 1) / period
+        self.inverted_period = 1.0 / period
+        self.instant_ema_multiplier = 2 / (instant_ema_period + 1)
+        self.slow_ema_multiplier = 2 / (slow_ema_period + 1)
+        self.candles_count = 0
+        self.previous_high = self.previous_low = self.previous_close = None
+        # Wilder smoothed true range and directional movements
+        self.true_range = self.up_move = self.down_move = 0
+        self.smoothed_dx = 0
+        self.adx = None
+        self.adx_count = 0
+        self.last_adx_values = collections.deque(maxlen=last_adx_values_count)
+        self.instant_ema = self.slow_ema = None
+        # threshold crossings, see TrendAnalysis.get_threshold_change_indexes
+        self.closed_sub_threshold_crossings_count = 0
+        self.first_crossing_index = self.sub_threshold_start = self.sub_threshold_end = None
+
+    def copy(self):
+        state = copy.copy(self)
+        state.last_adx_values = self.last_adx_values.copy()
+        return state
+
+    def push(self, high, low, close):
+        if self.candles_count == 0:
+            self.instant_ema = self.slow_ema = close
+        else:
+            self.instant_ema = (close - self.instant_ema) * self.instant_ema_multiplier + self.instant_ema
+            self.slow_ema = (close - self.slow_ema) * self.slow_ema_multiplier + self.slow_ema
+            true_range = max(high - low, abs(high - self.previous_close), abs(low - self.previous_close))
+            up_move, down_move = self._get_directional_moves(high, low)
+            if self.candles_count < self.period:
+                # warm-up: sum the first period values
+                self.true_range += true_range
+                self.up_move += up_move
+                self.down_move += down_move
+                if self.candles_count == self.period - 1:
+                    self.smoothed_dx = self._get_dx()
+            else:
+                self.true_range = self.true_range * self.smoothing + true_range
+                self.up_move = self.up_move * self.smoothing + up_move
+                self.down_move = self.down_move * self.smoothing + down_move
+                dx = self._get_dx()
+                dx_index = self.candles_count - self.period
+                if dx_index < self.period - 1:
+                    self.smoothed_dx += dx
+                    if dx_index == self.period - 2:
+                        self._push_adx(self.smoothed_dx * self.inverted_period)
+                else:
+                    self.smoothed_dx = self.smoothed_dx * self.smoothing + dx
+                    self._push_adx(self.smoothed_dx * self.inverted_period)
+        self.previous_high, self.previous_low, self.previous_close = high, low, close
+        self.candles_count += 1
+
+    def get_crossing_indexes_summary(self):
+        """
+        :return: the count, first and last values of TrendAnalysis.get_threshold_change_indexes(adx, threshold)
+        """
+        if self.sub_threshold_start is None:
+            return 0, None, None
+        if self.adx > self.threshold:
+            return self.closed_sub_threshold_crossings_count + 2, self.first_crossing_index, \
+                self.sub_threshold_end + 1
+        return self.closed_sub_threshold_crossings_count + 1, self.first_crossing_index, self.sub_threshold_start
+
+    def _get_directional_moves(self, high, low):
+        up_move = high - self.previous_high
+        down_move = self.previous_low - low
+        if up_move < 0:
+            up_move = 0
+        elif up_move > down_move:
+            down_move = 0
+        if down_move < 0:
+            down_move = 0
+        elif down_move > up_move:
+            up_move = 0
+        return up_move, down_move
+
+    def _get_dx(self):
+        if not self.true_range:
+            return math.nan
+        up_di = self.up_move / self.true_range
+        down_di = self.down_move / self.true_range
+        di_sum = up_di + down_di
+        # same as tulipy: undefined when there is no directional movement
+        return abs(up_di - down_di) / di_sum * 100 if di_sum else math.nan
+
+    def _push_adx(self, adx):
+        if math.isnan(adx):
+            return
+        if adx <= self.threshold:
+            if self.sub_threshold_end is None:
+                self.first_crossing_index = self.adx_count
+                self.sub_threshold_start = self.adx_count
+            elif self.sub_threshold_end != self.adx_count - 1:
+                # previous sub-threshold move is over: its start and end (when different) are crossings
+                self.closed_sub_threshold_crossings_count += \
+                    1 if self.sub_threshold_start == self.sub_threshold_end else 2
+                self.sub_threshold_start = self.adx_count
+            self.sub_threshold_end = self.adx_count
+        self.adx = adx
+        self.last_adx_values.append(adx)
+        self.adx_count += 1
+
+
 # ADX --> trend_strength
 class ADXMomentumEvaluator(evaluators.TAEvaluator):
+    MIN_ADX = 7.5
+    MAX_ADX = 45
+    NEUTRAL_ADX = 25
+    ADX_LAST_VALUES_COUNT = 15
 
     def __init__(self, tentacles_setup_config):
         super().__init__(tentacles_setup_config)
         self.period_length = 14
+        # {(symbol, time_frame): (last closed candle time, IncrementalADX)}
+        self.adx_states = {}
 
     def init_user_inputs(self, inputs: dict) -> None:
         self.period_length = self.UI.user_input("period_length", enums.UserInputTypes.INT, self.period_length,
@@ -431,6 +577,14 @@ class ADXMomentumEvaluator(evaluators.TAEvaluator):
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle, inc_in_construction_data):
         symbol_candles = self.get_exchange_symbol_data(exchange, exchange_id, symbol)
+        closed_time_candles = trading_api.get_symbol_time_candles(symbol_candles, time_frame)
+        if inc_in_construction_data:
+            # real-time re-evaluations can happen before the in construction candle is available: only include
+            # it when it is not the last closed candle
+            time_candles = trading_api.get_symbol_time_candles(symbol_candles, time_frame,
+                                                               include_in_construction=True)
+            inc_in_construction_data = len(time_candles) > 0 and len(closed_time_candles) > 0 \
+                and time_candles[-1] != closed_time_candles[-1]
         close_candles = trading_api.get_symbol_close_candles(symbol_candles, time_frame,
                                                              include_in_construction=inc_in_construction_data)
         if len(close_candles) > self._get_minimal_data():
@@ -438,56 +592,80 @@ class ADXMomentumEvaluator(evaluators.TAEvaluator):
                                                                include_in_construction=inc_in_construction_data)
             low_candles = trading_api.get_symbol_low_candles(symbol_candles, time_frame,
                                                              include_in_construction=inc_in_construction_data)
-            await self.evaluate(cryptocurrency, symbol, time_frame, close_candles, high_candles, low_candles, candle)
+            adx_state = self._get_adx_state(symbol, time_frame, close_candles, high_candles, low_candles,
+                                            closed_time_candles[-1], inc_in_construction_data)
+            await self.evaluate(cryptocurrency, symbol, time_frame, adx_state, candle)
         else:
             self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
             await self.evaluation_completed(cryptocurrency, symbol, time_frame,
                                             eval_time=evaluators_util.get_eval_time(full_candle=candle,
                                                                                     time_frame=time_frame))
 
-    async def evaluate(self, cryptocurrency, symbol, time_frame, close_candles, high_candles, low_candles, candle):
+    def _get_adx_state(self, symbol, time_frame, close_candles, high_candles, low_candles,
+                       last_closed_candle_time, inc_in_construction_data):
+        """
+        :param last_closed_candle_time: time of the last closed candle of the given candles
+        :param inc_in_construction_data: True when the last given candle is the in construction one
+        :return: the ADX state including every given candle
+        """
+        time_frame_seconds = enums.TimeFramesMinutes[enums.TimeFrames(time_frame)] * \
+            commons_constants.MINUTE_TO_SECONDS
+        closed_candles_count = len(close_candles) - 1 if inc_in_construction_data else len(close_candles)
+        last_candle_time, adx_state = self.adx_states.get((symbol, time_frame), (None, None))
+        if last_candle_time is not None and last_closed_candle_time - last_candle_time == time_frame_seconds:
+            # next candle: only push the new closed candle
+            self._push_candle(adx_state, high_candles, low_candles, close_candles, closed_candles_count - 1)
+        elif last_candle_time is None or last_closed_candle_time != last_candle_time:
+            # first candle or missing candles: warm-up using the whole history
+            adx_state = IncrementalADX(self.period_length, self.NEUTRAL_ADX, self.ADX_LAST_VALUES_COUNT)
+            for index in range(closed_candles_count):
+                self._push_candle(adx_state, high_candles, low_candles, close_candles, index)
+        self.adx_states[(symbol, time_frame)] = (last_closed_candle_time, adx_state)
+        if inc_in_construction_data:
+            # in construction candle is not part of the state
+            adx_state = adx_state.copy()
+            self._push_candle(adx_state, high_candles, low_candles, close_candles, -1)
+        return adx_state
+
+    @staticmethod
+    def _push_candle(adx_state, high_candles, low_candles, close_candles, index):
+        # python floats computations are faster than numpy scalars ones
+        adx_state.push(float(high_candles[index]), float(low_candles[index]), float(close_candles[index]))
+
+    async def evaluate(self, cryptocurrency, symbol, time_frame, adx_state, candle):
         self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
-        if len(close_candles) >= self._get_minimal_data():
-            min_adx = 7.5
-            max_adx = 45
-            neutral_adx = 25
-            adx = tulipy.adx(high_candles, low_candles, close_candles, self.period_length)
-            instant_ema = data_util.drop_nan(tulipy.ema(close_candles, 2))
-            slow_ema = data_util.drop_nan(tulipy.ema(close_candles, 20))
-            adx = data_util.drop_nan(adx)
-
-            if len(adx):
-                current_adx = adx[-1]
-                current_slows_ema = slow_ema[-1]
-                current_instant_ema = instant_ema[-1]
-
-                multiplier = -1 if current_instant_ema < current_slows_ema else 1
-
-                # strong adx => strong trend
-                if current_adx > neutral_adx:
-                    # if max adx already reached => when ADX forms a top and begins to turn down, you should look for a
-                    # retracement that causes the price to move toward its 20-day exponential moving average (EMA).
-                    adx_last_values = adx[-15:]
-                    adx_last_value = adx_last_values[-1]
-
-                    local_max_adx = adx_last_values.max()
-                    # max already reached => trend will slow down
-                    if adx_last_value < local_max_adx:
-
-                        self.eval_note = multiplier * (current_adx - neutral_adx) / (local_max_adx - neutral_adx)
-
-                    # max not reached => trend will continue, return chances to be max now
-                    else:
-                        crossing_indexes = EvaluatorUtil.TrendAnalysis.get_threshold_change_indexes(adx, neutral_adx)
-                        chances_to_be_max = \
-                            EvaluatorUtil.TrendAnalysis.get_estimation_of_move_state_relatively_to_previous_moves_length(
-                                crossing_indexes, adx) if len(crossing_indexes) > 2 else 0.75
-                        proximity_to_max = min(1, current_adx / max_adx)
-                        self.eval_note = multiplier * proximity_to_max * chances_to_be_max
-
-                # weak adx => change to come
+        if adx_state.candles_count >= self._get_minimal_data() and adx_state.adx_count:
+            current_adx = adx_state.adx
+            current_slows_ema = adx_state.slow_ema
+            current_instant_ema = adx_state.instant_ema
+
+            multiplier = -1 if current_instant_ema < current_slows_ema else 1
+
+            # strong adx => strong trend
+            if current_adx > self.NEUTRAL_ADX:
+                # if max adx already reached => when ADX forms a top and begins to turn down, you should look for a
+                # retracement that causes the price to move toward its 20-day exponential moving average (EMA).
+                local_max_adx = max(adx_state.last_adx_values)
+                # max already reached => trend will slow down
+                if current_adx < local_max_adx:
+
+                    self.eval_note = multiplier * (current_adx - self.NEUTRAL_ADX) / (local_max_adx - self.NEUTRAL_ADX)
+
+                # max not reached => trend will continue, return chances to be max now
                 else:
-                    self.eval_note = multiplier * min(1, ((neutral_adx - current_adx) / (neutral_adx - min_adx)))
+                    crossing_indexes_count, first_crossing_index, last_crossing_index = \
+                        adx_state.get_crossing_indexes_summary()
+                    chances_to_be_max = \
+                        EvaluatorUtil.TrendAnalysis.get_estimation_of_move_state_from_crossing_indexes_summary(
+                            crossing_indexes_count, first_crossing_index, last_crossing_index, adx_state.adx_count
+                        ) if crossing_indexes_count > 2 else 0.75
+                    proximity_to_max = min(1, current_adx / self.MAX_ADX)
+                    self.eval_note = multiplier * proximity_to_max * chances_to_be_max
+
+            # weak adx => change to come
+            else:
+                self.eval_note = multiplier * min(1, ((self.NEUTRAL_ADX - current_adx) /
+                                                      (self.NEUTRAL_ADX - self.MIN_ADX)))
         await self.evaluation_completed(cryptocurrency, symbol, time_frame,
                                         eval_time=evaluators_util.get_eval_time(full_candle=candle,
                                                                                 time_frame=time_frame))
@@ -555,13 +733,18 @@ class MACDMomentumEvaluator(evaluators.TAEvaluator):
         candle_data = trading_api.get_symbol_close_candles(self.get_exchange_symbol_data(exchange, exchange_id, symbol),
                                                            time_frame,
                                                            include_in_construction=inc_in_construction_data)
-        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle)
+        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle,
+                            indicators_cache_run_id=None if inc_in_construction_data
+                            else EvaluatorUtil.IndicatorsCache.get_run_id(self.matrix_id, exchange))
 
-    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle):
+    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle, indicators_cache_run_id=None):
         self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
         if len(candle_data) > self.long_period_length:
-            macd, macd_signal, macd_hist = tulipy.macd(candle_data, self.short_period_length,
-                                                       self.long_period_length, self.signal_period_length)
+            macd, macd_signal, macd_hist = EvaluatorUtil.IndicatorsCache.get_indicator(
+                indicators_cache_run_id, symbol, time_frame, candle[enums.PriceIndexes.IND_PRICE_TIME.value],
+                "close", tulipy.macd, candle_data, self.short_period_length, self.long_period_length,
+                self.signal_period_length
+            )
 
             # on macd hist => M pattern: bearish movement, W pattern: bullish movement
             #                 max on hist: optimal sell or buy
@@ -14,11 +14,16 @@
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
 
+import mock
+import numpy as np
 import pytest
 import pytest_asyncio
 
+import octobot_commons.enums as commons_enums
 import tests.functional_tests.evaluators_tests.abstract_TA_test as abstract_TA_test
+import tests.test_utils.config as test_utils_config
 import tentacles.Evaluator.TA as TA
+import tentacles.Evaluator.TA.momentum_evaluator.momentum as momentum
 
 
 # All test coroutines will be treated as marked.
@@ -71,3 +76,81 @@ class TestADXTAEvaluator(abstract_TA_test.AbstractTATest):
             0.3, -0.5, -0.6, -0.45,
             # eval_back_up8, eval_micro_down9, eval_back_up9
             -0.35, -0.1, 0.1)
+
+
+async def test_incremental_state_with_real_time_re_evaluations():
+    evaluator = TA.ADXMomentumEvaluator(test_utils_config.load_test_tentacles_config())
+    time_frame = commons_enums.TimeFrames.ONE_HOUR.value
+    random_generator = np.random.default_rng(42)
+    close = np.cumsum(random_generator.normal(0, 1, 100)) + 200
+    candles = {
+        commons_enums.PriceIndexes.IND_PRICE_TIME.value: np.arange(100, dtype=np.float64) * 3600,
+        commons_enums.PriceIndexes.IND_PRICE_HIGH.value: close + random_generator.uniform(0, 2, 100),
+        commons_enums.PriceIndexes.IND_PRICE_LOW.value: close - random_generator.uniform(0, 2, 100),
+        commons_enums.PriceIndexes.IND_PRICE_CLOSE.value: close,
+    }
+    # closed candles count, in construction candle index (None when not available yet) and pushed candles count
+    available = {"closed": 0, "in_construction": None, "pushes": 0}
+
+    def _get_candles(price_index):
+        def _candles(symbol_data, time_frame, include_in_construction=False):
+            values = candles[price_index][:available["closed"]]
+            if include_in_construction and available["in_construction"] is not None:
+                # same as octobot_trading: candles are shifted to add the in construction candle
+                return np.append(values[1:], candles[price_index][available["in_construction"]])
+            return values
+        return _candles
+
+    async def _new_candle(inc_in_construction_data):
+        candle = [0] * len(commons_enums.PriceIndexes)
+        candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value] = \
+            candles[commons_enums.PriceIndexes.IND_PRICE_TIME.value][available["closed"] - 1]
+        await evaluator.ohlcv_callback("binance", "123", "BTC", "BTC/USDT", time_frame, candle,
+                                       inc_in_construction_data)
+
+    def _assert_evaluated_state(push_mock, pushes_count, candles_count):
+        assert push_mock.call_count - available["pushes"] == pushes_count
+        expected_state = momentum.IncrementalADX(evaluator.period_length, evaluator.NEUTRAL_ADX,
+                                                 evaluator.ADX_LAST_VALUES_COUNT)
+        for index in range(candles_count):
+            expected_state.push(*(
+                float(candles[price_index.value][index])
+                for price_index in (commons_enums.PriceIndexes.IND_PRICE_HIGH,
+                                    commons_enums.PriceIndexes.IND_PRICE_LOW,
+                                    commons_enums.PriceIndexes.IND_PRICE_CLOSE)
+            ))
+        evaluated_state = evaluate_mock.mock_calls[-1].args[3]
+        assert evaluated_state.adx == expected_state.adx
+        assert evaluated_state.candles_count == expected_state.candles_count
+        # ignore expected state pushes
+        available["pushes"] = push_mock.call_count
+
+    with mock.patch.object(evaluator, "get_exchange_symbol_data", mock.Mock()), \
+         mock.patch.object(evaluator, "evaluate", mock.AsyncMock()) as evaluate_mock, \
+         mock.patch.object(momentum.IncrementalADX, "push", autospec=True,
+                           side_effect=momentum.IncrementalADX.push) as push_mock, \
+         mock.patch.object(momentum.trading_api, "get_symbol_time_candles",
+                           _get_candles(commons_enums.PriceIndexes.IND_PRICE_TIME.value)), \
+         mock.patch.object(momentum.trading_api, "get_symbol_high_candles",
+                           _get_candles(commons_enums.PriceIndexes.IND_PRICE_HIGH.value)), \
+         mock.patch.object(momentum.trading_api, "get_symbol_low_candles",
+                           _get_candles(commons_enums.PriceIndexes.IND_PRICE_LOW.value)), \
+         mock.patch.object(momentum.trading_api, "get_symbol_close_candles",
+                           _get_candles(commons_enums.PriceIndexes.IND_PRICE_CLOSE.value)):
+        available["closed"] = 60
+        await _new_candle(False)
+        # warm-up
+        _assert_evaluated_state(push_mock, 60, 60)
+        for closed_candles_count in range(61, 65):
+            # re-evaluation before the next candle is in construction: nothing to push
+            await _new_candle(True)
+            _assert_evaluated_state(push_mock, 0, closed_candles_count - 1)
+            # re-evaluation with the in construction candle: only push it
+            available["in_construction"] = closed_candles_count - 1
+            await _new_candle(True)
+            _assert_evaluated_state(push_mock, 1, closed_candles_count)
+            # new closed candle: only push it
+            available["closed"] = closed_candles_count
+            available["in_construction"] = None
+            await _new_candle(False)
+            _assert_evaluated_state(push_mock, 1, closed_candles_count)
@@ -0,0 +1,68 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import numpy as np
+import tulipy
+
+import octobot_commons.data_util as data_util
+import tentacles.Evaluator.Util as EvaluatorUtil
+import tentacles.Evaluator.TA.momentum_evaluator.momentum as momentum
+
+
+def _get_candles(random_generator, size):
+    close = np.cumsum(random_generator.normal(0, 1, size)) + 200
+    return close + random_generator.uniform(0, 2, size), close - random_generator.uniform(0, 2, size), close
+
+
+def test_incremental_adx_matches_full_computation():
+    random_generator = np.random.default_rng(42)
+    for period in (2, 5, 14):
+        high, low, close = _get_candles(random_generator, 300)
+        adx_state = momentum.IncrementalADX(period, 25, 15)
+        for index in range(len(close)):
+            adx_state.push(high[index], low[index], close[index])
+            assert adx_state.instant_ema == tulipy.ema(close[:index + 1], 2)[-1]
+            assert adx_state.slow_ema == tulipy.ema(close[:index + 1], 20)[-1]
+            if index < (period - 1) * 2:
+                assert adx_state.adx is None
+                continue
+            adx = data_util.drop_nan(tulipy.adx(high[:index + 1], low[:index + 1], close[:index + 1], period))
+            assert adx_state.adx_count == len(adx)
+            assert adx_state.adx == adx[-1]
+            assert list(adx_state.last_adx_values) == list(adx[-15:])
+            crossing_indexes = EvaluatorUtil.TrendAnalysis.get_threshold_change_indexes(adx, 25)
+            if crossing_indexes:
+                assert adx_state.get_crossing_indexes_summary() == \
+                    (len(crossing_indexes), crossing_indexes[0], crossing_indexes[-1])
+                assert EvaluatorUtil.TrendAnalysis.get_estimation_of_move_state_from_crossing_indexes_summary(
+                    *adx_state.get_crossing_indexes_summary(), adx_state.adx_count
+                ) == EvaluatorUtil.TrendAnalysis.get_estimation_of_move_state_relatively_to_previous_moves_length(
+                    crossing_indexes, adx
+                )
+            else:
+                assert adx_state.get_crossing_indexes_summary() == (0, None, None)
+
+
+def test_incremental_adx_copy():
+    high, low, close = _get_candles(np.random.default_rng(42), 50)
+    adx_state = momentum.IncrementalADX(14, 25, 15)
+    for index in range(len(close) - 1):
+        adx_state.push(high[index], low[index], close[index])
+    adx, last_adx_values = adx_state.adx, list(adx_state.last_adx_values)
+    in_construction_state = adx_state.copy()
+    in_construction_state.push(high[-1], low[-1], close[-1])
+    assert in_construction_state.adx != adx
+    assert adx_state.adx == adx
+    assert list(adx_state.last_adx_values) == last_adx_values
@@ -0,0 +1,118 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import numpy as np
+
+import octobot_commons.enums as commons_enums
+
+
+class IndicatorsCache:
+    """
+    Memoizes indicators computed on closed candles: each distinct indicator is computed once per run, symbol,
+    time frame and closed candle, whether it is requested by an evaluator or by a scripting keyword.
+    Indicators are identified by their function, their input data source and size and their scalar parameters:
+    data arrays content is not read as they all end on the given closed candle.
+    Only the last closed candle values are kept for each run, symbol and time frame, and at most
+    MAX_CACHED_SERIES series are kept: the least recently used ones are dropped first.
+    Cached values are shared: they must not be modified in place.
+    """
+    HITS = "hits"
+    MISSES = "misses"
+    MAX_CACHED_SERIES = 1000
+
+    # {(run_id, symbol, time_frame): (candle_time, {indicator_key: indicator_values})}
+    _values_by_candles = {}
+    # {indicator_name: {HITS: hits count, MISSES: misses count}}
+    _statistics = {}
+
+    @staticmethod
+    def get_indicator(run_id, symbol, time_frame, candle_time, data_key, indicator_function, *args):
+        """
+        Return indicator_function(*args), computed only once for the given closed candle
+        :param run_id: identifier of the current run (bot or backtesting), cache is disabled when None
+        :param symbol: symbol of the candles the indicator is computed on
+        :param time_frame: time frame of the candles the indicator is computed on
+        :param candle_time: time of the last closed candle, cache is disabled when None (in construction data)
+        :param data_key: identifier of the indicator input data source, ex: "close" or "hlc3"
+        :param indicator_function: the indicator function, ex: tulipy.rsi
+        :param args: indicator_function arguments: data arrays ending on the closed candle and hashable parameters
+        :return: the indicator values
+        """
+        if run_id is None or candle_time is None:
+            return indicator_function(*args)
+        indicator_name = IndicatorsCache._get_indicator_name(indicator_function)
+        series_key = (run_id, symbol, commons_enums.TimeFrames(time_frame).value)
+        indicator_key = (indicator_function, data_key, tuple(IndicatorsCache._get_arg_key(arg) for arg in args))
+        statistics = IndicatorsCache._statistics.setdefault(indicator_name, {IndicatorsCache.HITS: 0,
+                                                                             IndicatorsCache.MISSES: 0})
+        # pop and re-insert to keep series ordered by last use
+        cached_candle_time, indicators = IndicatorsCache._values_by_candles.pop(series_key, (None, None))
+        if cached_candle_time != candle_time:
+            # new candle: previous candle values are not relevant anymore
+            cached_candle_time, indicators = candle_time, {}
+        IndicatorsCache._values_by_candles[series_key] = (cached_candle_time, indicators)
+        if len(IndicatorsCache._values_by_candles) > IndicatorsCache.MAX_CACHED_SERIES:
+            IndicatorsCache._values_by_candles.pop(next(iter(IndicatorsCache._values_by_candles)))
+        try:
+            values = indicators[indicator_key]
+            statistics[IndicatorsCache.HITS] += 1
+            return values
+        except KeyError:
+            statistics[IndicatorsCache.MISSES] += 1
+            values = indicators[indicator_key] = indicator_function(*args)
+            return values
+
+    @staticmethod
+    def get_run_id(matrix_id, exchange_name):
+        """
+        :return: the run identifier to use in get_indicator, None when caching is not possible
+        """
+        return None if matrix_id is None else (matrix_id, exchange_name)
+
+    @staticmethod
+    def get_statistics() -> dict:
+        """
+        :return: hits and misses counts by indicator name
+        """
+        return {
+            indicator_name: dict(statistics)
+            for indicator_name, statistics in IndicatorsCache._statistics.items()
+        }
+
+    @staticmethod
+    def clear(run_id=None):
+        """
+        Remove cached values and statistics
+        :param run_id: only remove this run cached values when provided
+        """
+        if run_id is None:
+            IndicatorsCache._values_by_candles.clear()
+            IndicatorsCache._statistics.clear()
+        else:
+            for series_key in [key for key in IndicatorsCache._values_by_candles if key[0] == run_id]:
+                IndicatorsCache._values_by_candles.pop(series_key)
+
+    @staticmethod
+    def _get_indicator_name(indicator_function) -> str:
+        # functools.partial objects have no name
+        indicator_function = getattr(indicator_function, "func", indicator_function)
+        return getattr(indicator_function, "__name__", None) or repr(indicator_function)
+
+    @staticmethod
+    def _get_arg_key(arg):
+        if isinstance(arg, np.ndarray):
+            # data arrays of a data source all end on the cached closed candle: they only differ by their size
+            return arg.dtype.str, arg.shape
+        return arg
@@ -0,0 +1,113 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import functools
+import mock
+import numpy as np
+import pytest
+import tulipy
+
+import octobot_commons.enums as commons_enums
+from tentacles.Evaluator.Util import IndicatorsCache
+
+RUN_ID = IndicatorsCache.get_run_id("matrix_id", "binance")
+SYMBOL = "BTC/USDT"
+TIME_FRAME = commons_enums.TimeFrames.ONE_HOUR.value
+
+
+@pytest.fixture
+def data():
+    IndicatorsCache.clear()
+    yield np.random.default_rng(42).uniform(100, 200, 200)
+    IndicatorsCache.clear()
+
+
+def test_get_indicator_is_computed_once_per_candle(data):
+    first = IndicatorsCache.get_indicator(RUN_ID, SYMBOL, TIME_FRAME, 1, "close", tulipy.rsi, data, 14)
+    np.testing.assert_array_equal(first, tulipy.rsi(data, 14))
+    assert IndicatorsCache.get_indicator(RUN_ID, SYMBOL, TIME_FRAME, 1, "close", tulipy.rsi, data, 14) is first
+    assert IndicatorsCache.get_statistics() == {"rsi": {IndicatorsCache.HITS: 1, IndicatorsCache.MISSES: 1}}
+
+    # different parameters, data source, time frame or run
+    assert IndicatorsCache.get_indicator(RUN_ID, SYMBOL, TIME_FRAME, 1, "close", tulipy.rsi, data, 7) is not first
+    # same size, different data source
+    other_data = data.copy()
+    other_data[100] += 1
+    other = IndicatorsCache.get_indicator(RUN_ID, SYMBOL, TIME_FRAME, 1, "high", tulipy.rsi, other_data, 14)
+    np.testing.assert_array_equal(other, tulipy.rsi(other_data, 14))
+    # different size
+    other = IndicatorsCache.get_indicator(RUN_ID, SYMBOL, TIME_FRAME, 1, "close", tulipy.rsi, data[-100:], 14)
+    np.testing.assert_array_equal(other, tulipy.rsi(data[-100:], 14))
+    assert IndicatorsCache.get_indicator(RUN_ID, SYMBOL, commons_enums.TimeFrames.ONE_DAY, 1,
+                                         "close", tulipy.rsi, data, 14) is not first
+    assert IndicatorsCache.get_indicator(IndicatorsCache.get_run_id("other", "binance"), SYMBOL, TIME_FRAME, 1,
+                                         "close", tulipy.rsi, data, 14) is not first
+    assert IndicatorsCache.get_statistics() == {"rsi": {IndicatorsCache.HITS: 1, IndicatorsCache.MISSES: 6}}
+
+    # new candle
+    updated_data = np.append(data[1:], 150)
+    second = IndicatorsCache.get_indicator(RUN_ID, SYMBOL, TIME_FRAME, 2, "close", tulipy.rsi, updated_data, 14)
+    np.testing.assert_array_equal(second, tulipy.rsi(updated_data, 14))
+    assert IndicatorsCache.get_statistics()["rsi"][IndicatorsCache.MISSES] == 7
+
+
+def test_get_indicator_functions(data):
+    # same name, different functions
+    first = IndicatorsCache.get_indicator(RUN_ID, SYMBOL, TIME_FRAME, 1, "close", lambda values: values[-1], data)
+    second = IndicatorsCache.get_indicator(RUN_ID, SYMBOL, TIME_FRAME, 1, "close", lambda values: values[0], data)
+    assert (first, second) == (data[-1], data[0])
+    # unnamed functions
+    rsi = functools.partial(tulipy.rsi, period=14)
+    first = IndicatorsCache.get_indicator(RUN_ID, SYMBOL, TIME_FRAME, 1, "close", rsi, data)
+    np.testing.assert_array_equal(first, tulipy.rsi(data, 14))
+    assert IndicatorsCache.get_indicator(RUN_ID, SYMBOL, TIME_FRAME, 1, "close", rsi, data) is first
+    assert IndicatorsCache.get_statistics() == {
+        "<lambda>": {IndicatorsCache.HITS: 0, IndicatorsCache.MISSES: 2},
+        "rsi": {IndicatorsCache.HITS: 1, IndicatorsCache.MISSES: 1},
+    }
+
+
+def test_get_indicator_without_cache(data):
+    # in construction candles and contexts without matrix are not cached
+    assert IndicatorsCache.get_run_id(None, "binance") is None
+    first = IndicatorsCache.get_indicator(None, SYMBOL, TIME_FRAME, 1, "close", tulipy.ema, data, 10)
+    assert IndicatorsCache.get_indicator(None, SYMBOL, TIME_FRAME, 1, "close", tulipy.ema, data, 10) is not first
+    first = IndicatorsCache.get_indicator(RUN_ID, SYMBOL, TIME_FRAME, None, "close", tulipy.ema, data, 10)
+    assert IndicatorsCache.get_indicator(RUN_ID, SYMBOL, TIME_FRAME, None, "close", tulipy.ema, data, 10) is not first
+    assert IndicatorsCache.get_statistics() == {}
+
+
+def test_clear(data):
+    other_run_id = IndicatorsCache.get_run_id("other", "binance")
+    first = IndicatorsCache.get_indicator(RUN_ID, SYMBOL, TIME_FRAME, 1, "close", tulipy.sma, data, 10)
+    other = IndicatorsCache.get_indicator(other_run_id, SYMBOL, TIME_FRAME, 1, "close", tulipy.sma, data, 10)
+    IndicatorsCache.clear(RUN_ID)
+    assert IndicatorsCache.get_indicator(RUN_ID, SYMBOL, TIME_FRAME, 1, "close", tulipy.sma, data, 10) is not first
+    assert IndicatorsCache.get_indicator(other_run_id, SYMBOL, TIME_FRAME, 1, "close", tulipy.sma, data, 10) is other
+    IndicatorsCache.clear()
+    assert IndicatorsCache.get_statistics() == {}
+
+
+def test_max_cached_series(data):
+    with mock.patch.object(IndicatorsCache, "MAX_CACHED_SERIES", 2):
+        first = IndicatorsCache.get_indicator(RUN_ID, SYMBOL, TIME_FRAME, 1, "close", tulipy.sma, data, 10)
+        IndicatorsCache.get_indicator(RUN_ID, "ETH/USDT", TIME_FRAME, 1, "close", tulipy.sma, data, 10)
+        # BTC/USDT is the most recently used series
+        assert IndicatorsCache.get_indicator(RUN_ID, SYMBOL, TIME_FRAME, 1, "close", tulipy.sma, data, 10) is first
+        IndicatorsCache.get_indicator(IndicatorsCache.get_run_id("other", "binance"), SYMBOL, TIME_FRAME, 1,
+                                      "close", tulipy.sma, data, 10)
+        assert len(IndicatorsCache._values_by_candles) == 2
+        assert IndicatorsCache.get_indicator(RUN_ID, SYMBOL, TIME_FRAME, 1, "close", tulipy.sma, data, 10) is first
+        assert IndicatorsCache.get_statistics()["sma"] == {IndicatorsCache.HITS: 2, IndicatorsCache.MISSES: 3}
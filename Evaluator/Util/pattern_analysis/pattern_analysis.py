@@ -37,10 +37,10 @@ class PatternAnalyser:
 
             if shape == "N" or shape == "V":
                 # check presence of W or M with insignificant move in the other direction
-                backwards_index = 2
-                while backwards_index < len(zero_crossing_indexes) and \
-                        zero_crossing_indexes[-1*backwards_index] - zero_crossing_indexes[-1*backwards_index-1] < 4:
-                    backwards_index += 1
+                # previous moves lengths, from the most recent one backwards
+                previous_moves_lengths = np.diff(zero_crossing_indexes)[-2::-1]
+                significant_moves = np.flatnonzero(previous_moves_lengths >= 4)
+                backwards_index = 2 + significant_moves[0] if len(significant_moves) else len(zero_crossing_indexes)
                 extended_last_move_data = data[zero_crossing_indexes[-1 * backwards_index]:]
                 extended_shape = PatternAnalyser.get_pattern(extended_last_move_data)
 
@@ -73,10 +73,7 @@ class PatternAnalyser:
             if mean_value < 0 \
             else np.where(data < mean_value)[0]
 
-        nb_gaps = 0
-        for i in range(len(indexes_under_mean_value)-1):
-            if indexes_under_mean_value[i+1]-indexes_under_mean_value[i] > 3:
-                nb_gaps += 1
+        nb_gaps = np.count_nonzero(np.diff(indexes_under_mean_value) > 3)
 
         if nb_gaps > 1:
             return "W" if mean_value < 0 else "M"
@@ -0,0 +1,84 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+
+import math
+import numpy as np
+
+from tentacles.Evaluator.Util import PatternAnalyser, TrendAnalysis
+
+
+def _reference_get_pattern(data):
+    # element by element implementation used as a reference for the vectorized one
+    mean_value = np.mean(data) * 0.7 if len(data) > 0 else math.nan
+    if math.isnan(mean_value):
+        return PatternAnalyser.UNKNOWN_PATTERN
+    indexes_under_mean_value = np.where(data > mean_value)[0] \
+        if mean_value < 0 \
+        else np.where(data < mean_value)[0]
+    nb_gaps = 0
+    for i in range(len(indexes_under_mean_value)-1):
+        if indexes_under_mean_value[i+1]-indexes_under_mean_value[i] > 3:
+            nb_gaps += 1
+    if nb_gaps > 1:
+        return "W" if mean_value < 0 else "M"
+    return "V" if mean_value < 0 else "N"
+
+
+def _reference_find_pattern(data, zero_crossing_indexes, data_frame_max_index):
+    if len(zero_crossing_indexes) > 1:
+        shape = _reference_get_pattern(data[zero_crossing_indexes[-1]:])
+        if shape == "N" or shape == "V":
+            backwards_index = 2
+            while backwards_index < len(zero_crossing_indexes) and \
+                    zero_crossing_indexes[-1*backwards_index] - zero_crossing_indexes[-1*backwards_index-1] < 4:
+                backwards_index += 1
+            extended_shape = _reference_get_pattern(data[zero_crossing_indexes[-1 * backwards_index]:])
+            if extended_shape == "W" or extended_shape == "M":
+                first_part = data[zero_crossing_indexes[-1 * backwards_index]:
+                                  zero_crossing_indexes[-1*backwards_index+1]]
+                second_part = data[zero_crossing_indexes[-1]:]
+                if np.mean(first_part)*np.mean(second_part) > 0:
+                    return extended_shape, zero_crossing_indexes[-1*backwards_index], zero_crossing_indexes[-1]
+        return shape, zero_crossing_indexes[-1], data_frame_max_index
+    start_pattern_index = 0 if not zero_crossing_indexes else zero_crossing_indexes[0]
+    return _reference_get_pattern(data[start_pattern_index:]), start_pattern_index, data_frame_max_index
+
+
+def _random_series_corpus():
+    random_generator = np.random.default_rng(42)
+    for size in (0, 1, 2, 5, 10, 50, 200):
+        for _ in range(50):
+            yield random_generator.normal(size=size)
+            yield np.sin(np.arange(size) / random_generator.uniform(0.5, 5)) + random_generator.normal(size=size) / 4
+
+
+def test_get_pattern():
+    assert PatternAnalyser.get_pattern(np.array([])) == PatternAnalyser.UNKNOWN_PATTERN
+    assert PatternAnalyser.get_pattern(np.array([1, 5, 5, 5, 5, 1, 5, 5, 5, 5, 1])) == "M"
+    assert PatternAnalyser.get_pattern(np.array([-1, -5, -5, -5, -5, -1, -5, -5, -5, -5, -1])) == "W"
+    assert PatternAnalyser.get_pattern(np.array([1, 5, 5, 5, 5, 1])) == "N"
+
+
+def test_get_pattern_corpus():
+    for data in _random_series_corpus():
+        assert PatternAnalyser.get_pattern(data) == _reference_get_pattern(data)
+
+
+def test_find_pattern_corpus():
+    for data in _random_series_corpus():
+        zero_crossing_indexes = TrendAnalysis.get_threshold_change_indexes(data, 0)
+        assert PatternAnalyser.find_pattern(data, zero_crossing_indexes, len(data) - 1) == \
+            _reference_find_pattern(data, zero_crossing_indexes, len(data) - 1)
@@ -0,0 +1,100 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+
+import numpy as np
+
+from tentacles.Evaluator.Util import TrendAnalysis
+
+
+def _reference_get_threshold_change_indexes(data, threshold):
+    # element by element implementation used as a reference for the vectorized one
+    sub_threshold_indexes = np.where(data <= threshold)[0]
+    threshold_crossing_indexes = []
+    current_move_size = 1
+    for i, index in enumerate(sub_threshold_indexes):
+        if not len(threshold_crossing_indexes):
+            threshold_crossing_indexes.append(index)
+        else:
+            if threshold_crossing_indexes[-1] == index - current_move_size:
+                current_move_size += 1
+            else:
+                if sub_threshold_indexes[i-1] not in threshold_crossing_indexes:
+                    threshold_crossing_indexes.append(sub_threshold_indexes[i-1])
+                if index not in threshold_crossing_indexes:
+                    threshold_crossing_indexes.append(index)
+                current_move_size = 1
+    if len(sub_threshold_indexes) > 0 \
+            and sub_threshold_indexes[-1] < len(data) \
+            and data[-1] > threshold \
+            and sub_threshold_indexes[-1]+1 not in threshold_crossing_indexes:
+        threshold_crossing_indexes.append(sub_threshold_indexes[-1]+1)
+    return threshold_crossing_indexes
+
+
+def _reference_get_trend(data, averages_to_use):
+    trend = 0
+    inc = round(1 / len(averages_to_use), 2)
+    averages = []
+    for average_to_use in averages_to_use:
+        data_to_mean = data[-average_to_use:]
+        averages.append(np.mean(data_to_mean) if len(data_to_mean) else 0)
+    for a in range(0, len(averages) - 1):
+        if averages[a] - averages[a + 1] > 0:
+            trend -= inc
+        else:
+            trend += inc
+    return trend
+
+
+def _random_series_corpus():
+    random_generator = np.random.default_rng(42)
+    for size in (0, 1, 2, 3, 5, 10, 50, 200):
+        for _ in range(50):
+            yield random_generator.normal(size=size)
+            yield np.round(random_generator.normal(size=size), 1)
+            yield random_generator.integers(-2, 3, size=size).astype(np.float64)
+    yield np.array([np.nan, 1, -1, np.nan, -2, 3, np.nan])
+    yield np.zeros(10)
+    yield np.ones(10)
+    yield -np.ones(10)
+
+
+def test_get_threshold_change_indexes():
+    assert TrendAnalysis.get_threshold_change_indexes(np.array([1, -1, -1, 1, -1, 1, 1, -1, -1, -1]), 0) == \
+        [1, 2, 4, 7]
+    assert TrendAnalysis.get_threshold_change_indexes(np.array([1, -1, -1, 1, -1, 1, 1, -1, -1, 1]), 0) == \
+        [1, 2, 4, 7, 9]
+    assert TrendAnalysis.get_threshold_change_indexes(np.array([1, 1, 1]), 0) == []
+    assert TrendAnalysis.get_threshold_change_indexes(np.array([]), 0) == []
+
+
+def test_get_threshold_change_indexes_corpus():
+    for data in _random_series_corpus():
+        for threshold in (0, 0.5, -0.5):
+            assert TrendAnalysis.get_threshold_change_indexes(data, threshold) == \
+                _reference_get_threshold_change_indexes(data, threshold)
+
+
+def test_get_trend():
+    assert TrendAnalysis.get_trend(np.array([1, 2, 3, 4, 5, 6]), [2, 4, 6]) == 0 - 0.33 - 0.33
+    assert TrendAnalysis.get_trend(np.array([6, 5, 4, 3, 2, 1]), [2, 4, 6]) == 0 + 0.33 + 0.33
+    assert TrendAnalysis.get_trend(np.array([]), [2, 4]) == 0.5
+
+
+def test_get_trend_corpus():
+    for data in _random_series_corpus():
+        for averages_to_use in ([1, 2], [2, 4, 6], [5, 10, 10, 20], [20, 10, 5, 2, 1]):
+            assert TrendAnalysis.get_trend(data, averages_to_use) == _reference_get_trend(data, averages_to_use)
@@ -25,18 +25,16 @@ class TrendAnalysis:
     def get_trend(data, averages_to_use):
         trend = 0
         inc = round(1 / len(averages_to_use), 2)
-        averages = []
-
-        # Get averages
+        # Get averages, each distinct window is only averaged once
+        window_averages = {}
         for average_to_use in averages_to_use:
-            data_to_mean = data[-average_to_use:]
-            if len(data_to_mean):
-                averages.append(np.mean(data_to_mean))
-            else:
-                averages.append(0)
+            if average_to_use not in window_averages:
+                data_to_mean = data[-average_to_use:]
+                window_averages[average_to_use] = np.mean(data_to_mean) if len(data_to_mean) else 0
+        averages = np.array([window_averages[average_to_use] for average_to_use in averages_to_use], dtype=float)
 
-        for a in range(0, len(averages) - 1):
-            if averages[a] - averages[a + 1] > 0:
+        for is_decreasing in np.diff(averages) < 0:
+            if is_decreasing:
                 trend -= inc
             else:
                 trend += inc
@@ -108,33 +106,46 @@ class TrendAnalysis:
         else:
             return 0
 
+    @staticmethod
+    def get_estimation_of_move_state_from_crossing_indexes_summary(crossing_indexes_count,
+                                                                   first_crossing_index,
+                                                                   last_crossing_index,
+                                                                   current_trend_length):
+        # same as get_estimation_of_move_state_relatively_to_previous_moves_length without requiring the whole
+        # crossing indexes list: moves lengths always sum up to the last crossing index
+        if crossing_indexes_count:
+            time_averages_count = crossing_indexes_count - 1 + (1 if first_crossing_index != 0 else 0)
+            time_average = last_crossing_index / time_averages_count if time_averages_count else 0
+
+            current_move_length = current_trend_length - last_crossing_index
+            # higher than time_average => high chances to be at half of the move already
+            if current_move_length > time_average/2:
+                return 1
+            else:
+                return current_move_length / (time_average/2)
+        else:
+            return 0
+
     @staticmethod
     def get_threshold_change_indexes(data, threshold):
 
         # sub threshold values
         sub_threshold_indexes = np.where(data <= threshold)[0]
-
-        # remove consecutive sub-threshold values because they are not crosses
-        threshold_crossing_indexes = []
-        current_move_size = 1
-        for i, index in enumerate(sub_threshold_indexes):
-            if not len(threshold_crossing_indexes):
-                threshold_crossing_indexes.append(index)
-            else:
-                if threshold_crossing_indexes[-1] == index - current_move_size:
-                    current_move_size += 1
-                else:
-                    if sub_threshold_indexes[i-1] not in threshold_crossing_indexes:
-                        threshold_crossing_indexes.append(sub_threshold_indexes[i-1])
-                    if index not in threshold_crossing_indexes:
-                        threshold_crossing_indexes.append(index)
-                    current_move_size = 1
-        # add last index if data_frame ends above threshold and last threshold_crossing_indexes inferior
-        # to data_frame size
-        if len(sub_threshold_indexes) > 0 \
-                and sub_threshold_indexes[-1] < len(data) \
-                and data[-1] > threshold \
-                and sub_threshold_indexes[-1]+1 not in threshold_crossing_indexes:
+        if not len(sub_threshold_indexes):
+            return []
+
+        # remove consecutive sub-threshold values because they are not crosses:
+        # only keep the start and end indexes of each sub-threshold move (the end of the last move is not a cross)
+        move_end_positions = np.flatnonzero(np.diff(sub_threshold_indexes) != 1)
+        move_starts = sub_threshold_indexes[np.concatenate(([0], move_end_positions + 1))]
+        move_ends = sub_threshold_indexes[move_end_positions]
+        crosses = np.column_stack((move_starts[:-1], move_ends))
+        # single value moves start and end on the same index
+        kept_crosses = np.column_stack((np.ones(len(move_ends), dtype=bool), move_ends != move_starts[:-1]))
+        threshold_crossing_indexes = list(crosses[kept_crosses])
+        threshold_crossing_indexes.append(move_starts[-1])
+        # add last index if data_frame ends above threshold
+        if data[-1] > threshold:
             threshold_crossing_indexes.append(sub_threshold_indexes[-1]+1)
 
         return threshold_crossing_indexes
@@ -15,3 +15,4 @@
 #  License along with this library.
 
 from .trigger import *
+from .indicators import *
@@ -0,0 +1,54 @@
+#  Drakkar-Software OctoBot-Trading
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+
+import octobot_commons.enums as commons_enums
+import octobot_trading.modes.script_keywords as script_keywords
+import tentacles.Meta.Keywords.scripting_library.data.reading.exchange_public_data as exchange_public_data
+from tentacles.Evaluator.Util.indicators_cache import IndicatorsCache
+
+
+async def cached_indicator(
+        context: script_keywords.Context,
+        data_key: str,
+        indicator_function,
+        *args,
+        symbol: str = None,
+        time_frame: str = None
+):
+    """
+    Compute indicator_function(*args) only once per closed candle: values computed by evaluators or by other
+    scripts with the same data source, data size and parameters on the same candle are reused.
+    data_key identifies the data source of the indicator data arrays, ex: "close" or "hlc3".
+    Calls triggered by in construction candles (kline updates) are not cached.
+    ex: rsi_values = await cached_indicator(ctx, "close", tulipy.rsi, await Close(ctx), 14)
+    """
+    if context.trigger_source == commons_enums.TriggerSource.KLINE.value:
+        return indicator_function(*args)
+    symbol = symbol or context.symbol
+    time_frame = time_frame or context.time_frame
+    return IndicatorsCache.get_indicator(
+        IndicatorsCache.get_run_id(context.matrix_id, context.exchange_name),
+        symbol,
+        time_frame,
+        await exchange_public_data.current_candle_time(context, symbol=symbol, time_frame=time_frame),
+        data_key,
+        indicator_function,
+        *args
+    )
+
+
+def cached_indicators_statistics() -> dict:
+    return IndicatorsCache.get_statistics()
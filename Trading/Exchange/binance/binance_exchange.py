@@ -13,12 +13,14 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import asyncio
 import decimal
 import typing
 
 import ccxt
 
 import octobot_commons.constants as commons_constants
+import octobot_commons.enums as commons_enums
 
 import octobot_trading.enums as trading_enums
 import octobot_trading.exchanges as exchanges
@@ -72,10 +74,31 @@ class Binance(exchanges.RestExchange):
     INVERSE_TYPE = "inverse"
     LINEAR_TYPE = "linear"
 
+    # websocket symbol feeds without message for this time (in seconds) are considered stalled
+    DEFAULT_FEED_STALENESS_THRESHOLD = 2 * commons_constants.MINUTE_TO_SECONDS
+    FEED_STALENESS_THRESHOLD_KEYS = {
+        trading_enums.WebsocketFeeds.TICKER: "ticker_feed_staleness_threshold",
+        trading_enums.WebsocketFeeds.KLINE: "kline_feed_staleness_threshold",
+        trading_enums.WebsocketFeeds.CANDLE: "candle_feed_staleness_threshold",
+    }
+
     def __init__(self, config, exchange_manager, connector_class=None):
         self._futures_account_types = self._infer_account_types(exchange_manager)
         super().__init__(config, exchange_manager, connector_class=connector_class)
 
+    @classmethod
+    def init_user_inputs_from_class(cls, inputs: dict) -> None:
+        """
+        Called at constructor, should define all the exchange's user inputs.
+        """
+        for feed, key in cls.FEED_STALENESS_THRESHOLD_KEYS.items():
+            cls.CLASS_UI.user_input(
+                key, commons_enums.UserInputTypes.INT, cls.DEFAULT_FEED_STALENESS_THRESHOLD, inputs, min_val=0,
+                title=f"Websocket {feed.value} feed staleness threshold: seconds without {feed.value} message "
+                      f"after which a symbol feed is resubscribed and polled using REST requests until it "
+                      f"recovers. 0 to disable.",
+            )
+
     @classmethod
     def get_name(cls):
         return 'binance'
@@ -141,9 +164,10 @@ class Binance(exchanges.RestExchange):
 
     async def get_balance(self, **kwargs: dict):
         if self.exchange_manager.is_future:
-            balance = []
-            for account_type in self._futures_account_types:
-                balance.append(await super().get_balance(**kwargs, subType=account_type))
+            balance = await asyncio.gather(*(
+                super(Binance, self).get_balance(**kwargs, subType=account_type)
+                for account_type in self._futures_account_types
+            ))
             # todo remove this and use both types when exchange-side multi portfolio is enabled
             # there will only be 1 balance as both linear and inverse are not supported simultaneously
             # (only 1 _futures_account_types is allowed for now)
@@ -188,13 +212,17 @@ class Binance(exchanges.RestExchange):
         return await super()._create_market_stop_loss_order(symbol, quantity, price, side, current_price, params=params)
 
     async def get_positions(self, symbols=None, **kwargs: dict) -> list:
-        positions = []
         if "subType" in kwargs:
             return _filter_positions(await super().get_positions(symbols=symbols, **kwargs))
-        for account_type in self._futures_account_types:
-            kwargs["subType"] = account_type
-            positions += await super().get_positions(symbols=symbols, **kwargs)
-        return _filter_positions(positions)
+        positions_by_account_type = await asyncio.gather(*(
+            super(Binance, self).get_positions(symbols=symbols, **{**kwargs, "subType": account_type})
+            for account_type in self._futures_account_types
+        ))
+        return _filter_positions([
+            position
+            for positions in positions_by_account_type
+            for position in positions
+        ])
 
     async def get_position(self, symbol: str, **kwargs: dict) -> dict:
         # fetchPosition() supports option markets only
@@ -0,0 +1,79 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import time
+import mock
+import pytest
+
+import octobot_trading.exchanges as exchanges
+from ...binance import Binance
+from . import create_exchange
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+DELAY = 0.2
+
+
+def _get_futures_binance():
+    binance = create_exchange(is_future=True)
+    # fetch both linear and inverse accounts
+    binance._futures_account_types = [Binance.LINEAR_TYPE, Binance.INVERSE_TYPE]
+    return binance
+
+
+async def test_get_balance():
+    binance = _get_futures_binance()
+
+    async def _delayed_get_balance(**kwargs):
+        await asyncio.sleep(DELAY)
+        return {kwargs["subType"]: kwargs}
+
+    with mock.patch.object(exchanges.RestExchange, "get_balance", mock.AsyncMock(
+        side_effect=_delayed_get_balance
+    )) as get_balance_mock:
+        t0 = time.time()
+        # first account type balance
+        assert await binance.get_balance(type="future") == {
+            Binance.LINEAR_TYPE: {"type": "future", "subType": Binance.LINEAR_TYPE}
+        }
+        # fetched concurrently
+        assert time.time() - t0 < 2 * DELAY
+        assert get_balance_mock.call_count == 2
+
+
+async def test_get_positions():
+    binance = _get_futures_binance()
+
+    async def _delayed_get_positions(symbols=None, **kwargs):
+        await asyncio.sleep(DELAY)
+        return [f"{kwargs['subType']}-position", None]
+
+    with mock.patch.object(exchanges.RestExchange, "get_positions", mock.AsyncMock(
+        side_effect=_delayed_get_positions
+    )) as get_positions_mock:
+        t0 = time.time()
+        assert await binance.get_positions(symbols=["BTC/USDT:USDT"]) == [
+            f"{Binance.LINEAR_TYPE}-position", f"{Binance.INVERSE_TYPE}-position"
+        ]
+        # fetched concurrently
+        assert time.time() - t0 < 2 * DELAY
+        assert get_positions_mock.call_count == 2
+        get_positions_mock.reset_mock()
+
+        # given account type
+        assert await binance.get_positions(subType=Binance.INVERSE_TYPE) == [f"{Binance.INVERSE_TYPE}-position"]
+        get_positions_mock.assert_awaited_once_with(symbols=None, subType=Binance.INVERSE_TYPE)
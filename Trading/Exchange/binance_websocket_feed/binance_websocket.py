@@ -13,9 +13,13 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import asyncio
+import functools
+import time
+import typing
+
 import octobot_trading.exchanges as exchanges
 from octobot_trading.enums import WebsocketFeeds as Feeds
-import octobot_commons.constants as commons_constants
 import tentacles.Trading.Exchange.binance.binance_exchange as binance_exchange
 
 
@@ -26,6 +30,310 @@ class BinanceCCXTWebsocketConnector(exchanges.CCXTWebsocketConnector):
         Feeds.TICKER: True,
         Feeds.CANDLE: True,
     }
+    # feeds which liveness is tracked for each symbol. Trades are not tracked: no trade can be a normal market state
+    LIVENESS_TRACKED_FEEDS = [
+        Feeds.KLINE,
+        Feeds.TICKER,
+        Feeds.CANDLE,
+    ]
+    # a symbol feed is stalled when no message is received for this symbol during its feed staleness threshold
+    # (from the binance exchange tentacle config). Stalled feeds are resubscribed and polled using REST requests
+    # until they receive messages again
+    FEED_HEALTH_CHECK_INTERVAL = 15
+    REST_FALLBACK_POLLING_INTERVAL = 10
+    # ccxt multiple symbols watch methods: used to subscribe symbols by batches instead of one by one
+    # note: watchOHLCVForSymbols is not supported by ccxt on binance
+    BATCH_WATCH_METHODS = {
+        Feeds.TICKER: "watchTickers",
+        Feeds.TRADES: "watchTradesForSymbols",
+    }
+    # https://developers.binance.com/docs/binance-spot-api-docs/web-socket-streams#websocket-limits
+    # 1024 streams per connection on spot and 200 on futures, 200 symbols at most in ccxt watchTradesForSymbols.
+    # ccxt opens a new connection (up to its streamLimits option) for each subscription batch
+    MAX_SYMBOLS_PER_SUBSCRIPTION = 200
+
+    def __init__(self, config, exchange_manager, adapter_class=None, additional_config=None, websocket_name=None):
+        super().__init__(
+            config, exchange_manager,
+            adapter_class=adapter_class, additional_config=additional_config, websocket_name=websocket_name
+        )
+        self._feed_staleness_thresholds = {}  # feed: staleness threshold in seconds
+        self._feed_subscriptions = {}   # (feed, symbol, time_frame): kwargs of the (batch) subscription feed
+        self._last_feed_message_times = {}  # (feed, symbol, time_frame): last message or subscription time
+        self._stalled_feeds = {}    # (feed, symbol, time_frame): (gap start time, REST polling task)
+        self._feed_gaps_statistics = {}  # (feed, symbol, time_frame): gaps statistics
+        self._feeds_health_task = None
+        self._subscribed_symbols = {}  # feed: symbols subscribed on batch compatible feeds
+        self._last_batch_ticker_timestamps = {}
+        self._feeds_subscription_start_time = None
+        self._feeds_waiting_for_first_message = set()
+        self._all_feeds_live_duration = None
+
+    async def _inner_start(self):
+        self._feed_staleness_thresholds = self._get_feed_staleness_thresholds()
+        self._feeds_health_task = asyncio.create_task(self._check_feeds_health_loop())
+        await super()._inner_start()
+
+    async def _inner_stop(self):
+        if self._feeds_health_task is not None:
+            self._feeds_health_task.cancel()
+        for _, polling_task in self._stalled_feeds.values():
+            polling_task.cancel()
+        await super()._inner_stop()
+
+    def get_feed_gaps_statistics(self) -> dict:
+        """
+        :return: the feed gaps statistics by (feed, symbol, time_frame)
+        """
+        return {
+            feed_key: {
+                **statistics,
+                "stalled": feed_key in self._stalled_feeds,
+            }
+            for feed_key, statistics in self._feed_gaps_statistics.items()
+        }
+
+    def get_all_feeds_live_duration(self) -> typing.Optional[float]:
+        """
+        :return: the time in seconds between the first feed subscription and the first message of the last
+        initially subscribed symbol feed, None when some feeds didn't receive any message yet
+        """
+        return self._all_feeds_live_duration
+
+    def _get_feed_staleness_thresholds(self) -> dict:
+        tentacle_config = self.exchange_manager.exchange.tentacle_config
+        return {
+            feed: tentacle_config.get(key, binance_exchange.Binance.DEFAULT_FEED_STALENESS_THRESHOLD)
+            for feed, key in binance_exchange.Binance.FEED_STALENESS_THRESHOLD_KEYS.items()
+        }
+
+    def _subscribe_feed(self, feed, symbols=None, time_frame=None, since=None, limit=None, params=None):
+        if symbols is None or not self._supports_batch_subscriptions(feed) \
+                or time_frame is not None or limit is not None or params is not None:
+            super()._subscribe_feed(
+                feed, symbols=symbols, time_frame=time_frame, since=since, limit=limit, params=params
+            )
+            return
+        subscribed_symbols = self._subscribed_symbols.setdefault(feed, set())
+        new_symbols = [symbol for symbol in symbols if symbol not in subscribed_symbols]
+        # also register single symbol subscriptions not to subscribe them again in a later batch
+        subscribed_symbols.update(new_symbols)
+        if len(new_symbols) < 2:
+            if new_symbols:
+                super()._subscribe_feed(feed, symbols=new_symbols, since=since)
+            return
+        feed_callback = self._get_callback_by_feed()[feed]
+        feed_generator = self._get_feed_generator_by_feed()[feed]
+        kwargs = {}
+        if since is None:
+            since = self._get_since_filter_value(feed, None)
+        if since is not None:
+            kwargs["since"] = since
+        batches = [
+            new_symbols[i:i + self.MAX_SYMBOLS_PER_SUBSCRIPTION]
+            for i in range(0, len(new_symbols), self.MAX_SYMBOLS_PER_SUBSCRIPTION)
+        ]
+        for batch in batches:
+            self._create_task_if_necessary(feed, feed_callback, feed_generator, symbols=batch, **kwargs)
+        self.logger.debug(f"Subscribed to {feed.value} for {len(new_symbols)} symbols in {len(batches)} batches")
+
+    def _supports_batch_subscriptions(self, feed):
+        return feed in self.BATCH_WATCH_METHODS \
+            and getattr(self.client, "has", {}).get(self.BATCH_WATCH_METHODS[feed], False) is True
+
+    def _get_feed_generator_by_feed(self):
+        generators = super()._get_feed_generator_by_feed()
+        for feed in self.BATCH_WATCH_METHODS:
+            if self._supports_batch_subscriptions(feed):
+                generators[feed] = self._get_batch_compatible_generator(feed, generators[feed])
+        return generators
+
+    def _get_batch_compatible_generator(self, feed, watch_func):
+        batch_watch_func = getattr(self.client, self.BATCH_WATCH_METHODS[feed])
+
+        # keep watch_func name to keep single symbol feeds identifiers
+        @functools.wraps(watch_func)
+        async def _batch_compatible_watch(*args, symbols=None, **kwargs):
+            if symbols is None:
+                return await watch_func(*args, **kwargs)
+            if feed is Feeds.TICKER:
+                await batch_watch_func(symbols)
+                # when using newUpdates, ccxt only returns the ticker of the last received message:
+                # also return tickers received during callbacks or throttling
+                return self._get_updated_batch_tickers(symbols)
+            return await batch_watch_func(symbols, **kwargs)
+        return _batch_compatible_watch
+
+    def _get_updated_batch_tickers(self, symbols):
+        updated_tickers = {}
+        for symbol in symbols:
+            ticker = self.client.tickers.get(symbol)
+            if ticker is not None and ticker["timestamp"] != self._last_batch_ticker_timestamps.get(symbol):
+                self._last_batch_ticker_timestamps[symbol] = ticker["timestamp"]
+                updated_tickers[symbol] = ticker
+        return updated_tickers
+
+    def _get_callback_by_feed(self):
+        callbacks = {}
+        for feed, callback in super()._get_callback_by_feed().items():
+            if feed in self.LIVENESS_TRACKED_FEEDS:
+                callback = self._get_liveness_tracking_callback(feed, callback)
+            if feed in self.BATCH_WATCH_METHODS:
+                callback = self._get_batch_compatible_callback(feed, callback)
+            callbacks[feed] = callback
+        return callbacks
+
+    def _get_batch_compatible_callback(self, feed, callback):
+        async def _batch_compatible_callback(update_data, symbols=None, **kwargs):
+            if symbols is None:
+                await callback(update_data, **kwargs)
+                return
+            if feed is Feeds.TICKER:
+                updates_by_symbol = update_data
+            else:
+                updates_by_symbol = {}
+                for trade in update_data:
+                    updates_by_symbol.setdefault(trade["symbol"], []).append(trade)
+            for symbol, symbol_update in updates_by_symbol.items():
+                await callback(symbol_update, symbol=symbol, **kwargs)
+        return _batch_compatible_callback
+
+    def _get_liveness_tracking_callback(self, feed, callback):
+        async def _liveness_tracking_callback(update_data, **kwargs):
+            self._on_feed_message((feed, kwargs.get("symbol"), kwargs.get("timeframe")))
+            await callback(update_data, **kwargs)
+        return _liveness_tracking_callback
+
+    def _create_task_if_necessary(self, feed, feed_callback, feed_generator, **kwargs):
+        created = super()._create_task_if_necessary(feed, feed_callback, feed_generator, **kwargs)
+        if created and feed in self.LIVENESS_TRACKED_FEEDS:
+            now = time.time()
+            if self._feeds_subscription_start_time is None:
+                self._feeds_subscription_start_time = now
+            for symbol in kwargs.get("symbols", [kwargs.get("symbol")]):
+                if symbol is None:
+                    continue
+                feed_key = (feed, symbol, kwargs.get("timeframe"))
+                self._feed_subscriptions[feed_key] = kwargs
+                self._last_feed_message_times[feed_key] = now
+                if self._all_feeds_live_duration is None:
+                    self._feeds_waiting_for_first_message.add(feed_key)
+        return created
+
+    def _on_feed_message(self, feed_key):
+        now = time.time()
+        self._last_feed_message_times[feed_key] = now
+        if feed_key in self._feeds_waiting_for_first_message:
+            self._feeds_waiting_for_first_message.remove(feed_key)
+            if not self._feeds_waiting_for_first_message:
+                self._all_feeds_live_duration = now - self._feeds_subscription_start_time
+                self.logger.info(
+                    f"All {len(self._last_feed_message_times)} symbol feeds are live after "
+                    f"{self._all_feeds_live_duration:.1f} seconds"
+                )
+        if feed_key in self._stalled_feeds:
+            gap_start_time, polling_task = self._stalled_feeds.pop(feed_key)
+            polling_task.cancel()
+            gap = now - gap_start_time
+            statistics = self._feed_gaps_statistics[feed_key]
+            statistics["total_gap"] += gap
+            statistics["max_gap"] = max(statistics["max_gap"], gap)
+            self.logger.info(f"{self._get_feed_description(feed_key)} feed recovered after {gap:.1f} seconds")
+
+    async def _check_feeds_health_loop(self):
+        while not self.should_stop:
+            await asyncio.sleep(self.FEED_HEALTH_CHECK_INTERVAL)
+            try:
+                self._check_feeds_health()
+            except Exception as err:
+                self.logger.exception(err, True, f"Error when checking feeds health: {err}")
+
+    def _check_feeds_health(self):
+        now = time.time()
+        stalled_feed_keys = []
+        for feed_key, last_message_time in list(self._last_feed_message_times.items()):
+            staleness_threshold = self._feed_staleness_thresholds.get(feed_key[0])
+            if staleness_threshold and now - last_message_time > staleness_threshold \
+                    and feed_key not in self._stalled_feeds:
+                # already stalled feeds are polled until they recover: don't resubscribe them on each check
+                self._on_feed_stall(feed_key, last_message_time)
+                stalled_feed_keys.append(feed_key)
+        if stalled_feed_keys:
+            self._resubscribe_feeds(stalled_feed_keys)
+
+    def _on_feed_stall(self, feed_key, last_message_time):
+        self.logger.warning(
+            f"No {self._get_feed_description(feed_key)} feed message since {time.time() - last_message_time:.1f} "
+            f"seconds, resubscribing and using REST requests until the feed recovers"
+        )
+        self._stalled_feeds[feed_key] = (
+            last_message_time, asyncio.create_task(self._rest_fallback_polling_task(feed_key))
+        )
+        statistics = self._feed_gaps_statistics.setdefault(feed_key, {"stalls": 0, "total_gap": 0, "max_gap": 0})
+        statistics["stalls"] += 1
+
+    def _resubscribe_feeds(self, feed_keys):
+        # resubscribe each subscription once: batch subscriptions are resubscribed as a unit
+        feed_generators = self._get_feed_generator_by_feed()
+        feed_callbacks = self._get_callback_by_feed()
+        resubscribed_identifiers = set()
+        for feed_key in feed_keys:
+            feed = feed_key[0]
+            kwargs = self._feed_subscriptions[feed_key]
+            identifier = self._get_feed_identifier(feed_generators[feed], kwargs)
+            if identifier in resubscribed_identifiers:
+                continue
+            resubscribed_identifiers.add(identifier)
+            if (feed_task := self.feed_tasks.pop(identifier, None)) is not None:
+                feed_task.cancel()
+            self._remove_client_subscriptions(feed, kwargs)
+            self._create_task_if_necessary(feed, feed_callbacks[feed], feed_generators[feed], **kwargs)
+
+    def _remove_client_subscriptions(self, feed, kwargs):
+        # ccxt only sends a subscribe message when the subscribe hash is not in its client subscriptions yet:
+        # remove it to send a new subscribe message instead of waiting on the stalled subscription
+        subscribe_hashes = self._get_client_subscribe_hashes(
+            feed, kwargs.get("symbols", [kwargs.get("symbol")]), kwargs.get("timeframe")
+        )
+        for client in self.client.clients.values():
+            for subscribe_hash in subscribe_hashes:
+                client.subscriptions.pop(subscribe_hash, None)
+
+    def _get_client_subscribe_hashes(self, feed, symbols, time_frame):
+        # ccxt binance subscribe hashes are the subscribed stream names: "<lowercase market id>@<channel>"
+        if feed is Feeds.TICKER:
+            channel = self.client.options.get("watchTickers", {}).get("name", "ticker")
+        elif feed is Feeds.TRADES:
+            channel = self.client.options.get("watchTradesForSymbols", {}).get("name", "trade")
+        else:
+            name = self.client.options.get("watchOHLCV", {}).get("name", "kline")
+            channel = f"{name}_{self.client.timeframes.get(time_frame, time_frame)}"
+        return [
+            f"{self.client.market(symbol)['lowercaseId']}@{channel}"
+            for symbol in symbols
+        ]
+
+    async def _rest_fallback_polling_task(self, feed_key):
+        feed, symbol, time_frame = feed_key
+        # push through the default callback: REST updates should not be considered as feed messages
+        callback = super()._get_callback_by_feed()[feed]
+        callback_kwargs = {"symbol": symbol} if time_frame is None else {"symbol": symbol, "timeframe": time_frame}
+        while not self.should_stop:
+            try:
+                if feed is Feeds.TICKER:
+                    update_data = await self.client.fetch_ticker(symbol)
+                else:
+                    # candles: fetch the last closed and current candles
+                    update_data = await self.client.fetch_ohlcv(symbol, time_frame, limit=2)
+                if update_data:
+                    await callback(update_data, **callback_kwargs)
+            except Exception as err:
+                self.logger.warning(f"Error when polling {self._get_feed_description(feed_key)} feed: {err}")
+            await asyncio.sleep(self.REST_FALLBACK_POLLING_INTERVAL)
+
+    def _get_feed_description(self, feed_key):
+        feed, symbol, time_frame = feed_key
+        return f"{feed.value} {symbol}{f' {time_frame}' if time_frame else ''}"
 
     @classmethod
     def get_name(cls):
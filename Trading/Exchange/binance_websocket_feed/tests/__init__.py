@@ -13,3 +13,31 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import mock
+
+import octobot_commons.constants as commons_constants
+import octobot_tentacles_manager.api as tentacles_manager_api
+import octobot_trading.exchanges as exchanges
+from tentacles.Trading.Exchange.binance.binance_exchange import Binance
+from ..binance_websocket import BinanceCCXTWebsocketConnector
+
+
+def create_connector(tentacle_config=None, **exchange_manager_attributes):
+    """
+    :return: a BinanceCCXTWebsocketConnector created from a simulated Binance exchange manager using the given
+    exchange tentacle configuration and exchange manager attributes
+    """
+    exchange_name = Binance.get_name()
+    exchange_manager = exchanges.ExchangeManager(
+        {commons_constants.CONFIG_EXCHANGES: {exchange_name: {}}}, exchange_name
+    )
+    exchange_manager.is_simulated = True
+    exchange_manager.ignore_config = True
+    exchange_manager.tentacles_setup_config = mock.Mock()
+    for attribute, value in exchange_manager_attributes.items():
+        setattr(exchange_manager, attribute, value)
+    with mock.patch.object(
+        tentacles_manager_api, "get_tentacle_config", mock.Mock(return_value=tentacle_config or {})
+    ):
+        exchange_manager.exchange = Binance(exchange_manager.config, exchange_manager)
+    return BinanceCCXTWebsocketConnector(exchange_manager.config, exchange_manager)
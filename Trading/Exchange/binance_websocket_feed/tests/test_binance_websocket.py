@@ -0,0 +1,328 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import time
+import mock
+import pytest
+
+import octobot_trading.exchanges as exchanges
+from octobot_trading.enums import WebsocketFeeds as Feeds
+from tentacles.Trading.Exchange.binance.binance_exchange import Binance
+from . import create_connector
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+STALENESS_THRESHOLD = 0.3
+MESSAGES_INTERVAL = 0.02
+
+
+class _FakeCCXTClient:
+    """
+    ccxt subscriptions behavior: a subscribe message is sent only for subscribe hashes which are not
+    in the client subscriptions yet
+    """
+    options = {}
+    timeframes = {}
+
+    def __init__(self):
+        self.clients = {"stream_url": mock.Mock(subscriptions={})}
+        self.sent_subscribe_messages = []
+
+    def market(self, symbol):
+        return {"lowercaseId": symbol.replace("/", "").lower()}
+
+    def _subscribe(self, symbols, channel):
+        subscriptions = self.clients["stream_url"].subscriptions
+        subscribe_hashes = [f"{self.market(symbol)['lowercaseId']}@{channel}" for symbol in symbols]
+        if any(subscribe_hash not in subscriptions for subscribe_hash in subscribe_hashes):
+            self.sent_subscribe_messages.append(subscribe_hashes)
+            subscriptions.update({subscribe_hash: True for subscribe_hash in subscribe_hashes})
+
+
+class _FakeWebsocketClient(_FakeCCXTClient):
+    """
+    Local fake websocket stream: a ticker message is received every MESSAGES_INTERVAL for each live symbol
+    """
+    def __init__(self, symbols):
+        super().__init__()
+        self.live_symbols = set(symbols)
+        self.messages = {symbol: asyncio.Queue() for symbol in symbols}
+        self.tickers = {}
+        self.watched_batches = set()
+        self.fetch_ticker = mock.AsyncMock(side_effect=lambda symbol: {"symbol": symbol, "source": "rest"})
+        self.close = mock.AsyncMock()
+        self._stream_task = asyncio.create_task(self._stream())
+
+    async def _stream(self):
+        while True:
+            for symbol in self.live_symbols:
+                self.messages[symbol].put_nowait({"symbol": symbol, "source": "websocket"})
+                self.tickers[symbol] = {"symbol": symbol, "source": "websocket", "timestamp": time.time()}
+            await asyncio.sleep(MESSAGES_INTERVAL)
+
+    async def watchTicker(self, symbol=None, **kwargs):
+        self._subscribe([symbol], "ticker")
+        return await self.messages[symbol].get()
+
+
+class _FakeBatchWebsocketClient(_FakeCCXTClient):
+    """
+    Local fake websocket stream: tickers are received when pushed using push_tickers
+    """
+    has = {"watchTickers": True}
+
+    def __init__(self):
+        super().__init__()
+        self.tickers = {}
+        self.watched_batches = set()
+        self._update = asyncio.Event()
+
+    def push_tickers(self, symbols):
+        for symbol in symbols:
+            self.tickers[symbol] = {
+                "symbol": symbol, "timestamp": self.tickers.get(symbol, {}).get("timestamp", 0) + 1
+            }
+        update, self._update = self._update, asyncio.Event()
+        update.set()
+
+    async def watchTicker(self, symbol=None, **kwargs):
+        self._subscribe([symbol], "ticker")
+        await self._update.wait()
+        return self.tickers[symbol]
+
+    async def watchTickers(self, symbols=None, **kwargs):
+        self._subscribe(symbols, "ticker")
+        self.watched_batches.add(tuple(symbols))
+        await self._update.wait()
+        return {}
+
+
+async def _get_connector(client):
+    connector = create_connector(tentacle_config={
+        key: STALENESS_THRESHOLD for key in Binance.FEED_STALENESS_THRESHOLD_KEYS.values()
+    })
+    connector.client = client
+    connector.throttled_ws_updates = 0
+    connector.FEED_HEALTH_CHECK_INTERVAL = MESSAGES_INTERVAL
+    connector.REST_FALLBACK_POLLING_INTERVAL = MESSAGES_INTERVAL
+    # start feeds health checks without connecting
+    with mock.patch.object(exchanges.CCXTWebsocketConnector, "_inner_start", mock.AsyncMock()):
+        await connector._inner_start()
+    return connector
+
+
+async def _process_updates():
+    # let feed tasks handle pushed messages
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def _pushed_tickers(push_to_channel_mock, symbol):
+    return [call.args[2] for call in push_to_channel_mock.mock_calls if call.args[1] == symbol]
+
+
+async def test_stalled_feed_rest_fallback():
+    client = _FakeWebsocketClient(["BTC/USDT", "ETH/USDT"])
+    connector = await _get_connector(client)
+    with mock.patch.object(connector, "push_to_channel", mock.AsyncMock()) as push_to_channel_mock:
+        connector._subscribe_feed(Feeds.TICKER, symbols=["BTC/USDT", "ETH/USDT"])
+        eth_feed_key = (Feeds.TICKER, "ETH/USDT", None)
+        eth_feed_task = connector.feed_tasks[connector._get_feed_identifier(client.watchTicker, {"symbol": "ETH/USDT"})]
+        await asyncio.sleep(STALENESS_THRESHOLD)
+        assert connector.get_feed_gaps_statistics() == {}
+        client.fetch_ticker.assert_not_called()
+        assert sorted(client.sent_subscribe_messages) == [["btcusdt@ticker"], ["ethusdt@ticker"]]
+
+        # ETH/USDT stream stalls
+        client.live_symbols.remove("ETH/USDT")
+        await asyncio.sleep(STALENESS_THRESHOLD * 2)
+        assert list(connector.get_feed_gaps_statistics()) == [eth_feed_key]
+        assert connector.get_feed_gaps_statistics()[eth_feed_key]["stalled"] is True
+        # ETH/USDT only is resubscribed and polled
+        assert eth_feed_task.cancelled()
+        assert client.sent_subscribe_messages[2:] == [["ethusdt@ticker"]]
+        assert not connector.feed_tasks[
+            connector._get_feed_identifier(client.watchTicker, {"symbol": "ETH/USDT"})
+        ].done()
+        assert {call.args[0] for call in client.fetch_ticker.mock_calls} == {"ETH/USDT"}
+        assert {"symbol": "ETH/USDT", "source": "rest"} in _pushed_tickers(push_to_channel_mock, "ETH/USDT")
+        assert all(
+            ticker["source"] == "websocket"
+            for ticker in _pushed_tickers(push_to_channel_mock, "BTC/USDT")
+        )
+
+        # ETH/USDT stream recovers
+        client.live_symbols.add("ETH/USDT")
+        await asyncio.sleep(STALENESS_THRESHOLD / 2)
+        statistics = connector.get_feed_gaps_statistics()[eth_feed_key]
+        assert statistics["stalled"] is False
+        assert statistics["stalls"] == 1
+        assert statistics["max_gap"] == statistics["total_gap"] > STALENESS_THRESHOLD
+        fetch_count = client.fetch_ticker.call_count
+        await asyncio.sleep(STALENESS_THRESHOLD / 2)
+        assert client.fetch_ticker.call_count == fetch_count
+
+        await connector._inner_stop()
+        client._stream_task.cancel()
+        for task in connector.feed_tasks.values():
+            task.cancel()
+        await asyncio.sleep(0)
+        assert connector._feeds_health_task.cancelled()
+
+
+async def test_feed_staleness_thresholds():
+    connector = create_connector(tentacle_config={
+        "ticker_feed_staleness_threshold": 30, "candle_feed_staleness_threshold": 0,
+    })
+    assert connector._get_feed_staleness_thresholds() == {
+        Feeds.TICKER: 30,
+        Feeds.KLINE: 2 * 60,
+        Feeds.CANDLE: 0,
+    }
+
+
+async def test_check_feeds_health():
+    connector = await _get_connector(mock.Mock())
+    connector._feeds_health_task.cancel()
+    connector._feed_staleness_thresholds = {Feeds.TICKER: 30, Feeds.KLINE: 60, Feeds.CANDLE: 0}
+    ticker_key = (Feeds.TICKER, "BTC/USDT", None)
+    kline_key = (Feeds.KLINE, "BTC/USDT", "1h")
+    candle_key = (Feeds.CANDLE, "BTC/USDT", "1h")
+    trades_key = (Feeds.TRADES, "BTC/USDT", None)
+    connector._last_feed_message_times = {ticker_key: 1000, kline_key: 1000, candle_key: 1000, trades_key: 1000}
+    with mock.patch.object(connector, "_rest_fallback_polling_task", mock.AsyncMock()) as polling_mock, \
+            mock.patch.object(connector, "_resubscribe_feeds", mock.Mock()) as _resubscribe_feeds_mock:
+        with mock.patch.object(time, "time", mock.Mock(return_value=1020)):
+            connector._check_feeds_health()
+            _resubscribe_feeds_mock.assert_not_called()
+        with mock.patch.object(time, "time", mock.Mock(return_value=1040)):
+            connector._check_feeds_health()
+            # kline is not stalled yet, disabled candle and untracked trades feeds are never stalled
+            _resubscribe_feeds_mock.assert_called_once_with([ticker_key])
+            _resubscribe_feeds_mock.reset_mock()
+            assert list(connector._stalled_feeds) == [ticker_key]
+        with mock.patch.object(time, "time", mock.Mock(return_value=2000)):
+            # already stalled ticker is not resubscribed again
+            for _ in range(3):
+                connector._check_feeds_health()
+            _resubscribe_feeds_mock.assert_called_once_with([kline_key])
+            assert list(connector._stalled_feeds) == [ticker_key, kline_key]
+            assert connector._feed_gaps_statistics[ticker_key]["stalls"] == 1
+        await asyncio.sleep(0)
+        polling_mock.assert_has_awaits([mock.call(ticker_key), mock.call(kline_key)])
+        await connector._inner_stop()
+
+
+async def test_batch_subscriptions():
+    symbols = [f"COIN{i}/USDT" for i in range(450)]
+    new_symbols = ["NEW1/USDT", "NEW2/USDT", "NEW3/USDT"]
+    client = _FakeBatchWebsocketClient()
+    connector = await _get_connector(client)
+    connector._feeds_health_task.cancel()
+    connector._feed_staleness_thresholds = {Feeds.TICKER: 30}
+    with mock.patch.object(connector, "push_to_channel", mock.AsyncMock()) as push_to_channel_mock, \
+            mock.patch.object(connector, "_rest_fallback_polling_task", mock.AsyncMock()), \
+            mock.patch.object(time, "time", mock.Mock(return_value=1000)) as time_mock:
+        connector._subscribe_feed(Feeds.TICKER, symbols=symbols)
+        assert len(connector.feed_tasks) == 3
+        await _process_updates()
+        assert sorted(len(batch) for batch in client.watched_batches) == [50, 200, 200]
+        time_mock.return_value = 1002
+        client.push_tickers(symbols)
+        await _process_updates()
+        assert {call.args[1] for call in push_to_channel_mock.mock_calls} == set(symbols)
+        assert connector.get_all_feeds_live_duration() == 2
+
+        # already subscribed symbols are not subscribed again
+        connector._subscribe_feed(Feeds.TICKER, symbols=symbols + new_symbols[:2])
+        assert len(connector.feed_tasks) == 4
+        # single new symbol
+        connector._subscribe_feed(Feeds.TICKER, symbols=symbols + new_symbols)
+        assert len(connector.feed_tasks) == 5
+        assert connector._get_feed_identifier(client.watchTicker, {"symbol": "NEW3/USDT"}) in connector.feed_tasks
+        await _process_updates()
+        client.push_tickers(new_symbols)
+        await _process_updates()
+        assert ("NEW1/USDT", "NEW2/USDT") in client.watched_batches
+        assert set(new_symbols).issubset({call.args[1] for call in push_to_channel_mock.mock_calls})
+
+        # COIN0/USDT and COIN1/USDT batch subscribed feeds stall
+        stalled_keys = [(Feeds.TICKER, "COIN0/USDT", None), (Feeds.TICKER, "COIN1/USDT", None)]
+        batch_kwargs = connector._feed_subscriptions[stalled_keys[0]]
+        assert connector._feed_subscriptions[stalled_keys[1]] is batch_kwargs
+        batch_identifier = connector._get_feed_identifier(client.watchTicker, batch_kwargs)
+        batch_task = connector.feed_tasks[batch_identifier]
+        time_mock.return_value = 1020
+        client.push_tickers(symbols[2:] + new_symbols)
+        await _process_updates()
+        time_mock.return_value = 1040
+        with mock.patch.object(
+            connector, "_create_task_if_necessary", mock.Mock(wraps=connector._create_task_if_necessary)
+        ) as _create_task_if_necessary_mock:
+            connector._check_feeds_health()
+            connector._check_feeds_health()
+            # the whole batch is resubscribed once
+            _create_task_if_necessary_mock.assert_called_once()
+            assert _create_task_if_necessary_mock.mock_calls[0].kwargs == batch_kwargs
+        assert list(connector._stalled_feeds) == stalled_keys
+        await _process_updates()
+        assert batch_task.cancelled()
+        # a new subscribe message is sent for the whole batch
+        assert client.sent_subscribe_messages[-1] == [
+            f"{client.market(symbol)['lowercaseId']}@ticker" for symbol in batch_kwargs["symbols"]
+        ]
+        assert not connector.feed_tasks[batch_identifier].done()
+        assert len(connector.feed_tasks) == 5
+
+        # feeds recover from the resubscribed batch
+        push_to_channel_mock.reset_mock()
+        client.push_tickers(symbols + new_symbols)
+        await _process_updates()
+        assert {call.args[1] for call in push_to_channel_mock.mock_calls} == set(symbols + new_symbols)
+        assert connector._stalled_feeds == {}
+        assert all(
+            statistics["stalls"] == 1
+            for statistics in connector.get_feed_gaps_statistics().values()
+        )
+        assert list(connector.get_feed_gaps_statistics()) == stalled_keys
+
+        await connector._inner_stop()
+        for task in connector.feed_tasks.values():
+            task.cancel()
+
+
+async def test_single_symbol_subscriptions_in_batches():
+    client = _FakeBatchWebsocketClient()
+    connector = await _get_connector(client)
+    connector._feeds_health_task.cancel()
+    connector._subscribe_feed(Feeds.TICKER, symbols=["BTC/USDT"])
+    connector._subscribe_feed(Feeds.TICKER, symbols=["BTC/USDT", "ETH/USDT"])
+    # already subscribed symbols are not subscribed again, even when previously subscribed alone
+    connector._subscribe_feed(Feeds.TICKER, symbols=["BTC/USDT", "ETH/USDT", "SOL/USDT", "XRP/USDT"])
+    connector._subscribe_feed(Feeds.TICKER, symbols=["BTC/USDT", "ETH/USDT", "SOL/USDT", "XRP/USDT"])
+    assert sorted(connector.feed_tasks) == sorted([
+        connector._get_feed_identifier(client.watchTicker, {"symbol": "BTC/USDT"}),
+        connector._get_feed_identifier(client.watchTicker, {"symbol": "ETH/USDT"}),
+        connector._get_feed_identifier(client.watchTicker, {"symbols": ["SOL/USDT", "XRP/USDT"]}),
+    ])
+    await _process_updates()
+    assert client.sent_subscribe_messages == [
+        ["btcusdt@ticker"], ["ethusdt@ticker"], ["solusdt@ticker", "xrpusdt@ticker"]
+    ]
+    await connector._inner_stop()
+    for task in connector.feed_tasks.values():
+        task.cancel()
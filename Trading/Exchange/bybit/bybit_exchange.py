@@ -13,6 +13,7 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import asyncio
 import decimal
 import typing
 
@@ -94,11 +95,14 @@ class Bybit(exchanges.RestExchange):
     STOP_ORDERS_FILTER = "stop"
     SPOT_STOP_ORDERS_FILTER = "StopOrder"
     ORDER_FILTER = "orderFilter"
+    MAX_REMEMBERED_ORDER_FAMILIES = 1000
 
     def __init__(self, config, exchange_manager, connector_class=None):
         super().__init__(config, exchange_manager, connector_class=connector_class)
         self.order_quantity_by_amount = {}
         self.order_quantity_by_id = {}
+        # spot stop orders are fetched from a different endpoint: remember which one to use for each order id
+        self.is_stop_order_by_id = {}
 
     def get_additional_connector_config(self):
         connector_config = {
@@ -157,22 +161,59 @@ class Bybit(exchanges.RestExchange):
         if symbol and not self.exchange_manager.is_future:
             # not done by ccxt spot request
             symbol = self.connector.client.markets[symbol]["id"]
-        orders = await super().get_open_orders(symbol=symbol, since=since, limit=limit, **kwargs)
-        if not self.exchange_manager.is_future:
-            kwargs = kwargs or {}
-            # include stop orders
-            kwargs[self.ORDER_FILTER] = self.SPOT_STOP_ORDERS_FILTER
-            orders += await super().get_open_orders(symbol=symbol, since=since, limit=limit, **kwargs)
-        return orders
+        if self.exchange_manager.is_future:
+            return await super().get_open_orders(symbol=symbol, since=since, limit=limit, **kwargs)
+        kwargs = kwargs or {}
+        # include stop orders: fetch both at once
+        orders, stop_orders = await asyncio.gather(
+            super().get_open_orders(symbol=symbol, since=since, limit=limit, **kwargs),
+            super().get_open_orders(symbol=symbol, since=since, limit=limit, **self._get_stop_orders_params(kwargs))
+        )
+        for order in orders:
+            self._remember_order_family(order[trading_enums.ExchangeConstantsOrderColumns.ID.value], False)
+        for order in stop_orders:
+            self._remember_order_family(order[trading_enums.ExchangeConstantsOrderColumns.ID.value], True)
+        return orders + stop_orders
 
     async def get_order(self, exchange_order_id: str, symbol: str = None, **kwargs: dict) -> dict:
-        order = await super().get_order(exchange_order_id, symbol=symbol, **kwargs)
-        if order is None and not self.exchange_manager.is_future:
-            kwargs = kwargs or {}
-            # try stop orders
-            kwargs[self.ORDER_FILTER] = self.SPOT_STOP_ORDERS_FILTER
-            order = await super().get_order(exchange_order_id, symbol=symbol, **kwargs)
-        return order
+        if self.exchange_manager.is_future:
+            return await super().get_order(exchange_order_id, symbol=symbol, **kwargs)
+        kwargs = kwargs or {}
+        is_stop_order = self.is_stop_order_by_id.get(exchange_order_id)
+        if is_stop_order is None:
+            # unknown order: try regular and stop orders at once
+            order, stop_order = await asyncio.gather(
+                super().get_order(exchange_order_id, symbol=symbol, **kwargs),
+                super().get_order(exchange_order_id, symbol=symbol, **self._get_stop_orders_params(kwargs)),
+                return_exceptions=True
+            )
+            for is_stop_order, found_order in ((False, order), (True, stop_order)):
+                if isinstance(found_order, dict):
+                    self._remember_order_family(exchange_order_id, is_stop_order)
+                    return found_order
+            for error in (order, stop_order):
+                if isinstance(error, Exception):
+                    raise error
+            return None
+        families = [(kwargs, False), (self._get_stop_orders_params(kwargs), True)]
+        if is_stop_order:
+            # try the known order family first
+            families.reverse()
+        for params, is_stop in families:
+            if (order := await super().get_order(exchange_order_id, symbol=symbol, **params)) is not None:
+                self._remember_order_family(exchange_order_id, is_stop)
+                return order
+        return None
+
+    def _get_stop_orders_params(self, kwargs: dict) -> dict:
+        return {**kwargs, self.ORDER_FILTER: self.SPOT_STOP_ORDERS_FILTER}
+
+    def _remember_order_family(self, exchange_order_id: str, is_stop_order: bool):
+        if exchange_order_id not in self.is_stop_order_by_id \
+                and len(self.is_stop_order_by_id) >= self.MAX_REMEMBERED_ORDER_FAMILIES:
+            # forget the oldest order
+            self.is_stop_order_by_id.pop(next(iter(self.is_stop_order_by_id)))
+        self.is_stop_order_by_id[exchange_order_id] = is_stop_order
 
     async def cancel_order(
             self, exchange_order_id: str, symbol: str, order_type: trading_enums.TraderOrderType, **kwargs: dict
@@ -13,3 +13,30 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import mock
+
+import octobot_commons.constants as commons_constants
+import octobot_tentacles_manager.api as tentacles_manager_api
+import octobot_trading.exchanges as exchanges
+from ..bybit_exchange import Bybit
+
+
+def create_exchange(tentacle_config=None, **exchange_manager_attributes):
+    """
+    :return: a Bybit exchange created from a simulated exchange manager using the given tentacle
+    configuration and exchange manager attributes
+    """
+    exchange_name = Bybit.get_name()
+    exchange_manager = exchanges.ExchangeManager(
+        {commons_constants.CONFIG_EXCHANGES: {exchange_name: {}}}, exchange_name
+    )
+    exchange_manager.is_simulated = True
+    exchange_manager.ignore_config = True
+    exchange_manager.tentacles_setup_config = mock.Mock()
+    for attribute, value in exchange_manager_attributes.items():
+        setattr(exchange_manager, attribute, value)
+    with mock.patch.object(
+        tentacles_manager_api, "get_tentacle_config", mock.Mock(return_value=tentacle_config or {})
+    ):
+        exchange_manager.exchange = Bybit(exchange_manager.config, exchange_manager)
+    return exchange_manager.exchange
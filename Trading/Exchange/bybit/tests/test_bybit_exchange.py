@@ -0,0 +1,111 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import time
+import mock
+import pytest
+
+import octobot_trading.enums as trading_enums
+import octobot_trading.exchanges as exchanges
+from ...bybit import Bybit
+from . import create_exchange
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+DELAY = 0.2
+
+
+def _order(order_id):
+    return {trading_enums.ExchangeConstantsOrderColumns.ID.value: order_id}
+
+
+def _fetched_orders(orders_ids, stop_orders_ids, fetches):
+    async def _delayed_get_order(exchange_order_id, symbol=None, **kwargs):
+        is_stop = kwargs.get(Bybit.ORDER_FILTER) == Bybit.SPOT_STOP_ORDERS_FILTER
+        fetches.append(is_stop)
+        await asyncio.sleep(DELAY)
+        return _order(exchange_order_id) if exchange_order_id in (stop_orders_ids if is_stop else orders_ids) \
+            else None
+    return _delayed_get_order
+
+
+async def test_get_open_orders():
+    bybit = create_exchange()
+    bybit.connector.client.markets = {"BTC/USDT": {"id": "BTCUSDT"}}
+
+    async def _delayed_get_open_orders(symbol=None, since=None, limit=None, **kwargs):
+        await asyncio.sleep(DELAY)
+        if kwargs.get(Bybit.ORDER_FILTER) == Bybit.SPOT_STOP_ORDERS_FILTER:
+            return [_order("2")]
+        return [_order("1")]
+
+    with mock.patch.object(exchanges.RestExchange, "get_open_orders", mock.AsyncMock(
+        side_effect=_delayed_get_open_orders
+    )) as get_open_orders_mock:
+        t0 = time.time()
+        assert await bybit.get_open_orders("BTC/USDT") == [_order("1"), _order("2")]
+        # fetched concurrently
+        assert time.time() - t0 < 2 * DELAY
+        assert get_open_orders_mock.call_count == 2
+        assert bybit.is_stop_order_by_id == {"1": False, "2": True}
+
+
+async def test_get_order():
+    bybit = create_exchange()
+    fetches = []
+    with mock.patch.object(exchanges.RestExchange, "get_order", mock.AsyncMock(
+        side_effect=_fetched_orders({"1"}, {"2"}, fetches)
+    )):
+        # unknown orders: regular and stop orders are fetched concurrently
+        t0 = time.time()
+        assert await bybit.get_order("1", symbol="BTC/USDT") == _order("1")
+        assert await bybit.get_order("2", symbol="BTC/USDT") == _order("2")
+        assert await bybit.get_order("3", symbol="BTC/USDT") is None
+        assert time.time() - t0 < 3 * 2 * DELAY
+        assert fetches == [False, True] * 3
+        assert bybit.is_stop_order_by_id == {"1": False, "2": True}
+        fetches.clear()
+
+        # known orders: use the known endpoint only
+        assert await bybit.get_order("1", symbol="BTC/USDT") == _order("1")
+        assert await bybit.get_order("2", symbol="BTC/USDT") == _order("2")
+        assert fetches == [False, True]
+        fetches.clear()
+
+        # order family changed: fallback on the other endpoint
+        bybit.is_stop_order_by_id["1"] = True
+        assert await bybit.get_order("1", symbol="BTC/USDT") == _order("1")
+        assert fetches == [True, False]
+        assert bybit.is_stop_order_by_id["1"] is False
+
+    with mock.patch.object(exchanges.RestExchange, "get_order", mock.AsyncMock(side_effect=[
+        None, RuntimeError
+    ])):
+        # errors are raised when the order is not found
+        with pytest.raises(RuntimeError):
+            await bybit.get_order("4", symbol="BTC/USDT")
+
+
+async def test_remember_order_family():
+    bybit = create_exchange()
+    with mock.patch.object(Bybit, "MAX_REMEMBERED_ORDER_FAMILIES", 2):
+        bybit._remember_order_family("1", False)
+        bybit._remember_order_family("2", True)
+        bybit._remember_order_family("2", False)
+        assert bybit.is_stop_order_by_id == {"1": False, "2": False}
+        bybit._remember_order_family("3", True)
+        assert bybit.is_stop_order_by_id == {"2": False, "3": True}
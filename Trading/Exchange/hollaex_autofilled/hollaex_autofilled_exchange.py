@@ -13,8 +13,15 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import asyncio
+import dataclasses
+import os
+import time
+import aiohttp
 import requests
 
+import octobot_commons.constants as commons_constants
+import octobot_commons.json_util as json_util
 import octobot_commons.logging as commons_logging
 import octobot_trading.exchanges as exchanges
 import octobot_trading.errors as errors
@@ -23,6 +30,17 @@ from ..hollaex.hollaex_exchange import hollaex
 
 class HollaexAutofilled(hollaex):
     HAS_FETCHED_DETAILS = True
+    # fetched kit details are saved to be reused on next starts
+    KIT_DETAILS_CACHE_FILE = os.path.join(commons_constants.USER_FOLDER, "hollaex_autofilled_kits.json")
+    KIT_DETAILS_CACHE_DURATION = commons_constants.DAYS_TO_SECONDS
+    KIT_REQUEST_TIMEOUT = 10
+    CACHED_URL = "url"
+    CACHED_FETCH_TIME = "fetch_time"
+    CACHED_DETAILS = "details"
+
+    def __init__(self, config, exchange_manager):
+        self._details_refresh_task = None
+        super().__init__(config, exchange_manager)
 
     @staticmethod
     def supported_autofill_exchanges(tentacle_config):
@@ -34,23 +52,112 @@ class HollaexAutofilled(hollaex):
 
     @classmethod
     async def get_autofilled_exchange_details(cls, aiohttp_session, tentacle_config, exchange_name):
-        kit_details = await aiohttp_session.get(HollaexAutofilled._get_kit_url(tentacle_config, exchange_name))
-        return HollaexAutofilled._parse_autofilled_exchange_details(
-            tentacle_config, await kit_details.json(), exchange_name
-        )
+        cached_details, is_expired = cls._get_cached_details(tentacle_config, exchange_name)
+        if cached_details is not None and not is_expired:
+            return cached_details
+        try:
+            return await cls._fetch_and_cache_details(aiohttp_session, tentacle_config, exchange_name)
+        except Exception as err:
+            if cached_details is None:
+                raise
+            commons_logging.get_logger(cls.get_name()).warning(
+                f"Failed to refresh {exchange_name} kit details, using cached details instead ({err})"
+            )
+            return cached_details
+
+    @classmethod
+    async def _fetch_and_cache_details(cls, aiohttp_session, tentacle_config, exchange_name):
+        exchange_kit_url = cls._get_kit_url(tentacle_config, exchange_name)
+        async with aiohttp_session.get(
+            exchange_kit_url, timeout=aiohttp.ClientTimeout(total=cls.KIT_REQUEST_TIMEOUT)
+        ) as kit_details:
+            kit_details.raise_for_status()
+            details = cls._parse_autofilled_exchange_details(tentacle_config, await kit_details.json(), exchange_name)
+        cls._cache_details(exchange_kit_url, details)
+        return details
 
     def _fetch_details(self, config, exchange_manager):
+        exchange_name = exchange_manager.exchange_name
         try:
-            exchange_kit_url = self._get_kit_url(self.tentacle_config, exchange_manager.exchange_name)
+            exchange_kit_url = self._get_kit_url(self.tentacle_config, exchange_name)
         except KeyError:
-            raise errors.NotSupported(f"{exchange_manager.exchange_name} is not supported by {self.get_name()}")
-        self._apply_config(
-            self._parse_autofilled_exchange_details(
+            raise errors.NotSupported(f"{exchange_name} is not supported by {self.get_name()}")
+        details, is_expired = self._get_cached_details(self.tentacle_config, exchange_name)
+        if details is None:
+            # unknown kit: details are required to create the exchange connector
+            details = self._parse_autofilled_exchange_details(
                 self.tentacle_config,
-                requests.get(exchange_kit_url).json(),
-                exchange_manager.exchange_name
+                requests.get(exchange_kit_url, timeout=self.KIT_REQUEST_TIMEOUT).json(),
+                exchange_name
             )
-        )
+            self._cache_details(exchange_kit_url, details)
+        elif is_expired:
+            # don't block startup: use cached details and refresh them for next starts
+            self._schedule_details_refresh(exchange_name)
+        self._apply_config(details)
+
+    def _schedule_details_refresh(self, exchange_name):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # no running loop: details will be refreshed on next start
+            return
+        self._details_refresh_task = asyncio.create_task(self._refresh_details(exchange_name))
+
+    async def _refresh_details(self, exchange_name):
+        try:
+            async with aiohttp.ClientSession() as session:
+                details = await self._fetch_and_cache_details(session, self.tentacle_config, exchange_name)
+            self.logger.debug(f"Refreshed {exchange_name} kit details: {details}")
+        except Exception as err:
+            self.logger.warning(f"Failed to refresh {exchange_name} kit details: {err}")
+
+    async def stop(self) -> None:
+        if self._details_refresh_task is not None and not self._details_refresh_task.done():
+            self._details_refresh_task.cancel()
+        await super().stop()
+
+    @classmethod
+    def _get_cached_details(cls, tentacle_config, exchange_name) -> (exchanges.ExchangeDetails, bool):
+        """
+        :return: the cached exchange details (None when not cached) and True when these details are expired
+        """
+        cached_kit = cls._read_cached_kits().get(exchange_name)
+        if cached_kit is None or cached_kit[cls.CACHED_URL] != cls._get_kit_url(tentacle_config, exchange_name):
+            return None, True
+        details = exchanges.ExchangeDetails(**{
+            **cached_kit[cls.CACHED_DETAILS],
+            # websocket support is configured in tentacle config
+            "has_websocket": cls._has_websocket(tentacle_config, exchange_name),
+        })
+        return details, time.time() - cached_kit[cls.CACHED_FETCH_TIME] > cls.KIT_DETAILS_CACHE_DURATION
+
+    @classmethod
+    def _cache_details(cls, exchange_kit_url, details: exchanges.ExchangeDetails):
+        cached_kits = cls._read_cached_kits()
+        cached_kits[details.id] = {
+            cls.CACHED_URL: exchange_kit_url,
+            cls.CACHED_FETCH_TIME: time.time(),
+            cls.CACHED_DETAILS: dataclasses.asdict(details),
+        }
+        try:
+            json_util.safe_dump(cached_kits, cls.KIT_DETAILS_CACHE_FILE)
+        except Exception as err:
+            commons_logging.get_logger(cls.get_name()).exception(
+                err, True, f"Unexpected error when saving kit details: {err}"
+            )
+
+    @classmethod
+    def _read_cached_kits(cls) -> dict:
+        try:
+            return json_util.read_file(cls.KIT_DETAILS_CACHE_FILE)
+        except FileNotFoundError:
+            return {}
+        except Exception as err:
+            commons_logging.get_logger(cls.get_name()).exception(
+                err, True, f"Unexpected error when reading cached kit details: {err}"
+            )
+            return {}
 
     def _supports_autofill(self, exchange_name):
         try:
@@ -0,0 +1,126 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import http.server
+import json
+import threading
+import aiohttp
+import mock
+import pytest
+
+import octobot_commons.json_util as json_util
+from ...hollaex_autofilled import HollaexAutofilled
+from . import create_exchange
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+EXCHANGE_NAME = "myhollaex"
+KIT = {
+    "api_name": "My HollaEx",
+    "links": {
+        "referral_link": "https://myhollaex.com",
+        "api": "https://api.myhollaex.com",
+    },
+    "logo_image": "https://myhollaex.com/logo.png",
+}
+
+
+class _KitRequestHandler(http.server.BaseHTTPRequestHandler):
+    requests_count = 0
+    status = 200
+
+    def do_GET(self):
+        _KitRequestHandler.requests_count += 1
+        self.send_response(self.status)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(KIT).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def kit_server():
+    _KitRequestHandler.requests_count = 0
+    _KitRequestHandler.status = 200
+    server = http.server.HTTPServer(("127.0.0.1", 0), _KitRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v2/kit"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    cache_file = str(tmp_path / "kits.json")
+    with mock.patch.object(HollaexAutofilled, "KIT_DETAILS_CACHE_FILE", cache_file):
+        yield cache_file
+
+
+def _tentacle_config(kit_url):
+    return {"auto_filled": {EXCHANGE_NAME: {"url": kit_url, "websockets": True}}}
+
+
+async def test_fetch_details(kit_server, cache_file):
+    # unknown kit: fetched
+    exchange = create_exchange(EXCHANGE_NAME, _tentacle_config(kit_server))
+    assert exchange.tentacle_config[exchange.REST_KEY] == "https://api.myhollaex.com"
+    assert exchange.tentacle_config[exchange.HAS_WEBSOCKETS_KEY] is True
+    assert _KitRequestHandler.requests_count == 1
+    assert json_util.read_file(cache_file)[EXCHANGE_NAME][HollaexAutofilled.CACHED_URL] == kit_server
+
+    # known kit: no request
+    exchange = create_exchange(EXCHANGE_NAME, _tentacle_config(kit_server))
+    assert exchange.tentacle_config[exchange.REST_KEY] == "https://api.myhollaex.com"
+    assert exchange._details_refresh_task is None
+    assert _KitRequestHandler.requests_count == 1
+
+    # expired kit: cached details are used and refreshed in background
+    with mock.patch.object(HollaexAutofilled, "KIT_DETAILS_CACHE_DURATION", -1):
+        exchange = create_exchange(EXCHANGE_NAME, _tentacle_config(kit_server))
+        assert exchange.tentacle_config[exchange.REST_KEY] == "https://api.myhollaex.com"
+        assert _KitRequestHandler.requests_count == 1
+        await exchange._details_refresh_task
+        assert _KitRequestHandler.requests_count == 2
+
+
+async def test_get_autofilled_exchange_details(kit_server, cache_file):
+    tentacle_config = _tentacle_config(kit_server)
+    async with aiohttp.ClientSession() as session:
+        details = await HollaexAutofilled.get_autofilled_exchange_details(session, tentacle_config, EXCHANGE_NAME)
+        assert details.name == "My HollaEx"
+        assert details.api == "https://api.myhollaex.com"
+        assert details.has_websocket is True
+        assert await HollaexAutofilled.get_autofilled_exchange_details(
+            session, tentacle_config, EXCHANGE_NAME
+        ) == details
+        assert _KitRequestHandler.requests_count == 1
+
+        # expired and unreachable kit: use cached details
+        _KitRequestHandler.status = 500
+        with mock.patch.object(HollaexAutofilled, "KIT_DETAILS_CACHE_DURATION", -1):
+            assert await HollaexAutofilled.get_autofilled_exchange_details(
+                session, tentacle_config, EXCHANGE_NAME
+            ) == details
+        assert _KitRequestHandler.requests_count == 2
+
+        # unknown and unreachable kit
+        with pytest.raises(aiohttp.ClientResponseError):
+            await HollaexAutofilled.get_autofilled_exchange_details(
+                session, _tentacle_config(f"{kit_server}/other"), EXCHANGE_NAME
+            )
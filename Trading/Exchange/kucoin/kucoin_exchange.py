@@ -14,11 +14,14 @@
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
 import asyncio
+import functools
+import random
 import time
 import decimal
 import typing
 import ccxt
 
+import octobot_commons.enums as commons_enums
 import octobot_commons.logging as logging
 import octobot_trading.errors
 import octobot_trading.exchanges as exchanges
@@ -29,31 +32,135 @@ import octobot_trading.constants as constants
 import octobot_trading.enums as trading_enums
 
 
-def _kucoin_retrier(f):
+class KucoinRetryPolicy:
+    """
+    Retry policy shared by every retried request of a Kucoin exchange: retries are delayed using an exponential
+    backoff with jitter or the exchange rate limit reset hints and are limited by a retry budget which prevents
+    extending rate limit bans during errors bursts.
+    """
+    BASE_DELAY = 0.5
+    MAX_DELAY = 10
+    MAX_RETRY_AFTER_DELAY = 60
+    # at most RETRY_BUDGET retries every RETRY_BUDGET_REFILL_PERIOD seconds
+    RETRY_BUDGET = 20
+    RETRY_BUDGET_REFILL_PERIOD = 60
+    RETRY_AFTER_HEADER = "retry-after"  # in seconds
+    RATE_LIMIT_REMAINING_HEADER = "gw-ratelimit-remaining"
+    RATE_LIMIT_RESET_HEADER = "gw-ratelimit-reset"  # in milliseconds
+
+    def __init__(self, max_attempts):
+        self.max_attempts = max_attempts
+        self.remaining_retry_budget = self.RETRY_BUDGET
+        self.last_retry_budget_update = time.time()
+        # metrics
+        self.retries_count = 0
+        self.total_retry_delay = 0
+        self.exhausted_retry_budget_count = 0
+        self.failed_after_retries_count = 0
+
+    def get_metrics(self) -> dict:
+        return {
+            "retries_count": self.retries_count,
+            "total_retry_delay": self.total_retry_delay,
+            "exhausted_retry_budget_count": self.exhausted_retry_budget_count,
+            "failed_after_retries_count": self.failed_after_retries_count,
+        }
+
+    def consume_retry_budget(self) -> bool:
+        now = time.time()
+        self.remaining_retry_budget = min(
+            self.RETRY_BUDGET,
+            self.remaining_retry_budget +
+            (now - self.last_retry_budget_update) * self.RETRY_BUDGET / self.RETRY_BUDGET_REFILL_PERIOD
+        )
+        self.last_retry_budget_update = now
+        if self.remaining_retry_budget < 1:
+            self.exhausted_retry_budget_count += 1
+            return False
+        self.remaining_retry_budget -= 1
+        return True
+
+    def get_retry_delay(self, attempt: int, response_headers: typing.Optional[dict]) -> float:
+        delay = min(self.MAX_DELAY, self.BASE_DELAY * 2 ** attempt)
+        # jitter: avoid retrying concurrent requests at the same time
+        delay = random.uniform(delay / 2, delay)
+        if (retry_after := self._get_retry_after(response_headers)) is not None:
+            delay = max(delay, min(retry_after, self.MAX_RETRY_AFTER_DELAY))
+        return delay
+
+    def register_retry(self, delay: float):
+        self.retries_count += 1
+        self.total_retry_delay += delay
+
+    def _get_retry_after(self, response_headers: typing.Optional[dict]) -> typing.Optional[float]:
+        headers = {
+            key.lower(): value
+            for key, value in (response_headers or {}).items()
+        }
+        try:
+            if retry_after := headers.get(self.RETRY_AFTER_HEADER):
+                return float(retry_after)
+            if headers.get(self.RATE_LIMIT_REMAINING_HEADER) == "0" \
+                    and (reset := headers.get(self.RATE_LIMIT_RESET_HEADER)):
+                return float(reset) / 1000
+        except ValueError:
+            # unexpected header value (ex: http date retry-after)
+            pass
+        return None
+
+
+def _is_retriable_error(rest_exchange, error, retry_on_unavailable_exchange) -> bool:
+    last_http_response = rest_exchange.connector.client.last_http_response
+    if last_http_response and Kucoin.INSTANT_RETRY_ERROR_CODE in last_http_response:
+        # error on kucoin side
+        # see https://github.com/Drakkar-Software/OctoBot/issues/2000
+        return True
+    errors = (error, error.__cause__)
+    if any(isinstance(err, ccxt.DDoSProtection) for err in errors):
+        # 429 errors
+        return True
+    # 5xx errors: the request might have been processed by the exchange
+    return retry_on_unavailable_exchange and any(
+        isinstance(err, (ccxt.ExchangeNotAvailable, ccxt.RequestTimeout)) for err in errors
+    )
+
+
+def _kucoin_retrier(f=None, retry_on_unavailable_exchange=True):
+    if f is None:
+        return functools.partial(_kucoin_retrier, retry_on_unavailable_exchange=retry_on_unavailable_exchange)
+
     async def wrapper(*args, **kwargs):
         last_error = None
-        for i in range(0, Kucoin.FAKE_DDOS_ERROR_INSTANT_RETRY_COUNT):
+        rest_exchange = args[0]  # self
+        retry_policy = rest_exchange.retry_policy
+        for i in range(0, retry_policy.max_attempts):
             try:
                 return await f(*args, **kwargs)
-            except (octobot_trading.errors.FailedRequest, ccxt.ExchangeError) as err:
+            except (octobot_trading.errors.FailedRequest, ccxt.ExchangeError, ccxt.NetworkError) as err:
                 last_error = err
-                rest_exchange = args[0]  # self
-                if rest_exchange.connector.client.last_http_response and \
-                        Kucoin.INSTANT_RETRY_ERROR_CODE in rest_exchange.connector.client.last_http_response:
-                    # should retry instantly, error on kucoin side
-                    # see https://github.com/Drakkar-Software/OctoBot/issues/2000
-                    logging.get_logger(Kucoin.get_name()).debug(
-                        f"{Kucoin.INSTANT_RETRY_ERROR_CODE} error on {f.__name__}(args={args[1:]} kwargs={kwargs}) "
-                        f"request, retrying now. Attempt {i+1} / {Kucoin.FAKE_DDOS_ERROR_INSTANT_RETRY_COUNT}, "
-                        f"error: {err} ({last_error.__class__.__name__})."
+                if not _is_retriable_error(rest_exchange, err, retry_on_unavailable_exchange):
+                    raise
+                if i + 1 >= retry_policy.max_attempts:
+                    break
+                if not retry_policy.consume_retry_budget():
+                    logging.get_logger(Kucoin.get_name()).warning(
+                        f"Kucoin retry budget exhausted, not retrying {f.__name__}(args={args[1:]} kwargs={kwargs}) "
+                        f"request. Error: {err} ({err.__class__.__name__})."
                     )
-                else:
                     raise
+                delay = retry_policy.get_retry_delay(i, rest_exchange.connector.client.last_response_headers)
+                retry_policy.register_retry(delay)
+                logging.get_logger(Kucoin.get_name()).debug(
+                    f"Error on {f.__name__}(args={args[1:]} kwargs={kwargs}) request, retrying in {delay:.2f} "
+                    f"seconds. Attempt {i+1} / {retry_policy.max_attempts}, "
+                    f"error: {err} ({last_error.__class__.__name__})."
+                )
+                await asyncio.sleep(delay)
+        retry_policy.failed_after_retries_count += 1
         last_error = last_error or RuntimeError("Unknown Kucoin error")  # to be able to "raise from" in next line
         raise octobot_trading.errors.FailedRequest(
-            f"Failed Kucoin request after {Kucoin.FAKE_DDOS_ERROR_INSTANT_RETRY_COUNT} "
-            f"retries on {f.__name__}(args={args[1:]} kwargs={kwargs}) due "
-            f"to {Kucoin.INSTANT_RETRY_ERROR_CODE} error code. "
+            f"Failed Kucoin request after {retry_policy.max_attempts} "
+            f"attempts on {f.__name__}(args={args[1:]} kwargs={kwargs}). "
             f"Last error: {last_error} ({last_error.__class__.__name__})"
         ) from last_error
     return wrapper
@@ -64,7 +171,7 @@ class Kucoin(exchanges.RestExchange):
     REMOVE_MARKET_STATUS_PRICE_LIMITS = True
     ADAPT_MARKET_STATUS_FOR_CONTRACT_SIZE = True
 
-    FAKE_DDOS_ERROR_INSTANT_RETRY_COUNT = 5
+    FAKE_DDOS_ERROR_INSTANT_RETRY_COUNT = 5   # max attempts of retried requests
     INSTANT_RETRY_ERROR_CODE = "429000"
     FUTURES_CCXT_CLASS_NAME = "kucoinfutures"
     MAX_INCREASED_POSITION_QUANTITY_MULTIPLIER = decimal.Decimal("0.95")
@@ -113,6 +220,44 @@ class Kucoin(exchanges.RestExchange):
         ("order does not exist",),
     ]
 
+    # when enabled, spot order books are maintained from websocket level 2 updates, each of them requiring
+    # REST snapshots on startup and resynchronizations
+    ORDER_BOOK_FEED_KEY = "websocket_order_book_feed"
+    DEFAULT_ORDER_BOOK_FEED = False
+
+    def __init__(self, config, exchange_manager, connector_class=None):
+        super().__init__(config, exchange_manager, connector_class=connector_class)
+        self.retry_policy = KucoinRetryPolicy(self.FAKE_DDOS_ERROR_INSTANT_RETRY_COUNT)
+        # market statuses by (symbol, with_fixer), valid as long as client markets are not reloaded
+        self._market_status_cache = {}
+        self._market_status_cache_markets = None
+
+    @classmethod
+    def init_user_inputs_from_class(cls, inputs: dict) -> None:
+        """
+        Called at constructor, should define all the exchange's user inputs.
+        """
+        cls.CLASS_UI.user_input(
+            cls.ORDER_BOOK_FEED_KEY, commons_enums.UserInputTypes.BOOLEAN, cls.DEFAULT_ORDER_BOOK_FEED, inputs,
+            title="Websocket order book feed: maintain spot order books from websocket level 2 updates. "
+                  "Each traded pair order book requires REST snapshots on startup and after connection issues: "
+                  "only enable it when using a trading mode relying on order books.",
+        )
+
+    async def stop(self) -> None:
+        self.log_retry_metrics()
+        await super().stop()
+
+    def log_retry_metrics(self):
+        metrics = self.retry_policy.get_metrics()
+        if any(metrics.values()):
+            self.logger.info(
+                f"Requests retries: {metrics['retries_count']} retries for a total delay of "
+                f"{metrics['total_retry_delay']:.2f} seconds, "
+                f"{metrics['exhausted_retry_budget_count']} not retried due to exhausted retry budget, "
+                f"{metrics['failed_after_retries_count']} failed after all retries."
+            )
+
     @classmethod
     def get_name(cls):
         return 'kucoin'
@@ -186,7 +331,27 @@ class Kucoin(exchanges.RestExchange):
 
     def get_market_status(self, symbol, price_example=None, with_fixer=True):
         """
-        local override to take "minFunds" into account
+        local override to cache market statuses until markets are reloaded: market statuses are fetched
+        on each order creation and re-adapting them every time is expensive
+        """
+        if price_example is not None:
+            return self._create_market_status(symbol, price_example, with_fixer)
+        markets = self.connector.client.markets
+        if markets is not self._market_status_cache_markets:
+            # markets have been (re)loaded: cached market statuses are outdated
+            self._market_status_cache = {}
+            self._market_status_cache_markets = markets
+        try:
+            return self._market_status_cache[(symbol, with_fixer)]
+        except KeyError:
+            market_status = self._create_market_status(symbol, None, with_fixer)
+            if market_status:
+                self._market_status_cache[(symbol, with_fixer)] = market_status
+            return market_status
+
+    def _create_market_status(self, symbol, price_example, with_fixer):
+        """
+        take "minFunds" into account
         "minFunds	the minimum spot and margin trading amounts" https://docs.kucoin.com/#get-symbols-list
         """
         market_status = super().get_market_status(symbol, price_example=price_example, with_fixer=with_fixer)
@@ -220,12 +385,7 @@ class Kucoin(exchanges.RestExchange):
     @_kucoin_retrier
     async def get_order_book(self, symbol, limit=20, **kwargs):
         # override default limit to be kucoin complient
-        return super().get_order_book(symbol, limit=limit, **kwargs)
-
-    @_kucoin_retrier
-    async def get_order_book(self, symbol, limit=20, **kwargs):
-        # override default limit to be kucoin complient
-        return super().get_order_book(symbol, limit=limit, **kwargs)
+        return await super().get_order_book(symbol, limit=limit, **kwargs)
 
     @_kucoin_retrier
     async def get_price_ticker(self, symbol: str, **kwargs: dict) -> typing.Optional[dict]:
@@ -297,13 +457,14 @@ class Kucoin(exchanges.RestExchange):
             # default is 50, The maximum cannot exceed 1000
             # https://www.kucoin.com/docs/rest/futures-trading/orders/get-order-list
             limit = 200
-        regular_orders = await super().get_open_orders(symbol=symbol, since=since, limit=limit, **kwargs)
-        stop_orders = []
-        if self.exchange_manager.is_future:
+        if not self.exchange_manager.is_future:
             # stop ordes are futures only for now
-            # add untriggered stop orders (different api endpoint)
-            kwargs["stop"] = True
-            stop_orders = await super().get_open_orders(symbol=symbol, since=since, limit=limit, **kwargs)
+            return await super().get_open_orders(symbol=symbol, since=since, limit=limit, **kwargs)
+        # add untriggered stop orders (different api endpoint): fetch both at once
+        regular_orders, stop_orders = await asyncio.gather(
+            super().get_open_orders(symbol=symbol, since=since, limit=limit, **kwargs),
+            super().get_open_orders(symbol=symbol, since=since, limit=limit, **{**kwargs, "stop": True})
+        )
         return regular_orders + stop_orders
 
     @_kucoin_retrier
@@ -323,7 +484,8 @@ class Kucoin(exchanges.RestExchange):
                                           reduce_only=reduce_only, params=params)
 
     # add retried to _create_order_with_retry to avoid catching error in self._order_operation context manager
-    @_kucoin_retrier
+    # don't retry when the exchange is unavailable: the order might have been created
+    @_kucoin_retrier(retry_on_unavailable_exchange=False)
     async def _create_order_with_retry(self, order_type, symbol, quantity: decimal.Decimal,
                                        price: decimal.Decimal, stop_price: decimal.Decimal,
                                        side: trading_enums.TradeOrderSide,
@@ -348,7 +510,8 @@ class Kucoin(exchanges.RestExchange):
 
         # todo remove when supported by ccxt
         @_kucoin_retrier
-        async def fetch_position(client, symbol, params={}):
+        async def fetch_position(rest_exchange, symbol, params={}):
+            client = rest_exchange.connector.client
             market = client.market(symbol)
             market_id = market['id']
             request = {
@@ -405,7 +568,7 @@ class Kucoin(exchanges.RestExchange):
             return client.extend(client.parse_position(data, None), params)
 
         return self.connector.adapter.adapt_position(
-            await fetch_position(self.connector.client, symbol, **kwargs)
+            await fetch_position(self, symbol, **kwargs)
         )
 
     async def set_symbol_partial_take_profit_stop_loss(self, symbol: str, inverse: bool,
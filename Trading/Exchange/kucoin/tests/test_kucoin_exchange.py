@@ -0,0 +1,199 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import decimal
+import time
+import ccxt
+import mock
+import pytest
+
+import octobot_trading.errors as errors
+import octobot_trading.personal_data as personal_data
+from ...kucoin import kucoin_exchange
+from . import create_exchange
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+BTC_USDT_MARKET = {
+    "id": "BTC-USDT", "symbol": "BTC/USDT", "base": "BTC", "quote": "USDT", "baseId": "BTC", "quoteId": "USDT",
+    "type": "spot", "spot": True, "contract": False, "active": True,
+    "precision": {"amount": 0.00000001, "price": 0.1},
+    "limits": {
+        "amount": {"min": 0.00001, "max": 10000000000},
+        "price": {"min": None, "max": None},
+        "cost": {"min": 0.1, "max": 99999999},
+    },
+    "info": {"minFunds": "0.1"},
+}
+
+
+def _get_kucoin(responses):
+    kucoin = create_exchange()
+    kucoin.responses = list(responses)
+    return kucoin
+
+
+@kucoin_exchange._kucoin_retrier
+async def _request(kucoin):
+    return _next_response(kucoin)
+
+
+@kucoin_exchange._kucoin_retrier(retry_on_unavailable_exchange=False)
+async def _create_order(kucoin):
+    return _next_response(kucoin)
+
+
+def _next_response(kucoin):
+    response = kucoin.responses.pop(0)
+    if isinstance(response, Exception):
+        raise response
+    return response
+
+
+async def test_retrier_backoff():
+    kucoin = _get_kucoin([ccxt.DDoSProtection("429"), ccxt.RequestTimeout("timeout"), "ok"])
+    with mock.patch.object(kucoin_exchange.asyncio, "sleep", mock.AsyncMock()) as sleep_mock, \
+         mock.patch.object(kucoin_exchange.random, "uniform", mock.Mock(side_effect=lambda a, b: b)):
+        assert await _request(kucoin) == "ok"
+        assert [call.args[0] for call in sleep_mock.mock_calls] == [0.5, 1]
+    assert kucoin.retry_policy.get_metrics() == {
+        "retries_count": 2,
+        "total_retry_delay": 1.5,
+        "exhausted_retry_budget_count": 0,
+        "failed_after_retries_count": 0,
+    }
+
+    # kucoin rate limit reset hint
+    kucoin = _get_kucoin([ccxt.DDoSProtection("429"), "ok"])
+    kucoin.connector.client.last_response_headers = {"gw-ratelimit-remaining": "0", "gw-ratelimit-reset": "3000"}
+    with mock.patch.object(kucoin_exchange.asyncio, "sleep", mock.AsyncMock()) as sleep_mock:
+        assert await _request(kucoin) == "ok"
+        sleep_mock.assert_awaited_once_with(3)
+
+    # too many failures
+    kucoin = _get_kucoin([errors.FailedRequest("error")] * kucoin.FAKE_DDOS_ERROR_INSTANT_RETRY_COUNT)
+    kucoin.connector.client.last_http_response = '{"code":"429000"}'
+    with mock.patch.object(kucoin_exchange.asyncio, "sleep", mock.AsyncMock()) as sleep_mock:
+        with pytest.raises(errors.FailedRequest):
+            await _request(kucoin)
+        assert len(sleep_mock.mock_calls) == kucoin.FAKE_DDOS_ERROR_INSTANT_RETRY_COUNT - 1
+    assert kucoin.retry_policy.failed_after_retries_count == 1
+
+
+async def test_retrier_non_retriable_errors():
+    kucoin = _get_kucoin([ccxt.InsufficientFunds("funds")])
+    with mock.patch.object(kucoin_exchange.asyncio, "sleep", mock.AsyncMock()) as sleep_mock:
+        with pytest.raises(ccxt.InsufficientFunds):
+            await _request(kucoin)
+        sleep_mock.assert_not_called()
+
+    # orders might have been created: don't retry on unavailable exchange
+    kucoin = _get_kucoin([ccxt.ExchangeNotAvailable("503"), "ok"])
+    with mock.patch.object(kucoin_exchange.asyncio, "sleep", mock.AsyncMock()) as sleep_mock:
+        with pytest.raises(ccxt.ExchangeNotAvailable):
+            await _create_order(kucoin)
+        sleep_mock.assert_not_called()
+
+
+async def test_retrier_budget():
+    kucoin = _get_kucoin([ccxt.DDoSProtection("429"), ccxt.DDoSProtection("429"), "ok"])
+    kucoin.retry_policy.remaining_retry_budget = 0
+    now = kucoin.retry_policy.last_retry_budget_update
+    with mock.patch.object(kucoin_exchange.time, "time", mock.Mock(return_value=now)), \
+         mock.patch.object(kucoin_exchange.asyncio, "sleep", mock.AsyncMock()) as sleep_mock:
+        with pytest.raises(ccxt.DDoSProtection):
+            await _request(kucoin)
+        sleep_mock.assert_not_called()
+    assert kucoin.retry_policy.exhausted_retry_budget_count == 1
+    # budget is refilled over time
+    with mock.patch.object(kucoin_exchange.time, "time", mock.Mock(
+        return_value=kucoin.retry_policy.last_retry_budget_update + kucoin.retry_policy.RETRY_BUDGET_REFILL_PERIOD
+    )), mock.patch.object(kucoin_exchange.asyncio, "sleep", mock.AsyncMock()) as sleep_mock:
+        assert await _request(kucoin) == "ok"
+        sleep_mock.assert_awaited_once()
+    assert kucoin.retry_policy.remaining_retry_budget == kucoin.retry_policy.RETRY_BUDGET - 1
+
+
+async def test_get_market_status():
+    kucoin = create_exchange()
+    kucoin.connector.client.markets = {"BTC/USDT": {}}
+    with mock.patch.object(kucoin_exchange.exchanges.RestExchange, "get_market_status",
+                           mock.Mock(side_effect=lambda symbol, **_: {"symbol": symbol})) as get_market_status_mock:
+        market_status = kucoin.get_market_status("BTC/USDT", with_fixer=False)
+        assert market_status == {"symbol": "BTC/USDT"}
+        assert kucoin.get_market_status("BTC/USDT", with_fixer=False) is market_status
+        get_market_status_mock.assert_called_once_with("BTC/USDT", price_example=None, with_fixer=False)
+        # not cached with a price example
+        kucoin.get_market_status("BTC/USDT", price_example=1, with_fixer=False)
+        kucoin.get_market_status("BTC/USDT", price_example=1, with_fixer=False)
+        assert get_market_status_mock.call_count == 3
+        # reloaded markets
+        kucoin.connector.client.markets = {"BTC/USDT": {}}
+        assert kucoin.get_market_status("BTC/USDT", with_fixer=False) is not market_status
+        assert get_market_status_mock.call_count == 4
+        # don't cache empty market statuses
+        get_market_status_mock.side_effect = lambda symbol, **_: {}
+        assert kucoin.get_market_status("ETH/USDT", with_fixer=False) == {}
+        assert kucoin.get_market_status("ETH/USDT", with_fixer=False) == {}
+        assert get_market_status_mock.call_count == 6
+
+
+async def test_get_market_status_orders_creation_benchmark():
+    kucoin = create_exchange()
+    kucoin.connector.client.set_markets([BTC_USDT_MARKET])
+    orders_count = 5000
+    quantity = decimal.Decimal("0.0123456789")
+    price = decimal.Decimal("30000.123")
+
+    def _create_orders_details(get_market_status):
+        # order creations read the symbol market status to adapt each order quantity and price
+        t0 = time.perf_counter()
+        for _ in range(orders_count):
+            personal_data.decimal_check_and_adapt_order_details_if_necessary(
+                quantity, price, get_market_status("BTC/USDT")
+            )
+        return time.perf_counter() - t0
+
+    with mock.patch.object(
+        kucoin_exchange.exchanges.RestExchange, "get_market_status",
+        mock.Mock(wraps=kucoin_exchange.exchanges.RestExchange.get_market_status.__get__(kucoin))
+    ) as get_market_status_mock:
+        uncached_duration = _create_orders_details(
+            lambda symbol: kucoin._create_market_status(symbol, None, True)
+        )
+        assert get_market_status_mock.call_count == orders_count
+        get_market_status_mock.reset_mock()
+        cached_duration = _create_orders_details(kucoin.get_market_status)
+        # market status is only created once
+        assert get_market_status_mock.call_count == 1
+    assert cached_duration * 3 < uncached_duration
+
+
+async def test_stop_logs_retry_metrics():
+    kucoin = _get_kucoin([])
+    kucoin.logger = mock.Mock()
+    with mock.patch.object(kucoin_exchange.exchanges.RestExchange, "stop", mock.AsyncMock()) as stop_mock:
+        # nothing to log
+        await kucoin.stop()
+        stop_mock.assert_awaited_once()
+        kucoin.logger.info.assert_not_called()
+        kucoin.retry_policy.register_retry(1.5)
+        kucoin.retry_policy.failed_after_retries_count = 1
+        await kucoin.stop()
+        kucoin.logger.info.assert_called_once_with(
+            "Requests retries: 1 retries for a total delay of 1.50 seconds, "
+            "0 not retried due to exhausted retry budget, 1 failed after all retries."
+        )
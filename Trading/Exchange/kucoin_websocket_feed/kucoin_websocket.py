@@ -13,23 +13,157 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import asyncio
+import time
+
+import sortedcontainers
+
+import octobot_trading.constants as trading_constants
 import octobot_trading.exchanges as exchanges
 from octobot_trading.enums import WebsocketFeeds as Feeds
 import tentacles.Trading.Exchange.kucoin.kucoin_exchange as kucoin_exchange
 
 
+class KucoinLocalOrderBook:
+    """
+    Level 2 order book maintained in memory from a REST snapshot and the /market/level2 websocket diffs.
+    Diffs received before the snapshot are buffered and replayed once the snapshot is applied.
+    A sequence gap resets the book: a new snapshot is then required.
+    """
+    MAX_PENDING_DIFFS = 1000
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.sequence = None
+        self.asks = sortedcontainers.SortedDict()
+        self.bids = sortedcontainers.SortedDict()
+        self.resyncs_count = 0
+        self.last_update_time = 0
+        self._pending_diffs = []
+
+    def is_synchronized(self) -> bool:
+        return self.sequence is not None
+
+    def reset(self):
+        self.sequence = None
+        self.asks.clear()
+        self.bids.clear()
+
+    def apply_snapshot(self, snapshot: dict) -> bool:
+        """
+        :param snapshot: a ccxt order book, its nonce is the kucoin sequence of the snapshot
+        :return: False when the snapshot is older than the buffered diffs and can't be used
+        """
+        pending_diffs = self._pending_diffs
+        self._pending_diffs = []
+        self.reset()
+        self.sequence = int(snapshot["nonce"])
+        self._set_levels(self.asks, snapshot["asks"])
+        self._set_levels(self.bids, snapshot["bids"])
+        self.last_update_time = time.time()
+        for index, diff in enumerate(pending_diffs):
+            if not self.apply_diff(diff):
+                # the snapshot is older than the buffered diffs: keep them for the next snapshot
+                self._pending_diffs.extend(pending_diffs[index + 1:])
+                return False
+        return True
+
+    def apply_diff(self, diff: dict) -> bool:
+        """
+        :param diff: the data of a trade.l2update message
+        :return: False when a sequence gap has been detected: the book is reset and should be resynchronized
+        """
+        if self.sequence is None:
+            self._pending_diffs.append(diff)
+            if len(self._pending_diffs) > self.MAX_PENDING_DIFFS:
+                self._pending_diffs.pop(0)
+            return True
+        sequence_start = int(diff["sequenceStart"])
+        sequence_end = int(diff["sequenceEnd"])
+        if sequence_end <= self.sequence:
+            # already included in the book
+            return True
+        if sequence_start > self.sequence + 1:
+            self.reset()
+            self.resyncs_count += 1
+            self._pending_diffs.append(diff)
+            return False
+        changes = diff["changes"]
+        self._apply_changes(self.asks, changes.get("asks", []))
+        self._apply_changes(self.bids, changes.get("bids", []))
+        self.sequence = sequence_end
+        self.last_update_time = time.time()
+        return True
+
+    def _apply_changes(self, book_side, changes):
+        for price, size, sequence in changes:
+            if int(sequence) <= self.sequence:
+                continue
+            price = float(price)
+            if price == 0:
+                # sequence only update
+                continue
+            size = float(size)
+            if size == 0:
+                book_side.pop(price, None)
+            else:
+                book_side[price] = size
+
+    @staticmethod
+    def _set_levels(book_side, levels):
+        for price, size in levels:
+            if size:
+                book_side[float(price)] = float(size)
+
+    def get_best_ask(self):
+        """
+        :return: the [price, size] of the best ask or None
+        """
+        if not self.asks:
+            return None
+        return list(self.asks.peekitem(0))
+
+    def get_best_bid(self):
+        """
+        :return: the [price, size] of the best bid or None
+        """
+        if not self.bids:
+            return None
+        return list(self.bids.peekitem(-1))
+
+    def get_spread(self):
+        if not (self.asks and self.bids):
+            return None
+        return self.asks.peekitem(0)[0] - self.bids.peekitem(-1)[0]
+
+    def get_asks(self, depth=None) -> list:
+        """
+        :return: the [price, size] asks sorted from the best one
+        """
+        return [[price, self.asks[price]] for price in self.asks.islice(0, depth)]
+
+    def get_bids(self, depth=None) -> list:
+        """
+        :return: the [price, size] bids sorted from the best one
+        """
+        start = 0 if depth is None else max(0, len(self.bids) - depth)
+        return [[price, self.bids[price]] for price in self.bids.islice(start, len(self.bids), reverse=True)]
+
+
 class KucoinCCXTWebsocketConnector(exchanges.CCXTWebsocketConnector):
     EXCHANGE_FEEDS = {
         Feeds.TRADES: True,
         Feeds.KLINE: True,
         Feeds.TICKER: True,
         Feeds.CANDLE: True,
+        Feeds.L2_BOOK: Feeds.UNSUPPORTED.value,  # enabled from the kucoin exchange configuration
     }
     FUTURES_EXCHANGE_FEEDS = {
         Feeds.TRADES: True,
         Feeds.KLINE: Feeds.UNSUPPORTED.value,  # not supported in futures
         Feeds.TICKER: True,
         Feeds.CANDLE: Feeds.UNSUPPORTED.value,  # not supported in futures
+        Feeds.L2_BOOK: Feeds.UNSUPPORTED.value,  # local order book is only maintained on spot
     }
 
     SPOT_EXCHANGE_FEEDS = {
@@ -37,6 +171,7 @@ class KucoinCCXTWebsocketConnector(exchanges.CCXTWebsocketConnector):
         Feeds.KLINE: True,
         Feeds.TICKER: True,
         Feeds.CANDLE: True,
+        Feeds.L2_BOOK: True,    # only when enabled in the kucoin exchange configuration
     }
 
     IGNORED_FEED_PAIRS = {
@@ -51,6 +186,24 @@ class KucoinCCXTWebsocketConnector(exchanges.CCXTWebsocketConnector):
     RECREATE_CLIENT_ON_DISCONNECT = True   # when True, a new ccxt websocket client will replace the previous
     # one when the exchange is disconnected
 
+    LEVEL2_TOPIC = "/market/level2"
+    LEVEL2_DIFF_SUBJECT = "trade.l2update"
+    ORDER_BOOK_MESSAGE_HASH_PREFIX = "orderbook:"
+    ORDER_BOOK_SNAPSHOT_DEPTH = 100
+    ORDER_BOOK_PUSHED_DEPTH = 20    # depth of the order books pushed to the ORDER_BOOK_CHANNEL
+    ORDER_BOOK_RESYNC_DELAY = 1
+    MAX_ORDER_BOOK_RESYNC_ATTEMPTS = 5
+    # minimum time between 2 order book snapshot requests, whatever the symbol
+    MIN_ORDER_BOOK_SNAPSHOT_INTERVAL = 0.5
+
+    def __init__(self, *args, **kwargs):
+        self._local_order_books = {}
+        self._order_book_resync_tasks = {}
+        self._order_book_snapshot_lock = asyncio.Lock()
+        self._last_order_book_snapshot_time = 0
+        self._pushed_book_tickers = {}
+        super().__init__(*args, **kwargs)
+
     @classmethod
     def get_name(cls):
         return kucoin_exchange.Kucoin.get_name()
@@ -65,7 +218,121 @@ class KucoinCCXTWebsocketConnector(exchanges.CCXTWebsocketConnector):
         if exchange_manager.is_future:
             cls.EXCHANGE_FEEDS = cls.FUTURES_EXCHANGE_FEEDS
         else:
-            cls.EXCHANGE_FEEDS = cls.SPOT_EXCHANGE_FEEDS
+            cls.EXCHANGE_FEEDS = dict(cls.SPOT_EXCHANGE_FEEDS)
+            if not exchange_manager.exchange.tentacle_config.get(
+                kucoin_exchange.Kucoin.ORDER_BOOK_FEED_KEY, kucoin_exchange.Kucoin.DEFAULT_ORDER_BOOK_FEED
+            ):
+                cls.EXCHANGE_FEEDS[Feeds.L2_BOOK] = Feeds.UNSUPPORTED.value
 
     def get_adapter_class(self, adapter_class):
         return kucoin_exchange.KucoinCCXTAdapter
+
+    def get_local_order_book(self, symbol) -> KucoinLocalOrderBook:
+        """
+        :return: the in-memory order book of the symbol, None when not watched
+        """
+        return self._local_order_books.get(symbol)
+
+    def _create_client(self):
+        super()._create_client()
+        # diffs from the previous client are lost: local order books have to be resynchronized
+        self._cancel_order_book_resync_tasks()
+        self._local_order_books = {}
+        # ccxt kucoin is not detecting sequence gaps once its order book is initialized:
+        # level2 messages are handled by the local order books instead
+        self._ccxt_handle_order_book = self.client.handle_order_book
+        self.client.handle_order_book = self._handle_order_book_message
+
+    async def _inner_stop(self):
+        self._cancel_order_book_resync_tasks()
+        await super()._inner_stop()
+
+    def _cancel_order_book_resync_tasks(self):
+        for task in self._order_book_resync_tasks.values():
+            if not task.done():
+                task.cancel()
+        self._order_book_resync_tasks = {}
+
+    def _get_feed_generator_by_feed(self):
+        generators = super()._get_feed_generator_by_feed()
+        generators[Feeds.L2_BOOK] = self._watch_local_order_book
+        return generators
+
+    async def _watch_local_order_book(self, symbol, **kwargs):
+        await self.client.load_markets()
+        if symbol not in self._local_order_books:
+            self._local_order_books[symbol] = KucoinLocalOrderBook(symbol)
+        url = await self.client.negotiate(False)
+        topic = f"{self.LEVEL2_TOPIC}:{self.client.market_id(symbol)}"
+        # resolved with the local order book sequence: the book itself is read from memory
+        return await self.client.subscribe(url, f"{self.ORDER_BOOK_MESSAGE_HASH_PREFIX}{symbol}", topic)
+
+    def _handle_order_book_message(self, client, message):
+        if message.get("subject") != self.LEVEL2_DIFF_SUBJECT:
+            return self._ccxt_handle_order_book(client, message)
+        data = message["data"]
+        symbol = self.client.safe_symbol(data["symbol"], None, "-")
+        local_book = self._local_order_books.get(symbol)
+        if local_book is None:
+            return
+        if not local_book.apply_diff(data):
+            self.logger.debug(f"Sequence gap in {symbol} order book diffs, resynchronizing")
+        if local_book.is_synchronized():
+            client.resolve(local_book.sequence, f"{self.ORDER_BOOK_MESSAGE_HASH_PREFIX}{symbol}")
+        elif symbol not in self._order_book_resync_tasks or self._order_book_resync_tasks[symbol].done():
+            self._order_book_resync_tasks[symbol] = asyncio.create_task(
+                self._resync_local_order_book(client, local_book)
+            )
+
+    async def _resync_local_order_book(self, client, local_book):
+        for attempt in range(self.MAX_ORDER_BOOK_RESYNC_ATTEMPTS):
+            try:
+                snapshot = await self._fetch_order_book_snapshot(local_book.symbol)
+                if local_book.apply_snapshot(snapshot):
+                    client.resolve(
+                        local_book.sequence, f"{self.ORDER_BOOK_MESSAGE_HASH_PREFIX}{local_book.symbol}"
+                    )
+                    return
+                self.logger.debug(f"Outdated {local_book.symbol} order book snapshot (attempt {attempt + 1})")
+            except Exception as err:
+                self.logger.warning(f"Error when fetching {local_book.symbol} order book snapshot: {err}")
+            await asyncio.sleep(self.ORDER_BOOK_RESYNC_DELAY)
+        self.logger.error(
+            f"Failed to synchronize {local_book.symbol} order book after "
+            f"{self.MAX_ORDER_BOOK_RESYNC_ATTEMPTS} attempts, waiting for the next diff"
+        )
+
+    async def _fetch_order_book_snapshot(self, symbol):
+        # snapshots are heavy requests: space them to avoid rate limits when many books are (re)synchronized
+        # at the same time, which happens on startup and reconnection
+        async with self._order_book_snapshot_lock:
+            wait_time = self.MIN_ORDER_BOOK_SNAPSHOT_INTERVAL - (time.time() - self._last_order_book_snapshot_time)
+            if wait_time > 0:
+                await asyncio.sleep(wait_time)
+            self._last_order_book_snapshot_time = time.time()
+        return await self.client.fetch_order_book(symbol, self.ORDER_BOOK_SNAPSHOT_DEPTH)
+
+    async def book(self, order_book, symbol=None, **kwargs):
+        """
+        :param order_book: the local order book sequence
+        :param symbol: the feed symbol
+        :param kwargs: the feed kwargs
+        """
+        local_book = self.get_local_order_book(symbol)
+        if local_book is None or not local_book.is_synchronized():
+            return
+        asks = local_book.get_asks(self.ORDER_BOOK_PUSHED_DEPTH)
+        bids = local_book.get_bids(self.ORDER_BOOK_PUSHED_DEPTH)
+        book_instance = self.get_book_instance(symbol)
+        book_instance.handle_new_books(asks=asks, bids=bids)
+        await self.push_to_channel(trading_constants.ORDER_BOOK_CHANNEL,
+                                   symbol,
+                                   book_instance.asks,
+                                   book_instance.bids,
+                                   update_order_book=False)
+        best_ask = local_book.get_best_ask() or [0, 0]
+        best_bid = local_book.get_best_bid() or [0, 0]
+        book_ticker = (best_ask[1], best_ask[0], best_bid[1], best_bid[0])
+        if self._pushed_book_tickers.get(symbol) != book_ticker:
+            self._pushed_book_tickers[symbol] = book_ticker
+            await self.push_to_channel(trading_constants.ORDER_BOOK_TICKER_CHANNEL, symbol, *book_ticker)
@@ -0,0 +1,165 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import json
+import os
+import ccxt.pro
+import mock
+import pytest
+
+import octobot_trading.constants as trading_constants
+from octobot_trading.enums import WebsocketFeeds as Feeds
+import tentacles.Trading.Exchange.kucoin.kucoin_exchange as kucoin_exchange
+from ...kucoin_websocket_feed import KucoinCCXTWebsocketConnector
+from .. import kucoin_websocket
+from ..kucoin_websocket import KucoinLocalOrderBook
+from . import create_connector
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+SYMBOL = "BTC/USDT"
+
+
+def _load_fixture():
+    with open(os.path.join(os.path.dirname(__file__), "static", "level2_messages.json")) as fixture_file:
+        return json.load(fixture_file)
+
+
+def _replay(local_book, messages):
+    return [local_book.apply_diff(message["data"]) for message in messages]
+
+
+def _get_connector(snapshot):
+    connector = create_connector(tentacle_config={kucoin_exchange.Kucoin.ORDER_BOOK_FEED_KEY: True})
+    connector.client.fetch_order_book = mock.AsyncMock(return_value=snapshot)
+    # SYMBOL order book is watched
+    connector._local_order_books[SYMBOL] = KucoinLocalOrderBook(SYMBOL)
+    return connector
+
+
+async def test_local_order_book_replay():
+    fixture = _load_fixture()
+    local_book = KucoinLocalOrderBook(SYMBOL)
+    # diffs received before the snapshot are buffered
+    assert _replay(local_book, fixture["messages"][:2]) == [True, True]
+    assert not local_book.is_synchronized()
+    assert local_book.get_best_bid() is None
+    assert local_book.apply_snapshot(fixture["snapshot"]) is True
+    assert local_book.sequence == 104
+    assert _replay(local_book, fixture["messages"][2:]) == [True, True]
+    # replaying already applied diffs is a no-op
+    assert _replay(local_book, fixture["messages"]) == [True] * 4
+    assert local_book.sequence == 107
+    assert local_book.get_best_ask() == [101.5, 0.7]
+    assert local_book.get_best_bid() == [100.5, 4.0]
+    assert local_book.get_spread() == 1.0
+    assert local_book.get_asks() == [[101.5, 0.7], [102.0, 2.0], [103.0, 1.5]]
+    assert local_book.get_bids() == [[100.5, 4.0], [100.0, 1.0], [99.0, 3.0]]
+    assert local_book.get_asks(2) == [[101.5, 0.7], [102.0, 2.0]]
+    assert local_book.get_bids(2) == [[100.5, 4.0], [100.0, 1.0]]
+    assert local_book.resyncs_count == 0
+
+
+async def test_local_order_book_sequence_gap():
+    fixture = _load_fixture()
+    local_book = KucoinLocalOrderBook(SYMBOL)
+    local_book.apply_snapshot(fixture["snapshot"])
+    assert _replay(local_book, fixture["messages"]) == [True] * 4
+    # 108 and 109 are missing
+    assert _replay(local_book, fixture["gap_messages"]) == [False]
+    assert not local_book.is_synchronized()
+    assert local_book.get_asks() == local_book.get_bids() == []
+    assert local_book.resyncs_count == 1
+    # snapshot older than the buffered diffs
+    assert local_book.apply_snapshot({**fixture["snapshot"], "nonce": 107}) is False
+    assert not local_book.is_synchronized()
+    assert local_book.resyncs_count == 2
+    assert local_book.apply_snapshot({**fixture["snapshot"], "nonce": 109}) is True
+    assert local_book.sequence == 110
+    assert local_book.get_best_bid() == [100.8, 1.0]
+    assert local_book.get_best_ask() == [101.0, 1.0]
+
+
+async def test_handle_order_book_message():
+    fixture = _load_fixture()
+    with mock.patch.object(ccxt.pro.kucoin, "handle_order_book", mock.Mock()) as ccxt_handle_order_book_mock:
+        connector = _get_connector(fixture["snapshot"])
+    ws_client = mock.Mock()
+    message_hash = f"{connector.ORDER_BOOK_MESSAGE_HASH_PREFIX}{SYMBOL}"
+    for message in fixture["messages"][:2]:
+        connector._handle_order_book_message(ws_client, message)
+    ws_client.resolve.assert_not_called()
+    await connector._order_book_resync_tasks[SYMBOL]
+    connector.client.fetch_order_book.assert_awaited_once_with(SYMBOL, connector.ORDER_BOOK_SNAPSHOT_DEPTH)
+    ws_client.resolve.assert_called_once_with(104, message_hash)
+    for message in fixture["messages"][2:]:
+        connector._handle_order_book_message(ws_client, message)
+    assert ws_client.resolve.mock_calls[-1] == mock.call(107, message_hash)
+    # non diff messages are left to ccxt
+    depth_message = {"type": "message", "topic": "/spotMarket/level2Depth5:BTC-USDT", "subject": "level2"}
+    connector._handle_order_book_message(ws_client, depth_message)
+    ccxt_handle_order_book_mock.assert_called_once_with(ws_client, depth_message)
+
+    with mock.patch.object(connector, "push_to_channel", mock.AsyncMock()) as push_to_channel_mock:
+        await connector.book(107, symbol=SYMBOL)
+        assert [call.args[0] for call in push_to_channel_mock.mock_calls] == [
+            trading_constants.ORDER_BOOK_CHANNEL, trading_constants.ORDER_BOOK_TICKER_CHANNEL
+        ]
+        assert push_to_channel_mock.mock_calls[1].args[1:] == (SYMBOL, 0.7, 101.5, 4.0, 100.5)
+        assert list(connector.get_book_instance(SYMBOL).asks) == [101.5, 102.0, 103.0]
+        push_to_channel_mock.reset_mock()
+        # unchanged top of book: only the order book is pushed
+        await connector.book(107, symbol=SYMBOL)
+        assert [call.args[0] for call in push_to_channel_mock.mock_calls] == [trading_constants.ORDER_BOOK_CHANNEL]
+
+    # gap: resynchronized from a new snapshot
+    connector.client.fetch_order_book.return_value = {**fixture["snapshot"], "nonce": 109}
+    connector._handle_order_book_message(ws_client, fixture["gap_messages"][0])
+    assert not connector.get_local_order_book(SYMBOL).is_synchronized()
+    await connector._order_book_resync_tasks[SYMBOL]
+    assert ws_client.resolve.mock_calls[-1] == mock.call(110, message_hash)
+    assert connector.get_local_order_book(SYMBOL).get_best_bid() == [100.8, 1.0]
+
+
+async def test_fetch_order_book_snapshot_rate_limit():
+    fixture = _load_fixture()
+    connector = _get_connector(fixture["snapshot"])
+    with mock.patch.object(kucoin_websocket.time, "time", mock.Mock(return_value=1000)), \
+         mock.patch.object(kucoin_websocket.asyncio, "sleep", mock.AsyncMock()) as sleep_mock:
+        assert await connector._fetch_order_book_snapshot(SYMBOL) == fixture["snapshot"]
+        sleep_mock.assert_not_called()
+        # concurrent snapshots are spaced
+        await asyncio.gather(*(connector._fetch_order_book_snapshot(SYMBOL) for _ in range(2)))
+        assert sleep_mock.mock_calls == [mock.call(connector.MIN_ORDER_BOOK_SNAPSHOT_INTERVAL)] * 2
+        assert connector.client.fetch_order_book.await_count == 3
+
+
+async def test_update_exchange_feeds():
+    exchange_manager = mock.Mock(is_future=False, exchange=mock.Mock(tentacle_config={}))
+    with mock.patch.object(KucoinCCXTWebsocketConnector, "EXCHANGE_FEEDS", {}):
+        # order book feed is opt-in
+        KucoinCCXTWebsocketConnector.update_exchange_feeds(exchange_manager)
+        assert KucoinCCXTWebsocketConnector.EXCHANGE_FEEDS[Feeds.L2_BOOK] == Feeds.UNSUPPORTED.value
+        assert KucoinCCXTWebsocketConnector.EXCHANGE_FEEDS[Feeds.TICKER] is True
+        exchange_manager.exchange.tentacle_config = {kucoin_exchange.Kucoin.ORDER_BOOK_FEED_KEY: True}
+        KucoinCCXTWebsocketConnector.update_exchange_feeds(exchange_manager)
+        assert KucoinCCXTWebsocketConnector.EXCHANGE_FEEDS[Feeds.L2_BOOK] is True
+        assert KucoinCCXTWebsocketConnector.SPOT_EXCHANGE_FEEDS[Feeds.L2_BOOK] is True
+        # not available on futures
+        exchange_manager.is_future = True
+        KucoinCCXTWebsocketConnector.update_exchange_feeds(exchange_manager)
+        assert KucoinCCXTWebsocketConnector.EXCHANGE_FEEDS[Feeds.L2_BOOK] == Feeds.UNSUPPORTED.value
@@ -13,7 +13,9 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import asyncio
 import decimal
+import time
 import typing
 
 import octobot_commons.constants as commons_constants
@@ -143,6 +145,14 @@ class Okx(exchanges.RestExchange):
     # set True when get_positions() is not returning empty positions and should use get_position() instead
     REQUIRES_SYMBOL_FOR_EMPTY_POSITION = True
 
+    # leverage data are refreshed when changed from the bot or when older than LEVERAGE_DATA_REFRESH_DELAY
+    LEVERAGE_DATA_REFRESH_DELAY = commons_constants.HOURS_TO_SECONDS
+
+    def __init__(self, config, exchange_manager, connector_class=None):
+        super().__init__(config, exchange_manager, connector_class=connector_class)
+        # symbol: (fetch time, leverage data)
+        self._leverage_data_by_symbol = {}
+
     @classmethod
     def get_name(cls):
         return 'okx'
@@ -234,18 +244,31 @@ class Okx(exchanges.RestExchange):
         is_stop_order = kwargs.get("stop", False)
         if is_stop_order and self.connector.adapter.OKX_ORDER_TYPE not in kwargs:
             kwargs[self.connector.adapter.OKX_ORDER_TYPE] = self.connector.adapter.OKX_CONDITIONAL_ORDER_TYPE
-        regular_orders = await method(symbol=symbol, since=since, limit=limit, **kwargs)
-        if is_stop_order:
-            # only require stop orders
-            return regular_orders
+        if is_stop_order or not self.exchange_manager.is_future:
+            # only require stop orders or stop orders are futures only for now
+            return await method(symbol=symbol, since=since, limit=limit, **kwargs)
         # add order types of order (different param in api endpoint)
-        other_orders = []
-        if self.exchange_manager.is_future:
-            # stop orders are futures only for now
-            for order_type in self._get_used_order_types():
-                kwargs["ordType"] = order_type
-                other_orders += await method(symbol=symbol, since=since, limit=limit, **kwargs)
-        return regular_orders + other_orders
+        # fetch each order type concurrently: requests are still throttled by the ccxt rate limiter
+        orders_by_type = await asyncio.gather(
+            method(symbol=symbol, since=since, limit=limit, **kwargs),
+            *(
+                method(
+                    symbol=symbol, since=since, limit=limit,
+                    **{**kwargs, self.connector.adapter.OKX_ORDER_TYPE: order_type}
+                )
+                for order_type in self._get_used_order_types()
+            )
+        )
+        return self._merge_orders(orders_by_type)
+
+    @staticmethod
+    def _merge_orders(orders_by_type: list) -> list:
+        merged_orders = {}
+        for orders in orders_by_type:
+            for order in orders:
+                # an order can be returned by different order types requests
+                merged_orders.setdefault(order[trading_enums.ExchangeConstantsOrderColumns.ID.value], order)
+        return list(merged_orders.values())
 
     async def get_open_orders(self, symbol=None, since=None, limit=None, **kwargs) -> list:
         return await self._get_all_typed_orders(
@@ -373,12 +396,26 @@ class Okx(exchanges.RestExchange):
         """
         kwargs = self._get_margin_query_params(symbol, **kwargs)
         kwargs.pop(self.connector.adapter.OKX_LEVER, None)
-        return await self.connector.set_symbol_leverage(leverage=leverage, symbol=symbol, **kwargs)
+        try:
+            return await self.connector.set_symbol_leverage(leverage=leverage, symbol=symbol, **kwargs)
+        finally:
+            # clear after the update to avoid caching leverage data fetched during the request
+            self._leverage_data_by_symbol.pop(symbol, None)
 
     async def set_symbol_margin_type(self, symbol: str, isolated: bool, **kwargs: dict):
         kwargs = self._get_margin_query_params(symbol, **kwargs)
         kwargs.pop(self.connector.adapter.OKX_MARGIN_MODE)
-        await super().set_symbol_margin_type(symbol, isolated, **kwargs)
+        try:
+            await super().set_symbol_margin_type(symbol, isolated, **kwargs)
+        finally:
+            self._leverage_data_by_symbol.pop(symbol, None)
+
+    async def set_symbol_position_mode(self, symbol: str, one_way: bool):
+        try:
+            return await super().set_symbol_position_mode(symbol, one_way)
+        finally:
+            # position mode is account-wide on OKX: every symbol leverage data is outdated
+            self._leverage_data_by_symbol.clear()
 
     async def get_position(self, symbol: str, **kwargs: dict) -> dict:
         """
@@ -399,8 +436,20 @@ class Okx(exchanges.RestExchange):
             )
         return position
 
-    async def _update_position_with_leverage_data(self, symbol, position):
+    async def _get_cached_symbol_leverage(self, symbol):
+        # leverage data almost never change: don't fetch it on each position update
+        try:
+            fetch_time, leverage_data = self._leverage_data_by_symbol[symbol]
+            if time.time() - fetch_time < self.LEVERAGE_DATA_REFRESH_DELAY:
+                return leverage_data
+        except KeyError:
+            pass
         leverage_data = await self.get_symbol_leverage(symbol)
+        self._leverage_data_by_symbol[symbol] = (time.time(), leverage_data)
+        return leverage_data
+
+    async def _update_position_with_leverage_data(self, symbol, position):
+        leverage_data = await self._get_cached_symbol_leverage(symbol)
         raw_data = leverage_data[trading_enums.ExchangeConstantsLeveragePropertyColumns.RAW.value]
         adapter = self.connector.adapter
         position[trading_enums.ExchangeConstantsPositionColumns.POSITION_MODE.value] = \
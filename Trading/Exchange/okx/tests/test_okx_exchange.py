@@ -0,0 +1,130 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import time
+import mock
+import pytest
+import ccxt
+
+import octobot_trading.enums as trading_enums
+import octobot_trading.exchanges as exchanges
+from ...okx import okx_exchange
+from . import create_exchange
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+
+def _get_okx_exchange(is_future):
+    exchange = create_exchange(is_future=is_future)
+    exchange._get_used_order_types = mock.Mock(return_value=["conditional", "oco"])
+    return exchange
+
+
+def _order(order_id):
+    return {trading_enums.ExchangeConstantsOrderColumns.ID.value: order_id}
+
+
+async def test_get_all_typed_orders():
+    delay = 0.2
+    fetched_params = []
+
+    async def _delayed_fetch_orders(**kwargs):
+        fetched_params.append(kwargs)
+        await asyncio.sleep(delay)
+        return {
+            None: [_order("1"), _order("2")],
+            "conditional": [_order("3"), _order("2")],
+            "oco": [_order("4")],
+        }[kwargs.get(okx_exchange.OKXCCXTAdapter.OKX_ORDER_TYPE)]
+
+    # futures: every order type is fetched concurrently
+    exchange = _get_okx_exchange(True)
+    t0 = time.time()
+    assert await exchange._get_all_typed_orders(_delayed_fetch_orders, symbol="BTC/USDT:USDT") == [
+        _order("1"), _order("2"), _order("3"), _order("4")
+    ]
+    assert time.time() - t0 < 2 * delay
+    assert [params.get(okx_exchange.OKXCCXTAdapter.OKX_ORDER_TYPE) for params in fetched_params] == [None, "conditional", "oco"]
+    fetched_params.clear()
+
+    # stop orders only
+    assert await exchange._get_all_typed_orders(_delayed_fetch_orders, symbol="BTC/USDT:USDT", stop=True) == [
+        _order("3"), _order("2")
+    ]
+    assert len(fetched_params) == 1
+    fetched_params.clear()
+
+    # spot: no typed order
+    exchange = _get_okx_exchange(False)
+    assert await exchange._get_all_typed_orders(_delayed_fetch_orders, symbol="BTC/USDT") == [
+        _order("1"), _order("2")
+    ]
+    assert len(fetched_params) == 1
+
+
+async def test_update_position_with_leverage_data():
+    okx = create_exchange(is_future=True)
+    adapter = okx.connector.adapter
+    leverage_data = {
+        trading_enums.ExchangeConstantsLeveragePropertyColumns.RAW.value: {
+            adapter.OKX_POS_SIDE: "net", adapter.OKX_MARGIN_MODE: "isolated"
+        },
+        trading_enums.ExchangeConstantsLeveragePropertyColumns.LEVERAGE.value: 10,
+    }
+    with mock.patch.object(okx, "get_symbol_leverage", mock.AsyncMock(return_value=leverage_data)) \
+         as get_symbol_leverage_mock, \
+         mock.patch.object(okx, "_get_margin_query_params", mock.Mock(return_value={})), \
+         mock.patch.object(okx.connector, "set_symbol_leverage", mock.AsyncMock()):
+        for _ in range(3):
+            position = {}
+            await okx._update_position_with_leverage_data("BTC/USDT:USDT", position)
+            assert position == {
+                trading_enums.ExchangeConstantsPositionColumns.POSITION_MODE.value:
+                    trading_enums.PositionMode.ONE_WAY,
+                trading_enums.ExchangeConstantsPositionColumns.MARGIN_TYPE.value: trading_enums.MarginType.ISOLATED,
+                trading_enums.ExchangeConstantsPositionColumns.LEVERAGE.value: 10,
+            }
+        # fetched once per symbol
+        get_symbol_leverage_mock.assert_awaited_once_with("BTC/USDT:USDT")
+        await okx._update_position_with_leverage_data("ETH/USDT:USDT", {})
+        assert get_symbol_leverage_mock.await_count == 2
+
+        # refreshed after leverage update
+        await okx.set_symbol_leverage("BTC/USDT:USDT", 5)
+        await okx._update_position_with_leverage_data("BTC/USDT:USDT", {})
+        assert get_symbol_leverage_mock.await_count == 3
+        await okx._update_position_with_leverage_data("BTC/USDT:USDT", {})
+        assert get_symbol_leverage_mock.await_count == 3
+
+        # refreshed when outdated
+        with mock.patch.object(okx, "LEVERAGE_DATA_REFRESH_DELAY", 0):
+            await okx._update_position_with_leverage_data("BTC/USDT:USDT", {})
+        assert get_symbol_leverage_mock.await_count == 4
+
+        # position mode is account-wide: every symbol is refreshed, even when the update fails
+        await okx._update_position_with_leverage_data("ETH/USDT:USDT", {})
+        assert get_symbol_leverage_mock.await_count == 4
+        with mock.patch.object(
+            exchanges.RestExchange, "set_symbol_position_mode", mock.AsyncMock(side_effect=ccxt.NetworkError)
+        ) as set_symbol_position_mode_mock:
+            with pytest.raises(ccxt.NetworkError):
+                await okx.set_symbol_position_mode("BTC/USDT:USDT", True)
+            set_symbol_position_mode_mock.assert_awaited_once_with("BTC/USDT:USDT", True)
+        assert okx._leverage_data_by_symbol == {}
+        await okx._update_position_with_leverage_data("BTC/USDT:USDT", {})
+        await okx._update_position_with_leverage_data("ETH/USDT:USDT", {})
+        assert get_symbol_leverage_mock.await_count == 6
@@ -22,6 +22,8 @@ import octobot_trading.constants as trading_constants
 class ArbitrageContainer:
     # 0.3 %
     SIMILARITY_RATIO = decimal.Decimal(str(0.003))
+    LOWER_SIMILARITY_RATIO = trading_constants.ONE - SIMILARITY_RATIO
+    UPPER_SIMILARITY_RATIO = trading_constants.ONE + SIMILARITY_RATIO
 
     def __init__(self, own_exchange_price: decimal.Decimal, target_price: decimal.Decimal, state):
         self.own_exchange_price: decimal.Decimal = own_exchange_price
@@ -29,9 +31,53 @@ class ArbitrageContainer:
         self.state = state
         self.passed_initial_order = False
         self.initial_before_fee_filled_quantity: decimal.Decimal = None
-        self.initial_limit_order_id = None
-        self.secondary_limit_order_id = None
-        self.secondary_stop_order_id = None
+        # set when registered in an OpenArbitrages, kept up to date when order ids change
+        self.order_ids_index: dict = None
+        self._initial_limit_order_id = None
+        self._secondary_limit_order_id = None
+        self._secondary_stop_order_id = None
+
+    @property
+    def initial_limit_order_id(self):
+        return self._initial_limit_order_id
+
+    @initial_limit_order_id.setter
+    def initial_limit_order_id(self, order_id):
+        self._update_order_ids_index(self._initial_limit_order_id, order_id)
+        self._initial_limit_order_id = order_id
+
+    @property
+    def secondary_limit_order_id(self):
+        return self._secondary_limit_order_id
+
+    @secondary_limit_order_id.setter
+    def secondary_limit_order_id(self, order_id):
+        self._update_order_ids_index(self._secondary_limit_order_id, order_id)
+        self._secondary_limit_order_id = order_id
+
+    @property
+    def secondary_stop_order_id(self):
+        return self._secondary_stop_order_id
+
+    @secondary_stop_order_id.setter
+    def secondary_stop_order_id(self, order_id):
+        self._update_order_ids_index(self._secondary_stop_order_id, order_id)
+        self._secondary_stop_order_id = order_id
+
+    def get_order_ids(self):
+        return [
+            order_id
+            for order_id in (self._initial_limit_order_id, self._secondary_limit_order_id, self._secondary_stop_order_id)
+            if order_id is not None
+        ]
+
+    def _update_order_ids_index(self, previous_order_id, order_id):
+        if self.order_ids_index is None:
+            return
+        if previous_order_id is not None and self.order_ids_index.get(previous_order_id) is self:
+            self.order_ids_index.pop(previous_order_id)
+        if order_id is not None:
+            self.order_ids_index[order_id] = self
 
     def is_similar(self, own_exchange_price: decimal.Decimal, state):
         # if state and initial price is are the same or own_exchange_price is in current arbitrage window
@@ -41,17 +87,17 @@ class ArbitrageContainer:
                 (
                     state is trading_enums.EvaluatorStates.LONG and
                     (
-                            self.own_exchange_price * (trading_constants.ONE - ArbitrageContainer.SIMILARITY_RATIO)
+                            self.own_exchange_price * ArbitrageContainer.LOWER_SIMILARITY_RATIO
                             < own_exchange_price
-                            < self.target_price * (trading_constants.ONE + ArbitrageContainer.SIMILARITY_RATIO)
+                            < self.target_price * ArbitrageContainer.UPPER_SIMILARITY_RATIO
                     )
                 )
                 or (
                     state is trading_enums.EvaluatorStates.SHORT and
                     (
-                            self.target_price * (trading_constants.ONE - ArbitrageContainer.SIMILARITY_RATIO)
+                            self.target_price * ArbitrageContainer.LOWER_SIMILARITY_RATIO
                             < own_exchange_price
-                            < self.own_exchange_price * (trading_constants.ONE + ArbitrageContainer.SIMILARITY_RATIO)
+                            < self.own_exchange_price * ArbitrageContainer.UPPER_SIMILARITY_RATIO
                     )
                 )
             )
@@ -59,11 +105,9 @@ class ArbitrageContainer:
 
     def is_expired(self, other_exchanges_average_price):
         if self.state is trading_enums.EvaluatorStates.LONG:
-            return other_exchanges_average_price < self.target_price * \
-                   (trading_constants.ONE - ArbitrageContainer.SIMILARITY_RATIO)
+            return other_exchanges_average_price < self.target_price * ArbitrageContainer.LOWER_SIMILARITY_RATIO
         if self.state is trading_enums.EvaluatorStates.SHORT:
-            return other_exchanges_average_price > self.target_price * \
-                   (trading_constants.ONE + ArbitrageContainer.SIMILARITY_RATIO)
+            return other_exchanges_average_price > self.target_price * ArbitrageContainer.UPPER_SIMILARITY_RATIO
 
     def should_be_discarded_after_order_cancel(self, order_id):
         # should be discarded if initial order is cancelled
@@ -73,3 +117,60 @@ class ArbitrageContainer:
         return self.initial_limit_order_id == order_id \
            or self.secondary_limit_order_id == order_id \
            or self.secondary_stop_order_id == order_id
+
+
+class OpenArbitrages:
+    """
+    Open arbitrages indexed by watched order id and by state: order updates and price updates
+    only look at the related arbitrages instead of scanning every open arbitrage
+    """
+
+    def __init__(self, arbitrages=None):
+        # dict used as an insertion ordered set
+        self._arbitrages = {}
+        self._arbitrages_by_order_id = {}
+        self._arbitrages_by_state = {}
+        for arbitrage in arbitrages or []:
+            self.append(arbitrage)
+
+    def append(self, arbitrage: ArbitrageContainer):
+        self._arbitrages[arbitrage] = None
+        self._arbitrages_by_state.setdefault(arbitrage.state, {})[arbitrage] = None
+        arbitrage.order_ids_index = self._arbitrages_by_order_id
+        for order_id in arbitrage.get_order_ids():
+            self._arbitrages_by_order_id[order_id] = arbitrage
+
+    def remove(self, arbitrage: ArbitrageContainer):
+        try:
+            self._arbitrages.pop(arbitrage)
+        except KeyError as err:
+            raise ValueError(f"{arbitrage} is not an open arbitrage") from err
+        self._arbitrages_by_state[arbitrage.state].pop(arbitrage)
+        for order_id in arbitrage.get_order_ids():
+            if self._arbitrages_by_order_id.get(order_id) is arbitrage:
+                self._arbitrages_by_order_id.pop(order_id)
+        arbitrage.order_ids_index = None
+
+    def get_by_order_id(self, order_id):
+        return self._arbitrages_by_order_id.get(order_id)
+
+    def get_by_state(self, state) -> list:
+        return list(self._arbitrages_by_state.get(state, ()))
+
+    def __iter__(self):
+        # iterate over a copy to allow removals while iterating
+        return iter(list(self._arbitrages))
+
+    def __len__(self):
+        return len(self._arbitrages)
+
+    def __contains__(self, arbitrage):
+        return arbitrage in self._arbitrages
+
+    def __eq__(self, other):
+        if isinstance(other, OpenArbitrages):
+            return list(self._arbitrages) == list(other._arbitrages)
+        return list(self._arbitrages) == other
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self._arbitrages)})"
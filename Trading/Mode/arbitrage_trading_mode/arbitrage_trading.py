@@ -14,6 +14,7 @@
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
 import asyncio
+import collections
 import decimal
 
 import async_channel.constants as channel_constants
@@ -37,6 +38,7 @@ import tentacles.Trading.Mode.arbitrage_trading_mode.arbitrage_container as arbi
 
 
 class ArbitrageTradingMode(trading_modes.AbstractTradingMode):
+    BACKTESTING_PRICE_FEEDS_LATENCY = "backtesting_price_feeds_latency"
 
     def __init__(self, config, exchange_manager):
         super().__init__(config, exchange_manager)
@@ -79,6 +81,17 @@ class ArbitrageTradingMode(trading_modes.AbstractTradingMode):
             "enable_longs", commons_enums.UserInputTypes.BOOLEAN, True, inputs,
             title="Enable longs: enable arbitrage trades starting with a buy order and ending with a sell order.",
         )
+        self.UI.user_input(
+            self.BACKTESTING_PRICE_FEEDS_LATENCY, commons_enums.UserInputTypes.OBJECT, None, inputs,
+            title="Backtesting price feeds latency: simulated delay in seconds before each exchange price update "
+                  "is taken into account. Only used in backtesting.",
+        )
+        for exchange in exchanges:
+            self.UI.user_input(
+                exchange, commons_enums.UserInputTypes.FLOAT, 0, inputs,
+                min_val=0, parent_input_name=self.BACKTESTING_PRICE_FEEDS_LATENCY,
+                title=f"{exchange} price updates latency in seconds.",
+            )
 
     def get_current_state(self) -> (str, float):
         return super().get_current_state()[0] if self.producers[0].state is None else self.producers[0].state.name, \
@@ -131,7 +144,7 @@ class ArbitrageTradingMode(trading_modes.AbstractTradingMode):
 
     @staticmethod
     def is_backtestable():
-        return False
+        return True
 
 
 class ArbitrageModeConsumer(trading_modes.AbstractTradingModeConsumer):
@@ -143,7 +156,16 @@ class ArbitrageModeConsumer(trading_modes.AbstractTradingModeConsumer):
 
     def __init__(self, trading_mode):
         super().__init__(trading_mode)
-        self.open_arbitrages = []
+        self._open_arbitrages = arbitrage_container_import.OpenArbitrages()
+
+    @property
+    def open_arbitrages(self) -> arbitrage_container_import.OpenArbitrages:
+        return self._open_arbitrages
+
+    @open_arbitrages.setter
+    def open_arbitrages(self, arbitrages):
+        self._open_arbitrages = arbitrages if isinstance(arbitrages, arbitrage_container_import.OpenArbitrages) \
+            else arbitrage_container_import.OpenArbitrages(arbitrages)
 
     def on_reload_config(self):
         """
@@ -277,6 +299,18 @@ class ArbitrageModeProducer(trading_modes.AbstractTradingModeProducer):
         self.quote, self.base = symbol_util.parse_symbol(self.trading_mode.symbol).base_and_quote()
         self.lock = asyncio.Lock()
         self.enable_shorts = self.enable_longs = True
+        # price updates waiting for their simulated latency to elapse, by exchange
+        self.delayed_mark_prices = {}
+        # arbitrages statistics
+        self.triggered_arbitrages_count = 0
+        self.skipped_opportunities_count = 0
+        self.expired_arbitrages_count = 0
+        self.successful_arbitrages_count = 0
+        self.stopped_arbitrages_count = 0
+        # spreads statistics, in percent of the own exchange price
+        self.captured_spread_percent = trading_constants.ZERO  # successful arbitrages
+        self.missed_spread_percent = trading_constants.ZERO  # stopped and expired arbitrages
+        self.skipped_spread_percent = trading_constants.ZERO  # opportunities already covered by an open arbitrage
 
     def on_reload_config(self):
         """
@@ -289,6 +323,8 @@ class ArbitrageModeProducer(trading_modes.AbstractTradingModeProducer):
             1 - decimal.Decimal(str(self.trading_mode.trading_config["minimal_price_delta_percent"] / 100))
         self.enable_shorts = self.trading_mode.trading_config.get("enable_shorts", True)
         self.enable_longs = self.trading_mode.trading_config.get("enable_longs", True)
+        self.price_feeds_latency = \
+            self.trading_mode.trading_config.get(ArbitrageTradingMode.BACKTESTING_PRICE_FEEDS_LATENCY) or {}
 
     async def inner_start(self) -> None:
         """
@@ -335,6 +371,13 @@ class ArbitrageModeProducer(trading_modes.AbstractTradingModeProducer):
                     if arbitrage.state is trading_enums.EvaluatorStates.LONG:
                         filled_quantity = decimal.Decimal(str(filled_quantity * filled_order[
                             trading_enums.ExchangeConstantsOrderColumns.PRICE.value]))
+                    spread_percent = self._get_spread_percent(arbitrage.own_exchange_price, arbitrage.target_price)
+                    if arbitrage_success:
+                        self.successful_arbitrages_count += 1
+                        self.captured_spread_percent += spread_percent
+                    else:
+                        self.stopped_arbitrages_count += 1
+                        self.missed_spread_percent += spread_percent
                     self._log_results(arbitrage, arbitrage_success, filled_quantity)
                     self._close_arbitrage(arbitrage)
                 else:
@@ -348,10 +391,8 @@ class ArbitrageModeProducer(trading_modes.AbstractTradingModeProducer):
         """
         order_id = cancelled_order[trading_enums.ExchangeConstantsOrderColumns.ID.value]
         async with self.lock:
-            to_remove_orders = [arbitrage
-                                for arbitrage in self._get_open_arbitrages()
-                                if arbitrage.should_be_discarded_after_order_cancel(order_id)]
-            for arbitrage in to_remove_orders:
+            arbitrage = self._get_arbitrage(order_id)
+            if arbitrage is not None and arbitrage.should_be_discarded_after_order_cancel(order_id):
                 self._close_arbitrage(arbitrage)
 
     async def _own_exchange_mark_price_callback(
@@ -366,7 +407,8 @@ class ArbitrageModeProducer(trading_modes.AbstractTradingModeProducer):
         :param mark_price: updated mark price
         :return: None
         """
-        self.own_exchange_mark_price = decimal.Decimal(str(mark_price))
+        self.own_exchange_mark_price = self._to_decimal(mark_price)
+        self._release_delayed_mark_prices()
         try:
             if self.other_exchanges_mark_prices:
                 await self._analyse_arbitrage_opportunities()
@@ -385,17 +427,43 @@ class ArbitrageModeProducer(trading_modes.AbstractTradingModeProducer):
         :param mark_price: updated mark price
         :return: None
         """
-        self.other_exchanges_mark_prices[exchange] = decimal.Decimal(str(mark_price))
+        if latency := self._get_price_feed_latency(exchange):
+            # simulated latency: this price will only be known once latency is elapsed
+            self.delayed_mark_prices.setdefault(exchange, collections.deque()).append(
+                (self.exchange_manager.exchange.get_exchange_current_time() + latency, self._to_decimal(mark_price))
+            )
+        else:
+            self.other_exchanges_mark_prices[exchange] = self._to_decimal(mark_price)
+        self._release_delayed_mark_prices()
         try:
-            if self.own_exchange_mark_price is not None:
+            if self.own_exchange_mark_price is not None and self.other_exchanges_mark_prices:
                 await self._analyse_arbitrage_opportunities()
         except Exception as e:
             self.logger.exception(e, True, f"Error when handling mark_price_callback for {self.exchange_name}: {e}")
 
+    def _get_price_feed_latency(self, exchange) -> float:
+        if not self.price_feeds_latency or not trading_api.get_is_backtesting(self.exchange_manager):
+            return 0
+        return self.price_feeds_latency.get(exchange, 0)
+
+    def _release_delayed_mark_prices(self):
+        if not self.delayed_mark_prices:
+            return
+        current_time = self.exchange_manager.exchange.get_exchange_current_time()
+        for exchange, delayed_prices in self.delayed_mark_prices.items():
+            # delayed prices are sorted by release time
+            while delayed_prices and delayed_prices[0][0] <= current_time:
+                self.other_exchanges_mark_prices[exchange] = delayed_prices.popleft()[1]
+
+    @staticmethod
+    def _to_decimal(value) -> decimal.Decimal:
+        # only convert values that are not already decimals
+        return value if isinstance(value, decimal.Decimal) else decimal.Decimal(str(value))
+
     async def _analyse_arbitrage_opportunities(self):
         async with self.trading_mode_trigger():
-            other_exchanges_average_price = \
-                decimal.Decimal(str(data_util.mean(self.other_exchanges_mark_prices.values())))
+            # mark prices are decimals: no need to convert their average
+            other_exchanges_average_price = data_util.mean(self.other_exchanges_mark_prices.values())
             state = None
             if other_exchanges_average_price > self.own_exchange_mark_price * self.sup_triggering_price_delta_ratio:
                 # min long = high price > own_price / (1 - 2fees)
@@ -422,11 +490,17 @@ class ArbitrageModeProducer(trading_modes.AbstractTradingModeProducer):
     async def _trigger_arbitrage_opportunity(self, other_exchanges_average_price, state):
         # ensure no similar arbitrage is already in place
         if self._ensure_no_existing_arbitrage_on_this_price(state):
+            self.triggered_arbitrages_count += 1
             self._log_arbitrage_opportunity_details(other_exchanges_average_price, state)
             arbitrage_container = arbitrage_container_import.ArbitrageContainer(self.own_exchange_mark_price,
                                                                                 other_exchanges_average_price, state)
             await self._create_arbitrage_initial_order(arbitrage_container)
             self._register_state(state, other_exchanges_average_price - self.own_exchange_mark_price)
+        else:
+            self.skipped_opportunities_count += 1
+            self.skipped_spread_percent += self._get_spread_percent(
+                self.own_exchange_mark_price, other_exchanges_average_price
+            )
 
     async def _create_arbitrage_initial_order(self, arbitrage_container):
         if self.exchange_manager.trader.is_enabled:
@@ -477,28 +551,29 @@ class ArbitrageModeProducer(trading_modes.AbstractTradingModeProducer):
                                                  data=data)
 
     def _ensure_no_existing_arbitrage_on_this_price(self, state):
-        for arbitrage_container in self._get_open_arbitrages():
+        # only arbitrages of the same state can be similar
+        for arbitrage_container in self._get_open_arbitrages().get_by_state(state):
             if arbitrage_container.is_similar(self.own_exchange_mark_price, state):
                 return False
         return True
 
     def _get_arbitrage(self, order_id):
-        for arbitrage_container in self._get_open_arbitrages():
-            if arbitrage_container.is_watching_this_order(order_id):
-                return arbitrage_container
-        return None
+        return self._get_open_arbitrages().get_by_order_id(order_id)
 
     async def _ensure_no_expired_opportunities(self, other_exchanges_average_price, state):
         to_remove_arbitrages = []
-        for arbitrage_container in self._get_open_arbitrages():
+        opposite_state = trading_enums.EvaluatorStates.SHORT if state is trading_enums.EvaluatorStates.LONG \
+            else trading_enums.EvaluatorStates.LONG
+        for arbitrage_container in self._get_open_arbitrages().get_by_state(opposite_state):
             # look for expired opposite side arbitrages and cancel them if still possible
-            if arbitrage_container.state is not state and \
-                    arbitrage_container.is_expired(other_exchanges_average_price):
+            if arbitrage_container.is_expired(other_exchanges_average_price):
                 if self.exchange_manager.trader.is_enabled:
                     if await self._cancel_order(arbitrage_container):
                         to_remove_arbitrages.append(arbitrage_container)
 
         for arbitrage in to_remove_arbitrages:
+            self.expired_arbitrages_count += 1
+            self.missed_spread_percent += self._get_spread_percent(arbitrage.own_exchange_price, arbitrage.target_price)
             self._get_open_arbitrages().remove(arbitrage)
 
     async def _cancel_order(self, arbitrage_container) -> bool:
@@ -578,7 +653,24 @@ class ArbitrageModeProducer(trading_modes.AbstractTradingModeProducer):
     def get_should_cancel_loaded_orders(cls) -> bool:
         return False
 
+    @staticmethod
+    def _get_spread_percent(own_exchange_price, other_exchanges_price) -> decimal.Decimal:
+        return abs(other_exchanges_price - own_exchange_price) * trading_constants.ONE_HUNDRED / own_exchange_price
+
+    def _log_statistics(self):
+        self.logger.info(
+            f"Arbitrage statistics on {self.exchange_name} for {self.trading_mode.symbol}: "
+            f"{self.triggered_arbitrages_count} triggered arbitrages ({self.successful_arbitrages_count} successful, "
+            f"{self.stopped_arbitrages_count} stopped, {self.expired_arbitrages_count} expired), "
+            f"{self.skipped_opportunities_count} skipped opportunities already covered by an open arbitrage. "
+            f"Captured spread: {float(self.captured_spread_percent):.4f}%, missed spread (stopped and expired "
+            f"arbitrages): {float(self.missed_spread_percent):.4f}%, skipped opportunities spread: "
+            f"{float(self.skipped_spread_percent):.4f}%."
+        )
+
     async def stop(self):
         if self.trading_mode is not None:
+            if trading_api.get_is_backtesting(self.exchange_manager):
+                self._log_statistics()
             self.trading_mode.flush_trading_mode_consumers()
         await super().stop()
@@ -157,3 +157,43 @@ def test_is_watching_this_order():
     assert not container.is_watching_this_order("init")
     assert not container.is_watching_this_order("sec")
     assert not container.is_watching_this_order("stop")
+
+
+def test_open_arbitrages_indexes():
+    long_arbitrage = arbitrage_container_import.ArbitrageContainer(decimal.Decimal(90), decimal.Decimal(100),
+                                                                   trading_enums.EvaluatorStates.LONG)
+    long_arbitrage.initial_limit_order_id = "1"
+    short_arbitrage = arbitrage_container_import.ArbitrageContainer(decimal.Decimal(110), decimal.Decimal(100),
+                                                                    trading_enums.EvaluatorStates.SHORT)
+    open_arbitrages = arbitrage_container_import.OpenArbitrages([long_arbitrage])
+    open_arbitrages.append(short_arbitrage)
+    assert open_arbitrages == [long_arbitrage, short_arbitrage]
+    assert len(open_arbitrages) == 2
+    assert open_arbitrages.get_by_state(trading_enums.EvaluatorStates.LONG) == [long_arbitrage]
+    assert open_arbitrages.get_by_state(trading_enums.EvaluatorStates.SHORT) == [short_arbitrage]
+    assert open_arbitrages.get_by_state(trading_enums.EvaluatorStates.NEUTRAL) == []
+
+    # order ids set before and after registration are indexed
+    assert open_arbitrages.get_by_order_id("1") is long_arbitrage
+    assert open_arbitrages.get_by_order_id("2") is None
+    short_arbitrage.initial_limit_order_id = "2"
+    long_arbitrage.secondary_limit_order_id = "3"
+    long_arbitrage.secondary_stop_order_id = "4"
+    assert open_arbitrages.get_by_order_id("2") is short_arbitrage
+    assert open_arbitrages.get_by_order_id("3") is long_arbitrage
+    assert open_arbitrages.get_by_order_id("4") is long_arbitrage
+
+    # replaced order ids are not indexed anymore
+    short_arbitrage.initial_limit_order_id = "5"
+    assert open_arbitrages.get_by_order_id("2") is None
+    assert open_arbitrages.get_by_order_id("5") is short_arbitrage
+
+    # removed arbitrages are not indexed anymore
+    open_arbitrages.remove(long_arbitrage)
+    assert long_arbitrage not in open_arbitrages
+    assert open_arbitrages == [short_arbitrage]
+    assert open_arbitrages.get_by_state(trading_enums.EvaluatorStates.LONG) == []
+    for order_id in ("1", "3", "4"):
+        assert open_arbitrages.get_by_order_id(order_id) is None
+    long_arbitrage.initial_limit_order_id = "6"
+    assert open_arbitrages.get_by_order_id("6") is None
@@ -17,7 +17,10 @@ import pytest
 import mock
 import decimal
 
+import octobot_commons.asyncio_tools as asyncio_tools
 import octobot_commons.pretty_printer as pretty_printer
+import octobot_trading.api as trading_api
+import octobot_trading.constants as trading_constants
 import octobot_trading.enums as trading_enums
 import tentacles.Trading.Mode.arbitrage_trading_mode.arbitrage_container as arbitrage_container_import
 import tentacles.Trading.Mode.arbitrage_trading_mode.tests as arbitrage_trading_mode_tests
@@ -58,6 +61,11 @@ async def test_own_exchange_mark_price_callback():
             await binance_producer._own_exchange_mark_price_callback("", "", "", "", 11)
             order_mock.assert_called_once()
 
+            # decimal mark prices are used as is
+            mark_price = decimal.Decimal("11.1")
+            await binance_producer._own_exchange_mark_price_callback("", "", "", "", mark_price)
+            assert binance_producer.own_exchange_mark_price is mark_price
+
 
 async def test_mark_price_callback():
     binance = "binance"
@@ -87,6 +95,114 @@ async def test_mark_price_callback():
             kraken_order_mock.assert_called_once()
 
 
+async def test_mark_price_callback_with_price_feed_latency():
+    async with arbitrage_trading_mode_tests.exchange("binance") as exchange_tuple:
+        binance_producer, _, exchange_manager = exchange_tuple
+        binance_producer.price_feeds_latency = {"kraken": 10}
+        binance_producer.own_exchange_mark_price = decimal.Decimal(1000)
+        current_time = exchange_manager.exchange.get_exchange_current_time()
+
+        with mock.patch.object(binance_producer, "_analyse_arbitrage_opportunities",
+                               new=mock.AsyncMock()) as analyse_mock:
+            # kraken price is delayed
+            await binance_producer._mark_price_callback("kraken", "", "", "", 1100)
+            assert binance_producer.other_exchanges_mark_prices == {}
+            analyse_mock.assert_not_called()
+            # bitfinex price is not delayed
+            await binance_producer._mark_price_callback("bitfinex", "", "", "", 1050)
+            assert binance_producer.other_exchanges_mark_prices == {"bitfinex": decimal.Decimal(1050)}
+            analyse_mock.assert_called_once()
+            analyse_mock.reset_mock()
+
+            with mock.patch.object(exchange_manager.exchange, "get_exchange_current_time",
+                                   mock.Mock(return_value=current_time + 9)):
+                await binance_producer._own_exchange_mark_price_callback("", "", "", "", 1000)
+                assert "kraken" not in binance_producer.other_exchanges_mark_prices
+            with mock.patch.object(exchange_manager.exchange, "get_exchange_current_time",
+                                   mock.Mock(return_value=current_time + 10)):
+                # latency elapsed: kraken price is now known
+                await binance_producer._own_exchange_mark_price_callback("", "", "", "", 1000)
+                assert binance_producer.other_exchanges_mark_prices == {
+                    "bitfinex": decimal.Decimal(1050),
+                    "kraken": decimal.Decimal(1100),
+                }
+            assert analyse_mock.call_count == 2
+            assert not binance_producer.delayed_mark_prices["kraken"]
+
+        # latency is only simulated in backtesting
+        with mock.patch.object(trading_api, "get_is_backtesting", mock.Mock(return_value=False)):
+            assert binance_producer._get_price_feed_latency("kraken") == 0
+        assert binance_producer._get_price_feed_latency("kraken") == 10
+        assert binance_producer._get_price_feed_latency("bitfinex") == 0
+
+
+async def test_multi_exchange_backtesting():
+    binance = "binance"
+    kraken = "kraken"
+    async with arbitrage_trading_mode_tests.exchange(binance) as binance_tuple:
+        backtesting = binance_tuple[2].exchange.backtesting
+        async with arbitrage_trading_mode_tests.exchange(kraken, backtesting=backtesting) as kraken_tuple:
+            binance_producer, _, binance_exchange_manager = binance_tuple
+            kraken_producer, _, kraken_exchange_manager = kraken_tuple
+            # exchanges share the backtesting clock
+            start_time = binance_exchange_manager.exchange.get_exchange_current_time()
+            assert kraken_exchange_manager.exchange.get_exchange_current_time() == start_time
+            # kraken prices are received on binance 10 seconds after being emitted
+            binance_producer.price_feeds_latency = {kraken: 10}
+
+            await binance_producer._own_exchange_mark_price_callback(binance, "", "", "", 1000)
+            await kraken_producer._own_exchange_mark_price_callback(kraken, "", "", "", 1000)
+            await kraken_producer._mark_price_callback(binance, "", "", "", 1000)
+            # kraken price increases
+            await binance_producer._mark_price_callback(kraken, "", "", "", 1100)
+            await kraken_producer._own_exchange_mark_price_callback(kraken, "", "", "", 1100)
+            await asyncio_tools.wait_asyncio_next_cycle()
+            # kraken: binance price is lower, sell first
+            kraken_orders = trading_api.get_open_orders(kraken_exchange_manager)
+            assert len(kraken_orders) == 1
+            assert kraken_orders[0].side is trading_enums.TradeOrderSide.SELL
+            # binance: kraken price update is not received yet
+            assert trading_api.get_open_orders(binance_exchange_manager) == []
+            assert binance_producer.triggered_arbitrages_count == 0
+
+            backtesting.time_manager.set_current_timestamp(start_time + 10)
+            await binance_producer._own_exchange_mark_price_callback(binance, "", "", "", 1000)
+            await asyncio_tools.wait_asyncio_next_cycle()
+            # binance: kraken price is higher, buy first
+            binance_orders = trading_api.get_open_orders(binance_exchange_manager)
+            assert len(binance_orders) == 1
+            assert binance_orders[0].side is trading_enums.TradeOrderSide.BUY
+            assert binance_producer.triggered_arbitrages_count == 1
+
+            # opportunity is already covered by the open arbitrage
+            await binance_producer._own_exchange_mark_price_callback(binance, "", "", "", 1000)
+            assert binance_producer.triggered_arbitrages_count == 1
+            assert binance_producer.skipped_opportunities_count == 1
+            assert binance_producer.skipped_spread_percent == decimal.Decimal(10)
+
+            # initial order is filled: secondary orders are created
+            await binance_orders[0].on_fill(force_fill=True)
+            await asyncio_tools.wait_asyncio_next_cycle()
+            secondary_orders = trading_api.get_open_orders(binance_exchange_manager)
+            assert len(secondary_orders) == 2
+            assert all(order.side is trading_enums.TradeOrderSide.SELL for order in secondary_orders)
+            secondary_limit_order = next(
+                order for order in secondary_orders if order.order_type is trading_enums.TraderOrderType.SELL_LIMIT
+            )
+            assert secondary_limit_order.origin_price == decimal.Decimal(1100)
+
+            # secondary limit order is filled: the 10% spread is captured
+            await secondary_limit_order.on_fill(force_fill=True)
+            await asyncio_tools.wait_asyncio_next_cycle()
+            assert trading_api.get_open_orders(binance_exchange_manager) == []
+            assert binance_producer.successful_arbitrages_count == 1
+            assert binance_producer.captured_spread_percent == decimal.Decimal(10)
+            assert binance_producer.missed_spread_percent == trading_constants.ZERO
+            with mock.patch.object(binance_producer.logger, "info", mock.Mock()) as info_mock:
+                binance_producer._log_statistics()
+                assert "Captured spread: 10.0000%" in info_mock.mock_calls[0].args[0]
+
+
 async def test_order_filled_callback():
     async with arbitrage_trading_mode_tests.exchange("binance") as exchange_tuple:
         binance_producer, binance_consumer, _ = exchange_tuple
@@ -446,6 +562,9 @@ async def test_ensure_no_expired_opportunities():
             assert arbitrage_2 not in binance_consumer.open_arbitrages
             cancel_order_mock.assert_called_once()
             cancel_order_mock.reset_mock()
+            assert binance_producer.expired_arbitrages_count == 1
+            # 20 to 17 spread is missed
+            assert binance_producer.missed_spread_percent == decimal.Decimal(15)
 
             await binance_producer._ensure_no_expired_opportunities(decimal.Decimal(str(18)), trading_enums.EvaluatorStates.SHORT)
             assert binance_consumer.open_arbitrages == [arbitrage_1]
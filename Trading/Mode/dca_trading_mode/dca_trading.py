@@ -30,7 +30,6 @@ import octobot_evaluators.matrix as matrix
 import octobot_trading.modes as trading_modes
 import octobot_trading.enums as trading_enums
 import octobot_trading.constants as trading_constants
-import octobot_trading.util as trading_util
 import octobot_trading.errors as trading_errors
 import octobot_trading.personal_data as trading_personal_data
 import octobot_trading.exchanges as trading_exchanges
@@ -460,27 +459,45 @@ class DCATradingModeProducer(trading_modes.AbstractTradingModeProducer):
 
     def __init__(self, channel, config, trading_mode, exchange_manager):
         super().__init__(channel, config, trading_mode, exchange_manager)
-        self.task = None
+        self._last_trigger_time = 0
+        # strategy value nodes by (matrix_id, cryptocurrency, symbol), cached once every strategy node is available
+        self._strategy_value_nodes_by_path = {}
         self.state = trading_enums.EvaluatorStates.NEUTRAL
 
     async def stop(self):
         if self.trading_mode is not None:
             self.trading_mode.flush_trading_mode_consumers()
-        if self.task is not None:
-            self.task.cancel()
         await super().stop()
 
+    async def ohlcv_callback(self, exchange: str, exchange_id: str, cryptocurrency: str, symbol: str,
+                             time_frame: str, candle: dict, init_call: bool = False):
+        # time based trigger: rely on exchange time to trigger at the same moments in live trading and backtesting
+        current_time = self.exchange_manager.exchange.get_exchange_current_time()
+        if (
+            current_time - self._last_trigger_time
+        ) >= self.trading_mode.minutes_before_next_buy * commons_constants.MINUTE_TO_SECONDS:
+            # callbacks happen after candles close: registering the callback time would delay the next trigger
+            # to the following candle, register the candle close time instead
+            self._last_trigger_time = min(current_time, self._get_candle_close_time(candle, time_frame))
+            try:
+                await self.trigger_dca(
+                    cryptocurrency=cryptocurrency,
+                    symbol=symbol,
+                    state=trading_enums.EvaluatorStates.VERY_LONG
+                )
+            except Exception as e:
+                self.logger.exception(e, True, f"An error happened during DCA trigger: {e}")
+            self.logger.debug(f"Next {symbol} DCA trigger in {self.trading_mode.minutes_before_next_buy} minutes")
+
+    @staticmethod
+    def _get_candle_close_time(candle, time_frame):
+        return candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value] + \
+            commons_enums.TimeFramesMinutes[commons_enums.TimeFrames(time_frame)] * commons_constants.MINUTE_TO_SECONDS
+
     async def set_final_eval(self, matrix_id: str, cryptocurrency: str, symbol: str, time_frame, trigger_source: str):
         evaluations = []
         # Strategies analysis
-        for evaluated_strategy_node in matrix.get_tentacles_value_nodes(
-                matrix_id,
-                matrix.get_tentacle_nodes(matrix_id,
-                                          exchange_name=self.exchange_name,
-                                          tentacle_type=evaluators_enums.EvaluatorMatrixTypes.STRATEGIES.value),
-                cryptocurrency=cryptocurrency,
-                symbol=symbol):
-
+        for evaluated_strategy_node in self._get_strategy_value_nodes(matrix_id, cryptocurrency, symbol):
             if evaluators_util.check_valid_eval_note(evaluators_api.get_value(evaluated_strategy_node),
                                                      evaluators_api.get_type(evaluated_strategy_node),
                                                      evaluators_constants.EVALUATOR_EVAL_DEFAULT_TYPE):
@@ -510,6 +527,24 @@ class DCATradingModeProducer(trading_modes.AbstractTradingModeProducer):
             finally:
                 self.trading_mode.are_initialization_orders_pending = False
 
+    def _get_strategy_value_nodes(self, matrix_id: str, cryptocurrency: str, symbol: str) -> list:
+        strategy_nodes = matrix.get_tentacle_nodes(
+            matrix_id,
+            exchange_name=self.exchange_name,
+            tentacle_type=evaluators_enums.EvaluatorMatrixTypes.STRATEGIES.value
+        )
+        path = (matrix_id, cryptocurrency, symbol)
+        value_nodes = self._strategy_value_nodes_by_path.get(path)
+        # matrix nodes values are updated in place: only look nodes up again when a strategy node is added
+        if value_nodes is None or len(value_nodes) != len(strategy_nodes):
+            value_nodes = matrix.get_tentacles_value_nodes(
+                matrix_id, strategy_nodes, cryptocurrency=cryptocurrency, symbol=symbol
+            )
+            if len(value_nodes) == len(strategy_nodes):
+                # only cache complete lookups: some strategies might not have evaluated this symbol yet
+                self._strategy_value_nodes_by_path[path] = value_nodes
+        return value_nodes
+
     def _should_trigger_init_entry(self):
         if self.trading_mode.enable_initialization_entry:
             return self.trading_mode.are_initialization_orders_pending
@@ -552,36 +587,11 @@ class DCATradingModeProducer(trading_modes.AbstractTradingModeProducer):
         # todo implement signal based exits
         pass
 
-    async def dca_task(self):
-        while not self.should_stop:
-            try:
-                for cryptocurrency, pairs in trading_util.get_traded_pairs_by_currency(
-                        self.exchange_manager.config
-                ).items():
-                    if self.trading_mode.symbol in pairs:
-                        await self.trigger_dca(
-                            cryptocurrency=cryptocurrency,
-                            symbol=self.trading_mode.symbol,
-                            state=trading_enums.EvaluatorStates.VERY_LONG
-                        )
-                if self.exchange_manager.is_backtesting:
-                    self.logger.error(
-                        f"{self.trading_mode.trigger_mode.value} trigger is not supporting backtesting for now. Please "
-                        f"configure another trigger mode to use {self.trading_mode.get_name()} in backtesting."
-                    )
-                    return
-                await asyncio.sleep(self.trading_mode.minutes_before_next_buy * commons_constants.MINUTE_TO_SECONDS)
-            except Exception as e:
-                self.logger.error(f"An error happened during DCA task : {e}")
-
-    async def inner_start(self) -> None:
-        await super().inner_start()
-        if self.trading_mode.trigger_mode is TriggerMode.TIME_BASED:
-            self.task = asyncio.create_task(self.delayed_start())
-
     def get_channels_registration(self):
         registration_channels = []
-        if self.trading_mode.trigger_mode is TriggerMode.MAXIMUM_EVALUATORS_SIGNALS_BASED:
+        if self.trading_mode.trigger_mode is TriggerMode.TIME_BASED:
+            registration_channels.append(self.TOPIC_TO_CHANNEL_NAME[commons_enums.ActivationTopics.FULL_CANDLES.value])
+        elif self.trading_mode.trigger_mode is TriggerMode.MAXIMUM_EVALUATORS_SIGNALS_BASED:
             topic = self.trading_mode.trading_config.get(commons_constants.CONFIG_ACTIVATION_TOPICS.replace(" ", "_"),
                                                          commons_enums.ActivationTopics.EVALUATION_CYCLE.value)
             try:
@@ -590,12 +600,6 @@ class DCATradingModeProducer(trading_modes.AbstractTradingModeProducer):
                 self.logger.error(f"Unknown registration topic: {topic}")
         return registration_channels
 
-    async def delayed_start(self):
-        await self._wait_for_bot_init(
-            self.CONFIG_INIT_TIMEOUT, extra_topics=[commons_enums.InitializationEventExchangeTopics.PRICE.value]
-        )
-        await self.dca_task()
-
     async def _send_alert_notification(self, symbol, state, step):
         if self.exchange_manager.is_backtesting:
             return
@@ -213,66 +213,103 @@ async def test_init_config_values(tools):
     assert mode.stop_loss_price_multiplier == decimal.Decimal("0.1")
 
 
-async def test_inner_start(tools):
+async def test_ohlcv_callback(tools):
     mode, producer, consumer, trader = await _init_mode(tools, _get_config(tools, {}))
-    with mock.patch.object(producer, "dca_task", mock.AsyncMock()) as dca_task_mock, \
-            mock.patch.object(producer, "get_channels_registration", mock.Mock(return_value=[])):
-        # evaluator based
-        mode.trigger_mode = dca_trading.TriggerMode.MAXIMUM_EVALUATORS_SIGNALS_BASED
-        await producer.inner_start()
-        for _ in range(10):
-            await asyncio_tools.wait_asyncio_next_cycle()
-        dca_task_mock.assert_not_called()
+    next_buy_delay = 10080 * commons_constants.MINUTE_TO_SECONDS
+    hour = commons_constants.HOURS_TO_SECONDS
+    current_time = 1700000000 + 5
 
-        # time based
-        mode.trigger_mode = dca_trading.TriggerMode.TIME_BASED
-        await producer.inner_start()
-        for _ in range(10):
-            await asyncio_tools.wait_asyncio_next_cycle()
-        dca_task_mock.assert_called_once()
+    def _candle(close_time, time_frame_seconds=hour):
+        candle = [0] * 6
+        candle[commons_enum.PriceIndexes.IND_PRICE_TIME.value] = close_time - time_frame_seconds
+        return candle
+
+    with mock.patch.object(
+        trader.exchange_manager.exchange, "get_exchange_current_time", mock.Mock(side_effect=lambda: current_time)
+    ), mock.patch.object(producer, "trigger_dca", mock.AsyncMock()) as trigger_dca_mock:
+        producer._last_trigger_time = 0
+        # first candle: trigger
+        await producer.ohlcv_callback("binance", "123", "Bitcoin", "BTC/USDT", "1h", _candle(1700000000))
+        trigger_dca_mock.assert_called_once_with(
+            cryptocurrency="Bitcoin",
+            symbol="BTC/USDT",
+            state=trading_enums.EvaluatorStates.VERY_LONG
+        )
+        trigger_dca_mock.reset_mock()
+        # candle close time is registered, not the callback time
+        assert producer._last_trigger_time == 1700000000
+
+        # other time frame, same time: no trigger
+        await producer.ohlcv_callback("binance", "123", "Bitcoin", "BTC/USDT", "4h", _candle(1700000000, 4 * hour))
+        trigger_dca_mock.assert_not_called()
+
+        # before next buy time: no trigger
+        current_time = 1700000000 + next_buy_delay - hour + 5
+        await producer.ohlcv_callback(
+            "binance", "123", "Bitcoin", "BTC/USDT", "1h", _candle(1700000000 + next_buy_delay - hour)
+        )
+        trigger_dca_mock.assert_not_called()
+        assert producer._last_trigger_time == 1700000000
+
+        # next buy time: trigger even when this candle callback happens sooner after the candle close
+        current_time = 1700000000 + next_buy_delay + 2
+        await producer.ohlcv_callback("binance", "123", "Bitcoin", "BTC/USDT", "1h", _candle(1700000000 + next_buy_delay))
+        trigger_dca_mock.assert_called_once()
+        trigger_dca_mock.reset_mock()
+        assert producer._last_trigger_time == 1700000000 + next_buy_delay
+
+        # errors are logged and next trigger is scheduled
+        # candle pushed before its close: current time is registered
+        trigger_dca_mock.side_effect = RuntimeError
+        current_time = 1700000000 + 2 * next_buy_delay
+        await producer.ohlcv_callback(
+            "binance", "123", "Bitcoin", "BTC/USDT", "4h", _candle(current_time + 4 * hour, 4 * hour)
+        )
+        trigger_dca_mock.assert_called_once()
+        assert producer._last_trigger_time == current_time
 
 
-async def test_dca_task(tools):
+async def test_get_strategy_value_nodes(tools):
     mode, producer, consumer, trader = await _init_mode(tools, _get_config(tools, {}))
-    calls = []
-    try:
-        def _on_trigger(**kwargs):
-            if len(calls):
-                # now stop
-                producer.should_stop = True
-            calls.append(kwargs)
-
-        producer.exchange_manager.is_backtesting = True
-        with mock.patch.object(asyncio, "sleep", mock.AsyncMock()) as sleep_mock:
-            # backtesting: trigger only once
-            with mock.patch.object(producer, "trigger_dca",
-                                   mock.AsyncMock(side_effect=_on_trigger)) as trigger_dca_mock:
-                await producer.dca_task()
-                assert trigger_dca_mock.call_count == 1
-                assert trigger_dca_mock.mock_calls[0].kwargs == {
-                    "cryptocurrency": "Bitcoin",
-                    "symbol": "BTC/USDT",
-                    "state": trading_enums.EvaluatorStates.VERY_LONG
-                }
-                sleep_mock.assert_not_called()
-
-            calls.clear()
-            # live: loop trigger
-            producer.exchange_manager.is_backtesting = False
-            with mock.patch.object(producer, "trigger_dca",
-                                   mock.AsyncMock(side_effect=_on_trigger)) as trigger_dca_mock:
-                await producer.dca_task()
-                assert trigger_dca_mock.call_count == 2
-                assert trigger_dca_mock.mock_calls[0].kwargs == {
-                    "cryptocurrency": "Bitcoin",
-                    "symbol": "BTC/USDT",
-                    "state": trading_enums.EvaluatorStates.VERY_LONG
-                }
-                assert sleep_mock.call_count == 2
-                assert sleep_mock.mock_calls[0].args == (10080 * commons_constants.MINUTE_TO_SECONDS,)
-                assert sleep_mock.mock_calls[1].args == (10080 * commons_constants.MINUTE_TO_SECONDS,)
-    finally:
-        producer.exchange_manager.is_backtesting = True
+    strategy_nodes = ["strategy_1", "strategy_2"]
+    value_nodes = ["value_1"]
+    with mock.patch.object(
+        dca_trading.matrix, "get_tentacle_nodes", mock.Mock(side_effect=lambda *_, **__: strategy_nodes)
+    ) as get_tentacle_nodes_mock, mock.patch.object(
+        dca_trading.matrix, "get_tentacles_value_nodes", mock.Mock(side_effect=lambda *_, **__: list(value_nodes))
+    ) as get_tentacles_value_nodes_mock:
+        # a strategy did not evaluate this symbol yet: not cached
+        assert producer._get_strategy_value_nodes("matrix_id", "Bitcoin", "BTC/USDT") == ["value_1"]
+        assert producer._get_strategy_value_nodes("matrix_id", "Bitcoin", "BTC/USDT") == ["value_1"]
+        assert get_tentacle_nodes_mock.call_count == 2
+        assert get_tentacles_value_nodes_mock.call_count == 2
+        get_tentacles_value_nodes_mock.assert_called_with(
+            "matrix_id", strategy_nodes, cryptocurrency="Bitcoin", symbol="BTC/USDT"
+        )
+        get_tentacles_value_nodes_mock.reset_mock()
+
+        # every strategy evaluated this symbol: cached
+        value_nodes.append("value_2")
+        for _ in range(3):
+            assert producer._get_strategy_value_nodes("matrix_id", "Bitcoin", "BTC/USDT") == ["value_1", "value_2"]
+        get_tentacles_value_nodes_mock.assert_called_once()
+        get_tentacles_value_nodes_mock.reset_mock()
+
+        # other path: not cached
+        assert producer._get_strategy_value_nodes("matrix_id", "Ethereum", "ETH/USDT") == ["value_1", "value_2"]
+        get_tentacles_value_nodes_mock.assert_called_once_with(
+            "matrix_id", strategy_nodes, cryptocurrency="Ethereum", symbol="ETH/USDT"
+        )
+        get_tentacles_value_nodes_mock.reset_mock()
+
+        # new strategy node: refresh cache
+        strategy_nodes = ["strategy_1", "strategy_2", "strategy_3"]
+        value_nodes.append("value_3")
+        assert producer._get_strategy_value_nodes("matrix_id", "Bitcoin", "BTC/USDT") == \
+            ["value_1", "value_2", "value_3"]
+        assert producer._get_strategy_value_nodes("matrix_id", "Bitcoin", "BTC/USDT") == \
+            ["value_1", "value_2", "value_3"]
+        get_tentacles_value_nodes_mock.assert_called_once()
 
 
 async def test_trigger_dca(tools):
@@ -349,7 +386,9 @@ async def test_get_channels_registration(tools):
     update = {}
     mode, producer, consumer, trader = await _init_mode(tools, _get_config(tools, update))
     mode.trigger_mode = dca_trading.TriggerMode.TIME_BASED
-    assert producer.get_channels_registration() == []
+    assert producer.get_channels_registration() == [
+        producer.TOPIC_TO_CHANNEL_NAME[commons_enum.ActivationTopics.FULL_CANDLES.value]
+    ]
     mode.trigger_mode = dca_trading.TriggerMode.MAXIMUM_EVALUATORS_SIGNALS_BASED
     assert producer.get_channels_registration() == [
         producer.TOPIC_TO_CHANNEL_NAME[commons_enum.ActivationTopics.EVALUATION_CYCLE.value]
@@ -1005,7 +1044,7 @@ async def test_single_exchange_process_optimize_initial_portfolio(tools):
 async def test_single_exchange_process_health_check(tools):
     mode, producer, consumer, trader = await _init_mode(tools, _get_config(tools, {}))
     exchange_manager = trader.exchange_manager
-    with mock.patch.object(producer, "dca_task", mock.AsyncMock()):  # prevent auto dca task
+    with mock.patch.object(producer, "trigger_dca", mock.AsyncMock()):  # prevent auto dca trigger
 
         portfolio = trader.exchange_manager.exchange_personal_data.portfolio_manager.portfolio.portfolio
         converter = trader.exchange_manager.exchange_personal_data.portfolio_manager.\
@@ -25,6 +25,9 @@ import octobot_trading.errors as trading_errors
 import tentacles.Trading.Mode.staggered_orders_trading_mode.staggered_orders_trading as staggered_orders_trading
 
 
+GRID_INCREMENT_WINDOW_DIVIDER = decimal.Decimal(4)
+
+
 @dataclasses.dataclass
 class AllowedPriceRange:
     lower_bound: decimal.Decimal = trading_constants.ZERO
@@ -176,6 +179,13 @@ class GridTradingMode(staggered_orders_trading.StaggeredOrdersTradingMode):
                   "orders when additional funds become available. Funds redispatch check happens once a day "
                   "around your OctoBot start time.",
         )
+        self.UI.user_input(
+            self.CONFIG_MAX_CONCURRENT_ORDERS_CREATION, commons_enums.UserInputTypes.INT,
+            self.CONFIG_DEFAULT_MAX_CONCURRENT_ORDERS_CREATION, inputs,
+            min_val=1,
+            title="Max concurrent orders creation: maximum number of orders being created on the exchange at the "
+                  "same time when creating the grid.",
+        )
 
     def get_default_pair_config(self, symbol, flat_spread, flat_increment) -> dict:
         return {
@@ -462,9 +472,8 @@ class GridTradingModeProducer(staggered_orders_trading.StaggeredOrdersTradingMod
         if not trades_or_orders:
             return trades_or_orders
         sorted_elements = sorted(trades_or_orders, key=lambda t: self.get_trade_or_order_price(t))
-        four = decimal.Decimal("4")
-        increment_lower_bound = - self.flat_increment / four
-        increment_higher_bound = self.flat_increment / four
+        increment_lower_bound = - self.flat_increment / GRID_INCREMENT_WINDOW_DIVIDER
+        increment_higher_bound = self.flat_increment / GRID_INCREMENT_WINDOW_DIVIDER
         for first_element_index in range(len(sorted_elements)):
             grid_trades_or_orders = []
             previous_element = None
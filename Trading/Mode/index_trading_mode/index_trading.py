@@ -62,7 +62,7 @@ class IndexTradingModeConsumer(trading_modes.AbstractTradingModeConsumer):
         orders = []
         try:
             # 1. make sure we can actually rebalance the portfolio
-            await self._ensure_enough_funds_to_buy_after_selling()
+            await self._ensure_enough_funds_to_buy_after_selling(details)
             # 2. sell indexed coins for reference market
             orders += await self._sell_indexed_coins_for_reference_market(details)
             # 3. split reference market into indexed coins
@@ -80,6 +80,7 @@ class IndexTradingModeConsumer(trading_modes.AbstractTradingModeConsumer):
             self.trading_mode, self._get_coins_to_sell(details),
             self.exchange_manager.exchange_personal_data.portfolio_manager.reference_market, {}
         )
+        orders += await self._sell_coins_excess(details)
         if orders:
             # ensure orders are filled
             await asyncio.gather(
@@ -92,38 +93,90 @@ class IndexTradingModeConsumer(trading_modes.AbstractTradingModeConsumer):
         return orders
 
     def _get_coins_to_sell(self, details: dict) -> list:
-        return list(details[RebalanceDetails.SWAP.value]) or (
-            self.trading_mode.indexed_coins + list(details[RebalanceDetails.REMOVE.value])
+        # coins to fully sell, other coins are only partially sold or bought when necessary
+        return list(details[RebalanceDetails.SWAP.value]) or list(details[RebalanceDetails.REMOVE.value])
+
+    async def _sell_coins_excess(self, details: dict) -> list:
+        if details[RebalanceDetails.SWAP.value] or not details[RebalanceDetails.SELL_SOME.value]:
+            return []
+        orders = []
+        reference_market_to_split = self.exchange_manager.exchange_personal_data.portfolio_manager. \
+            portfolio_value_holder.get_traded_assets_holdings_value(
+                self.exchange_manager.exchange_personal_data.portfolio_manager.reference_market
+            )
+        amount_by_symbol = await self._get_symbols_and_amounts(
+            list(details[RebalanceDetails.SELL_SOME.value]), reference_market_to_split
         )
+        for symbol, ideal_amount in amount_by_symbol.items():
+            orders.extend(await self._sell_coin(symbol, ideal_amount))
+        return orders
 
-    async def _ensure_enough_funds_to_buy_after_selling(self):
+    async def _ensure_enough_funds_to_buy_after_selling(self, details: dict):
         reference_market_to_split = self.exchange_manager.exchange_personal_data.portfolio_manager. \
             portfolio_value_holder.get_traded_assets_holdings_value(
                 self.exchange_manager.exchange_personal_data.portfolio_manager.reference_market
             )
         # will raise if funds are missing
         await self._get_symbols_and_amounts(self.trading_mode.indexed_coins, reference_market_to_split)
+        if details[RebalanceDetails.SWAP.value]:
+            return
+        # don't sell anything if none of the coins to buy can actually be bought
+        coins_to_buy = self._get_coins_to_buy(details)
+        if coins_to_buy and not await self._get_buyable_symbols(coins_to_buy, reference_market_to_split):
+            raise trading_errors.MissingMinimalExchangeTradeVolume(
+                f"Can't buy {coins_to_buy}: missing amounts are below exchange minimal trade volume."
+            )
+
+    def _get_coins_to_buy(self, details: dict) -> list:
+        if details[RebalanceDetails.SWAP.value]:
+            return list(details[RebalanceDetails.SWAP.value].values())
+        # only buy added and under-allocated coins: other coins are within tolerance
+        return list(dict.fromkeys(
+            list(details[RebalanceDetails.ADD.value]) + list(details[RebalanceDetails.BUY_MORE.value])
+        ))
+
+    async def _get_buyable_symbols(self, coins_to_buy, reference_market_to_split) -> list:
+        portfolio = self.exchange_manager.exchange_personal_data.portfolio_manager.portfolio
+        buyable_symbols = []
+        for symbol, ideal_amount in (
+            await self._get_symbols_and_amounts(coins_to_buy, reference_market_to_split)
+        ).items():
+            missing_amount = ideal_amount - portfolio.get_currency_portfolio(
+                symbol_util.parse_symbol(symbol).base
+            ).total
+            if missing_amount <= trading_constants.ZERO:
+                continue
+            price = await trading_personal_data.get_up_to_date_price(
+                self.exchange_manager, symbol, timeout=trading_constants.ORDER_DATA_FETCHING_TIMEOUT
+            )
+            if trading_personal_data.decimal_check_and_adapt_order_details_if_necessary(
+                missing_amount, price, self.exchange_manager.exchange.get_market_status(symbol, with_fixer=False)
+            ):
+                buyable_symbols.append(symbol)
+        return buyable_symbols
 
     async def _split_reference_market_into_indexed_coins(self, details: dict):
         orders = []
-        if details[RebalanceDetails.SWAP.value]:
-            # has to infer total reference market holdings
-            reference_market_to_split = self.exchange_manager.exchange_personal_data.portfolio_manager. \
-                portfolio_value_holder.get_traded_assets_holdings_value(
-                    self.exchange_manager.exchange_personal_data.portfolio_manager.reference_market
-                )
-            coins_to_buy = list(details[RebalanceDetails.SWAP.value].values())
-        else:
-            # can use actual reference market holdings: everything has been sold
-            reference_market_to_split = \
-                self.exchange_manager.exchange_personal_data.portfolio_manager.portfolio.get_currency_portfolio(
-                    self.exchange_manager.exchange_personal_data.portfolio_manager.reference_market
-                ).available
-            coins_to_buy = self.trading_mode.indexed_coins
+        # coins are not all sold: split according to total holdings, bought amounts are adapted to each coin holdings
+        reference_market_to_split = self.exchange_manager.exchange_personal_data.portfolio_manager. \
+            portfolio_value_holder.get_traded_assets_holdings_value(
+                self.exchange_manager.exchange_personal_data.portfolio_manager.reference_market
+            )
+        is_swap = bool(details[RebalanceDetails.SWAP.value])
+        coins_to_buy = self._get_coins_to_buy(details)
+        if not coins_to_buy:
+            # only selling was required
+            return orders
 
         amount_by_symbol = await self._get_symbols_and_amounts(coins_to_buy, reference_market_to_split)
         for symbol, ideal_amount in amount_by_symbol.items():
-            orders.extend(await self._buy_coin(symbol, ideal_amount))
+            try:
+                orders.extend(await self._buy_coin(symbol, ideal_amount))
+            except trading_errors.MissingMinimalExchangeTradeVolume:
+                if is_swap:
+                    raise
+                # missing amount is too small to be bought: holdings are already close enough to target
+                self.logger.debug(f"Skipping {symbol} buy: missing amount is below exchange minimal trade volume")
         if not orders:
             raise trading_errors.MissingMinimalExchangeTradeVolume()
         return orders
@@ -203,6 +256,33 @@ class IndexTradingModeConsumer(trading_modes.AbstractTradingModeConsumer):
             raise trading_errors.OrderCreationError()
         raise trading_errors.MissingMinimalExchangeTradeVolume()
 
+    async def _sell_coin(self, symbol, ideal_amount) -> list:
+        current_symbol_holding, current_market_holding, market_quantity, price, symbol_market = \
+            await trading_personal_data.get_pre_order_data(
+                self.exchange_manager, symbol=symbol, timeout=trading_constants.ORDER_DATA_FETCHING_TIMEOUT
+            )
+        # only sell the holdings in excess
+        ideal_quantity = current_symbol_holding - ideal_amount
+        if ideal_quantity <= trading_constants.ZERO:
+            return []
+        created_orders = []
+        for order_quantity, order_price in trading_personal_data.decimal_check_and_adapt_order_details_if_necessary(
+            ideal_quantity,
+            price,
+            symbol_market
+        ):
+            current_order = trading_personal_data.create_order_instance(
+                trader=self.exchange_manager.trader,
+                order_type=trading_enums.TraderOrderType.SELL_MARKET,
+                symbol=symbol,
+                current_price=order_price,
+                quantity=order_quantity,
+                price=order_price,
+            )
+            created_order = await self.trading_mode.create_order(current_order)
+            created_orders.append(created_order)
+        return created_orders
+
 
 class IndexTradingModeProducer(trading_modes.AbstractTradingModeProducer):
     REFRESH_INTERVAL = "refresh_interval"
@@ -299,10 +379,14 @@ class IndexTradingModeProducer(trading_modes.AbstractTradingModeProducer):
             RebalanceDetails.SWAP.value: {},
         }
         should_rebalance = False
+        removed_coins = self.trading_mode.get_removed_coins_from_previous_config()
+        # use the same portfolio snapshot for every coin
+        holdings_ratios = self._get_holdings_ratios(list(dict.fromkeys(
+            list(removed_coins) + list(self.trading_mode.indexed_coins)
+        )))
         # look for coins update in indexed_coins
-        for coin in self.trading_mode.get_removed_coins_from_previous_config():
-            coin_ratio = self.exchange_manager.exchange_personal_data.portfolio_manager. \
-                portfolio_value_holder.get_holdings_ratio(coin, traded_symbols_only=True)
+        for coin in removed_coins:
+            coin_ratio = holdings_ratios[coin]
             if coin_ratio >= trading_constants.ZERO:
                 # coin to sell in portfolio
                 rebalance_details[RebalanceDetails.REMOVE.value][coin] = coin_ratio
@@ -313,8 +397,7 @@ class IndexTradingModeProducer(trading_modes.AbstractTradingModeProducer):
                 )
         # compute coins to buy or sell
         for coin in self.trading_mode.indexed_coins:
-            coin_ratio = self.exchange_manager.exchange_personal_data.portfolio_manager. \
-                portfolio_value_holder.get_holdings_ratio(coin, traded_symbols_only=True)
+            coin_ratio = holdings_ratios[coin]
             target_ratio = self.trading_mode.get_target_ratio(coin)
             beyond_ratio = True
             if coin_ratio == trading_constants.ZERO and target_ratio > trading_constants.ZERO:
@@ -355,6 +438,24 @@ class IndexTradingModeProducer(trading_modes.AbstractTradingModeProducer):
             )
         return should_rebalance, rebalance_details
 
+    def _get_holdings_ratios(self, coins) -> dict:
+        """
+        :return: the traded assets holdings ratio of each coin, computed from a single portfolio snapshot
+        """
+        portfolio_manager = self.exchange_manager.exchange_personal_data.portfolio_manager
+        total_holdings_value = portfolio_manager.portfolio_value_holder.get_traded_assets_holdings_value(
+            portfolio_manager.reference_market
+        )
+        if not total_holdings_value:
+            return {coin: trading_constants.ZERO for coin in coins}
+        value_converter = portfolio_manager.portfolio_value_holder.value_converter
+        return {
+            coin: value_converter.evaluate_value(
+                coin, portfolio_manager.portfolio.get_currency_portfolio(coin).total
+            ) / total_holdings_value
+            for coin in coins
+        }
+
     def _resolve_swaps(self, details: dict):
         removed = details[RebalanceDetails.REMOVE.value]
         details[RebalanceDetails.SWAP.value] = {}
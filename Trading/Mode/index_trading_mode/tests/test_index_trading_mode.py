@@ -370,6 +370,26 @@ async def test_trigger_rebalance(tools):
         )
 
 
+async def test_get_holdings_ratios(tools):
+    update = {}
+    mode, producer, consumer, trader = await _init_mode(tools, _get_config(tools, update))
+    portfolio_value_holder = trader.exchange_manager.exchange_personal_data.portfolio_manager.portfolio_value_holder
+    coins = ["BTC", "USDT", "ETH", "SOL"]
+    assert producer._get_holdings_ratios(coins) == {
+        coin: portfolio_value_holder.get_holdings_ratio(coin, traded_symbols_only=True)
+        for coin in coins
+    }
+    with mock.patch.object(
+        portfolio_value_holder, "get_traded_assets_holdings_value", mock.Mock(return_value=trading_constants.ZERO)
+    ) as get_traded_assets_holdings_value_mock:
+        assert producer._get_holdings_ratios(coins) == {coin: trading_constants.ZERO for coin in coins}
+        get_traded_assets_holdings_value_mock.assert_called_once()
+
+
+def _holdings_ratios_mock(ratio):
+    return mock.Mock(side_effect=lambda coins: {coin: ratio for coin in coins})
+
+
 async def test_get_rebalance_details(tools):
     update = {}
     mode, producer, consumer, trader = await _init_mode(tools, _get_config(tools, update))
@@ -382,7 +402,7 @@ async def test_get_rebalance_details(tools):
     portfolio_value_holder = trader.exchange_manager.exchange_personal_data.portfolio_manager.portfolio_value_holder
     with mock.patch.object(producer, "_resolve_swaps", mock.Mock()) as _resolve_swaps_mock:
         with mock.patch.object(
-            portfolio_value_holder, "get_holdings_ratio", mock.Mock(return_value=decimal.Decimal("0.3"))
+            producer, "_get_holdings_ratios", _holdings_ratios_mock(decimal.Decimal("0.3"))
         ) as get_holdings_ratio_mock:
             with mock.patch.object(
                 mode, "get_removed_coins_from_previous_config", mock.Mock(return_value=[])
@@ -396,7 +416,7 @@ async def test_get_rebalance_details(tools):
                     index_trading.RebalanceDetails.ADD.value: {},
                     index_trading.RebalanceDetails.SWAP.value: {},
                 }
-                assert get_holdings_ratio_mock.call_count == len(mode.indexed_coins)
+                get_holdings_ratio_mock.assert_called_once()
                 get_removed_coins_from_previous_config_mock.assert_called_once()
                 _resolve_swaps_mock.assert_called_once_with(details)
                 _resolve_swaps_mock.reset_mock()
@@ -416,14 +436,13 @@ async def test_get_rebalance_details(tools):
                     index_trading.RebalanceDetails.ADD.value: {},
                     index_trading.RebalanceDetails.SWAP.value: {},
                 }
-                assert get_holdings_ratio_mock.call_count == \
-                       len(mode.indexed_coins) + len(details[index_trading.RebalanceDetails.REMOVE.value])
+                get_holdings_ratio_mock.assert_called_once()
                 get_removed_coins_from_previous_config_mock.assert_called_once()
                 _resolve_swaps_mock.assert_called_once_with(details)
                 _resolve_swaps_mock.reset_mock()
                 get_holdings_ratio_mock.reset_mock()
         with mock.patch.object(
-            portfolio_value_holder, "get_holdings_ratio", mock.Mock(return_value=decimal.Decimal("0.2"))
+            producer, "_get_holdings_ratios", _holdings_ratios_mock(decimal.Decimal("0.2"))
         ) as get_holdings_ratio_mock:
             with mock.patch.object(
                 mode, "get_removed_coins_from_previous_config", mock.Mock(return_value=[])
@@ -441,7 +460,7 @@ async def test_get_rebalance_details(tools):
                     index_trading.RebalanceDetails.ADD.value: {},
                     index_trading.RebalanceDetails.SWAP.value: {},
                 }
-                assert get_holdings_ratio_mock.call_count == len(mode.indexed_coins)
+                get_holdings_ratio_mock.assert_called_once()
                 get_removed_coins_from_previous_config_mock.assert_called_once()
                 _resolve_swaps_mock.assert_called_once_with(details)
                 _resolve_swaps_mock.reset_mock()
@@ -465,8 +484,7 @@ async def test_get_rebalance_details(tools):
                     index_trading.RebalanceDetails.ADD.value: {},
                     index_trading.RebalanceDetails.SWAP.value: {},
                 }
-                assert get_holdings_ratio_mock.call_count == \
-                       len(mode.indexed_coins) + len(details[index_trading.RebalanceDetails.REMOVE.value])
+                get_holdings_ratio_mock.assert_called_once()
                 get_removed_coins_from_previous_config_mock.assert_called_once()
                 _resolve_swaps_mock.assert_called_once_with(details)
                 _resolve_swaps_mock.reset_mock()
@@ -475,7 +493,7 @@ async def test_get_rebalance_details(tools):
         # rebalance cap larger than ratio
         mode.rebalance_trigger_min_ratio = decimal.Decimal("0.5")
         with mock.patch.object(
-            portfolio_value_holder, "get_holdings_ratio", mock.Mock(return_value=decimal.Decimal("0.3"))
+            producer, "_get_holdings_ratios", _holdings_ratios_mock(decimal.Decimal("0.3"))
         ) as get_holdings_ratio_mock:
             should_rebalance, details = producer._get_rebalance_details()
             assert should_rebalance is False
@@ -486,12 +504,12 @@ async def test_get_rebalance_details(tools):
                 index_trading.RebalanceDetails.ADD.value: {},
                 index_trading.RebalanceDetails.SWAP.value: {},
             }
-            assert get_holdings_ratio_mock.call_count == len(mode.indexed_coins)
+            get_holdings_ratio_mock.assert_called_once()
             get_holdings_ratio_mock.reset_mock()
             _resolve_swaps_mock.assert_called_once_with(details)
             _resolve_swaps_mock.reset_mock()
         with mock.patch.object(
-            portfolio_value_holder, "get_holdings_ratio", mock.Mock(return_value=decimal.Decimal("0.00000001"))
+            producer, "_get_holdings_ratios", _holdings_ratios_mock(decimal.Decimal("0.00000001"))
         ) as get_holdings_ratio_mock:
             should_rebalance, details = producer._get_rebalance_details()
             assert should_rebalance is False
@@ -502,12 +520,12 @@ async def test_get_rebalance_details(tools):
                 index_trading.RebalanceDetails.ADD.value: {},
                 index_trading.RebalanceDetails.SWAP.value: {},
             }
-            assert get_holdings_ratio_mock.call_count == len(mode.indexed_coins)
+            get_holdings_ratio_mock.assert_called_once()
             get_holdings_ratio_mock.reset_mock()
             _resolve_swaps_mock.assert_called_once_with(details)
             _resolve_swaps_mock.reset_mock()
         with mock.patch.object(
-            portfolio_value_holder, "get_holdings_ratio", mock.Mock(return_value=decimal.Decimal("0.9"))
+            producer, "_get_holdings_ratios", _holdings_ratios_mock(decimal.Decimal("0.9"))
         ) as get_holdings_ratio_mock:
             should_rebalance, details = producer._get_rebalance_details()
             assert should_rebalance is True
@@ -522,12 +540,12 @@ async def test_get_rebalance_details(tools):
                 index_trading.RebalanceDetails.ADD.value: {},
                 index_trading.RebalanceDetails.SWAP.value: {},
             }
-            assert get_holdings_ratio_mock.call_count == len(details[index_trading.RebalanceDetails.SELL_SOME.value])
+            get_holdings_ratio_mock.assert_called_once()
             get_holdings_ratio_mock.reset_mock()
             _resolve_swaps_mock.assert_called_once_with(details)
             _resolve_swaps_mock.reset_mock()
         with mock.patch.object(
-            portfolio_value_holder, "get_holdings_ratio", mock.Mock(return_value=decimal.Decimal("0"))
+            producer, "_get_holdings_ratios", _holdings_ratios_mock(decimal.Decimal("0"))
         ) as get_holdings_ratio_mock:
             should_rebalance, details = producer._get_rebalance_details()
             assert should_rebalance is True
@@ -542,7 +560,7 @@ async def test_get_rebalance_details(tools):
                 },
                 index_trading.RebalanceDetails.SWAP.value: {},
             }
-            assert get_holdings_ratio_mock.call_count == len(details[index_trading.RebalanceDetails.ADD.value])
+            get_holdings_ratio_mock.assert_called_once()
             get_holdings_ratio_mock.reset_mock()
             _resolve_swaps_mock.assert_called_once_with(details)
             _resolve_swaps_mock.reset_mock()
@@ -695,9 +713,58 @@ async def test_ensure_enough_funds_to_buy_after_selling(tools):
     ) as get_traded_assets_holdings_value_mock, mock.patch.object(
         consumer, "_get_symbols_and_amounts", mock.AsyncMock()
     ) as _get_symbols_and_amounts_mock:
-        await consumer._ensure_enough_funds_to_buy_after_selling()
-        get_traded_assets_holdings_value_mock.assert_called_once_with("USDT")
-        _get_symbols_and_amounts_mock.assert_called_once_with(["BTC"], decimal.Decimal("2000"))
+        details = {
+            index_trading.RebalanceDetails.SELL_SOME.value: {},
+            index_trading.RebalanceDetails.BUY_MORE.value: {},
+            index_trading.RebalanceDetails.REMOVE.value: {},
+            index_trading.RebalanceDetails.ADD.value: {},
+            index_trading.RebalanceDetails.SWAP.value: {},
+        }
+        with mock.patch.object(consumer, "_get_buyable_symbols", mock.AsyncMock()) as _get_buyable_symbols_mock:
+            await consumer._ensure_enough_funds_to_buy_after_selling(details)
+            get_traded_assets_holdings_value_mock.assert_called_once_with("USDT")
+            _get_symbols_and_amounts_mock.assert_called_once_with(["BTC"], decimal.Decimal("2000"))
+            # nothing to buy
+            _get_buyable_symbols_mock.assert_not_called()
+
+
+async def test_ensure_enough_funds_to_buy_after_selling_with_coins_to_buy(tools):
+    update = {}
+    mode, producer, consumer, trader = await _init_mode(tools, _get_config(tools, update))
+    with mock.patch.object(
+        trader.exchange_manager.exchange_personal_data.portfolio_manager.portfolio_value_holder,
+        "get_traded_assets_holdings_value", mock.Mock(return_value=decimal.Decimal("2000"))
+    ), mock.patch.object(
+        consumer, "_get_symbols_and_amounts", mock.AsyncMock()
+    ):
+        details = {
+            index_trading.RebalanceDetails.SELL_SOME.value: {},
+            index_trading.RebalanceDetails.BUY_MORE.value: {},
+            index_trading.RebalanceDetails.REMOVE.value: {},
+            index_trading.RebalanceDetails.ADD.value: {},
+            index_trading.RebalanceDetails.SWAP.value: {},
+        }
+        details[index_trading.RebalanceDetails.SELL_SOME.value] = {"ETH": decimal.Decimal("0.5")}
+        details[index_trading.RebalanceDetails.BUY_MORE.value] = {"BTC": decimal.Decimal("0.5")}
+        with mock.patch.object(
+            consumer, "_get_buyable_symbols", mock.AsyncMock(return_value=["BTC/USDT"])
+        ) as _get_buyable_symbols_mock:
+            await consumer._ensure_enough_funds_to_buy_after_selling(details)
+            _get_buyable_symbols_mock.assert_called_once_with(["BTC"], decimal.Decimal("2000"))
+        # coins to buy are all below exchange minimal volume: raise before selling
+        with mock.patch.object(
+            consumer, "_get_buyable_symbols", mock.AsyncMock(return_value=[])
+        ) as _get_buyable_symbols_mock:
+            with pytest.raises(trading_errors.MissingMinimalExchangeTradeVolume):
+                await consumer._ensure_enough_funds_to_buy_after_selling(details)
+            _get_buyable_symbols_mock.assert_called_once_with(["BTC"], decimal.Decimal("2000"))
+        # swaps are always possible
+        details[index_trading.RebalanceDetails.SWAP.value] = {"ETH": "BTC"}
+        with mock.patch.object(
+            consumer, "_get_buyable_symbols", mock.AsyncMock(return_value=[])
+        ) as _get_buyable_symbols_mock:
+            await consumer._ensure_enough_funds_to_buy_after_selling(details)
+            _get_buyable_symbols_mock.assert_not_called()
 
 
 async def test_sell_indexed_coins_for_reference_market(tools):
@@ -709,14 +776,17 @@ async def test_sell_indexed_coins_for_reference_market(tools):
         trading_personal_data, "wait_for_order_fill", mock.AsyncMock()
     ) as wait_for_order_fill_mock, mock.patch.object(
         consumer, "_get_coins_to_sell", mock.Mock(return_value=[1, 2, 3])
-    ) as _get_coins_to_sell_mock:
-        assert await consumer._sell_indexed_coins_for_reference_market("details") == ["1", "2"]
+    ) as _get_coins_to_sell_mock, mock.patch.object(
+        consumer, "_sell_coins_excess", mock.AsyncMock(return_value=["3"])
+    ) as _sell_coins_excess_mock:
+        assert await consumer._sell_indexed_coins_for_reference_market("details") == ["1", "2", "3"]
         convert_assets_to_target_asset_mock.assert_called_once_with(
             mode, [1, 2, 3],
             consumer.exchange_manager.exchange_personal_data.portfolio_manager.reference_market, {}
         )
-        assert wait_for_order_fill_mock.call_count == 2
+        assert wait_for_order_fill_mock.call_count == 3
         _get_coins_to_sell_mock.assert_called_once_with("details")
+        _sell_coins_excess_mock.assert_called_once_with("details")
 
 
 async def test_get_coins_to_sell(tools):
@@ -729,7 +799,7 @@ async def test_get_coins_to_sell(tools):
         index_trading.RebalanceDetails.REMOVE.value: {},
         index_trading.RebalanceDetails.ADD.value: {},
         index_trading.RebalanceDetails.SWAP.value: {},
-    }) == ["BTC", "ETH", "DOGE", "SHIB"]
+    }) == []
     assert consumer._get_coins_to_sell({
         index_trading.RebalanceDetails.SELL_SOME.value: {},
         index_trading.RebalanceDetails.BUY_MORE.value: {},
@@ -752,12 +822,16 @@ async def test_get_coins_to_sell(tools):
         },
     }) == ["BTC", "SOL"]
     assert consumer._get_coins_to_sell({
-        index_trading.RebalanceDetails.SELL_SOME.value: {},
-        index_trading.RebalanceDetails.BUY_MORE.value: {},
+        index_trading.RebalanceDetails.SELL_SOME.value: {
+            "BTC": decimal.Decimal("0.25")
+        },
+        index_trading.RebalanceDetails.BUY_MORE.value: {
+            "ETH": decimal.Decimal("0.25")
+        },
         index_trading.RebalanceDetails.REMOVE.value: {},
         index_trading.RebalanceDetails.ADD.value: {},
         index_trading.RebalanceDetails.SWAP.value: {},
-    }) == ["BTC", "ETH", "DOGE", "SHIB"]
+    }) == []
     assert consumer._get_coins_to_sell({
         index_trading.RebalanceDetails.SELL_SOME.value: {},
         index_trading.RebalanceDetails.BUY_MORE.value: {},
@@ -766,7 +840,69 @@ async def test_get_coins_to_sell(tools):
         },
         index_trading.RebalanceDetails.ADD.value: {},
         index_trading.RebalanceDetails.SWAP.value: {},
-    }) == ["BTC", "ETH", "DOGE", "SHIB", "XRP"]
+    }) == ["XRP"]
+
+
+async def test_sell_coins_excess(tools):
+    update = {}
+    mode, producer, consumer, trader = await _init_mode(tools, _get_config(tools, update))
+    details = {
+        index_trading.RebalanceDetails.SELL_SOME.value: {},
+        index_trading.RebalanceDetails.BUY_MORE.value: {},
+        index_trading.RebalanceDetails.REMOVE.value: {},
+        index_trading.RebalanceDetails.ADD.value: {},
+        index_trading.RebalanceDetails.SWAP.value: {},
+    }
+    with mock.patch.object(
+        trader.exchange_manager.exchange_personal_data.portfolio_manager.portfolio_value_holder,
+        "get_traded_assets_holdings_value", mock.Mock(return_value=decimal.Decimal("2000"))
+    ) as get_traded_assets_holdings_value_mock, mock.patch.object(
+        consumer, "_get_symbols_and_amounts", mock.AsyncMock(
+            side_effect=lambda coins, _: {f"{coin}/USDT": decimal.Decimal(i + 1) for i, coin in enumerate(coins)}
+        )
+    ) as _get_symbols_and_amounts_mock, mock.patch.object(
+        consumer, "_sell_coin", mock.AsyncMock(return_value=["order"])
+    ) as _sell_coin_mock:
+        # nothing to partially sell
+        assert await consumer._sell_coins_excess(details) == []
+        _sell_coin_mock.assert_not_called()
+
+        # swaps: nothing to partially sell
+        details[index_trading.RebalanceDetails.SELL_SOME.value] = {"BTC": decimal.Decimal("0.5")}
+        details[index_trading.RebalanceDetails.SWAP.value] = {"SOL": "ADA"}
+        assert await consumer._sell_coins_excess(details) == []
+        _sell_coin_mock.assert_not_called()
+
+        # sell excess only
+        details[index_trading.RebalanceDetails.SWAP.value] = {}
+        assert await consumer._sell_coins_excess(details) == ["order"]
+        get_traded_assets_holdings_value_mock.assert_called_once_with("USDT")
+        _get_symbols_and_amounts_mock.assert_called_once_with(["BTC"], decimal.Decimal("2000"))
+        _sell_coin_mock.assert_called_once_with("BTC/USDT", decimal.Decimal(1))
+
+
+async def test_sell_coin(tools):
+    update = {}
+    mode, producer, consumer, trader = await _init_mode(tools, _get_config(tools, update))
+    portfolio = trader.exchange_manager.exchange_personal_data.portfolio_manager.portfolio.portfolio
+    with mock.patch.object(
+        mode,
+        "create_order", mock.AsyncMock(side_effect=lambda x: x)
+    ) as create_order_mock:
+        # nothing in excess
+        portfolio["BTC"].available = decimal.Decimal("1.5")
+        assert await consumer._sell_coin("BTC/USDT", decimal.Decimal(2)) == []
+        create_order_mock.assert_not_called()
+
+        # sell excess only
+        portfolio["BTC"].available = decimal.Decimal("2.5")
+        orders = await consumer._sell_coin("BTC/USDT", decimal.Decimal(2))
+        assert len(orders) == 1
+        create_order_mock.assert_called_once_with(orders[0])
+        assert isinstance(orders[0], trading_personal_data.SellMarketOrder)
+        assert orders[0].symbol == "BTC/USDT"
+        assert orders[0].origin_price == decimal.Decimal(1000)
+        assert orders[0].origin_quantity == decimal.Decimal("0.5")
 
 
 async def test_resolve_swaps(tools):
@@ -842,77 +978,99 @@ async def test_resolve_swaps(tools):
 async def test_split_reference_market_into_indexed_coins(tools):
     update = {}
     mode, producer, consumer, trader = await _init_mode(tools, _get_config(tools, update))
-    # no indexed coin
-    mode.indexed_coins = []
-    details = {index_trading.RebalanceDetails.SWAP.value: {}}
+    mode.indexed_coins = ["ETH", "BTC"]
+    details = {
+        index_trading.RebalanceDetails.SELL_SOME.value: {},
+        index_trading.RebalanceDetails.BUY_MORE.value: {},
+        index_trading.RebalanceDetails.REMOVE.value: {},
+        index_trading.RebalanceDetails.ADD.value: {},
+        index_trading.RebalanceDetails.SWAP.value: {},
+    }
     with mock.patch.object(
         consumer,
         "_get_symbols_and_amounts", mock.AsyncMock(
             side_effect=lambda coins, _: {f"{coin}/USDT": decimal.Decimal(i+1) for i, coin in enumerate(coins)}
         )
-    ) as _get_symbols_and_amounts_mock:
+    ) as _get_symbols_and_amounts_mock, mock.patch.object(
+        trader.exchange_manager.exchange_personal_data.portfolio_manager.portfolio_value_holder,
+        "get_traded_assets_holdings_value", mock.Mock(return_value=decimal.Decimal("2000"))
+    ) as get_traded_assets_holdings_value_mock:
+        # no coin to buy: only selling was required
         with mock.patch.object(
-            trader.exchange_manager.exchange_personal_data.portfolio_manager.portfolio,
-            "get_currency_portfolio", mock.Mock(return_value=mock.Mock(available=decimal.Decimal("2")))
-        ) as get_currency_portfolio_mock, mock.patch.object(
             consumer, "_buy_coin", mock.AsyncMock(return_value=["order"])
         ) as _buy_coin_mock:
-            with pytest.raises(trading_errors.MissingMinimalExchangeTradeVolume):
-                await consumer._split_reference_market_into_indexed_coins(details)
-            get_currency_portfolio_mock.assert_called_once_with("USDT")
+            assert await consumer._split_reference_market_into_indexed_coins(details) == []
             _buy_coin_mock.assert_not_called()
-            _get_symbols_and_amounts_mock.assert_called_once()
-            _get_symbols_and_amounts_mock.reset_mock()
+            _get_symbols_and_amounts_mock.assert_not_called()
+            get_traded_assets_holdings_value_mock.reset_mock()
 
         # coins to swap
         mode.indexed_coins = []
-        details = {index_trading.RebalanceDetails.SWAP.value: {"BTC": "ETH", "ADA": "SOL"}}
+        details[index_trading.RebalanceDetails.SWAP.value] = {"BTC": "ETH", "ADA": "SOL"}
         with mock.patch.object(
-            trader.exchange_manager.exchange_personal_data.portfolio_manager.portfolio,
-            "get_currency_portfolio", mock.Mock(return_value=mock.Mock(available=decimal.Decimal("2")))
-        ) as get_currency_portfolio_mock, mock.patch.object(
-            trader.exchange_manager.exchange_personal_data.portfolio_manager.portfolio_value_holder,
-            "get_traded_assets_holdings_value", mock.Mock(return_value=decimal.Decimal("2000"))
-        ) as get_traded_assets_holdings_value_mock, mock.patch.object(
             consumer, "_buy_coin", mock.AsyncMock(return_value=["order"])
         ) as _buy_coin_mock:
             assert await consumer._split_reference_market_into_indexed_coins(details) == ["order", "order"]
-            _get_symbols_and_amounts_mock.assert_called_once()
+            _get_symbols_and_amounts_mock.assert_called_once_with(["ETH", "SOL"], decimal.Decimal("2000"))
             _get_symbols_and_amounts_mock.reset_mock()
             get_traded_assets_holdings_value_mock.assert_called_once_with("USDT")
-            get_currency_portfolio_mock.assert_not_called()
+            get_traded_assets_holdings_value_mock.reset_mock()
             assert _buy_coin_mock.call_count == 2
             assert _buy_coin_mock.mock_calls[0].args == ("ETH/USDT", decimal.Decimal("1"))
             assert _buy_coin_mock.mock_calls[1].args == ("SOL/USDT", decimal.Decimal("2"))
 
+        # swapped coins too small to be bought
+        with mock.patch.object(
+            consumer, "_buy_coin", mock.AsyncMock(side_effect=trading_errors.MissingMinimalExchangeTradeVolume)
+        ) as _buy_coin_mock:
+            with pytest.raises(trading_errors.MissingMinimalExchangeTradeVolume):
+                await consumer._split_reference_market_into_indexed_coins(details)
+            _buy_coin_mock.assert_called_once()
+            _get_symbols_and_amounts_mock.reset_mock()
+            get_traded_assets_holdings_value_mock.reset_mock()
+
         # no bought coin
-        details = {index_trading.RebalanceDetails.SWAP.value: {}}
+        details[index_trading.RebalanceDetails.SWAP.value] = {}
+        details[index_trading.RebalanceDetails.BUY_MORE.value] = {
+            "ETH": decimal.Decimal("0.5"), "BTC": decimal.Decimal("0.5")
+        }
         mode.indexed_coins = ["ETH", "BTC"]
         with mock.patch.object(
-            trader.exchange_manager.exchange_personal_data.portfolio_manager.portfolio,
-            "get_currency_portfolio", mock.Mock(return_value=mock.Mock(available=decimal.Decimal("2")))
-        ) as get_currency_portfolio_mock, mock.patch.object(
             consumer, "_buy_coin", mock.AsyncMock(return_value=[])
         ) as _buy_coin_mock:
             with pytest.raises(trading_errors.MissingMinimalExchangeTradeVolume):
                 await consumer._split_reference_market_into_indexed_coins(details)
-            _get_symbols_and_amounts_mock.assert_called_once()
+            _get_symbols_and_amounts_mock.assert_called_once_with(["ETH", "BTC"], decimal.Decimal("2000"))
             _get_symbols_and_amounts_mock.reset_mock()
-            get_currency_portfolio_mock.assert_called_once_with("USDT")
+            get_traded_assets_holdings_value_mock.assert_called_once_with("USDT")
+            get_traded_assets_holdings_value_mock.reset_mock()
             assert _buy_coin_mock.call_count == 2
 
         # bought coins
-        mode.indexed_coins = ["ETH", "BTC"]
         with mock.patch.object(
-            trader.exchange_manager.exchange_personal_data.portfolio_manager.portfolio,
-            "get_currency_portfolio", mock.Mock(return_value=mock.Mock(available=decimal.Decimal("2")))
-        ) as get_currency_portfolio_mock, mock.patch.object(
             consumer, "_buy_coin", mock.AsyncMock(return_value=["order"])
         ) as _buy_coin_mock:
             assert await consumer._split_reference_market_into_indexed_coins(details) == ["order", "order"]
-            _get_symbols_and_amounts_mock.assert_called_once()
+            _get_symbols_and_amounts_mock.assert_called_once_with(["ETH", "BTC"], decimal.Decimal("2000"))
             _get_symbols_and_amounts_mock.reset_mock()
-            get_currency_portfolio_mock.assert_called_once_with("USDT")
+            get_traded_assets_holdings_value_mock.assert_called_once_with("USDT")
+            get_traded_assets_holdings_value_mock.reset_mock()
+            assert _buy_coin_mock.call_count == 2
+
+        # incremental rebalance: only added and under-allocated coins are bought, coins within tolerance and
+        # over-allocated coins are not
+        mode.indexed_coins = ["ETH", "BTC", "SOL"]
+        details[index_trading.RebalanceDetails.SELL_SOME.value] = {"ETH": decimal.Decimal("0.5")}
+        details[index_trading.RebalanceDetails.BUY_MORE.value] = {"SOL": decimal.Decimal("0.2")}
+        details[index_trading.RebalanceDetails.ADD.value] = {"ADA": decimal.Decimal("0.3")}
+        with mock.patch.object(
+            consumer, "_buy_coin", mock.AsyncMock(
+                side_effect=[trading_errors.MissingMinimalExchangeTradeVolume, ["order"]]
+            )
+        ) as _buy_coin_mock:
+            # too small buy orders are skipped
+            assert await consumer._split_reference_market_into_indexed_coins(details) == ["order"]
+            _get_symbols_and_amounts_mock.assert_called_once_with(["ADA", "SOL"], decimal.Decimal("2000"))
             assert _buy_coin_mock.call_count == 2
 
 
@@ -13,12 +13,17 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import asyncio
+import collections
 import decimal
+import functools
 
 import octobot_commons.channels_name as channels_name
 import octobot_commons.constants as common_constants
 import octobot_commons.enums as common_enums
 import octobot_commons.authentication as authentication
+import octobot_commons.json_util as json_util
+import octobot_commons.signals as commons_signals
 import octobot_commons.tentacles_management as tentacles_management
 import async_channel.channels as channels
 import octobot_trading.constants as trading_constants
@@ -32,6 +37,9 @@ import octobot_trading.modes.script_keywords as script_keywords
 
 
 class RemoteTradingSignalsTradingMode(trading_modes.AbstractTradingMode):
+    BACKTESTING_SIGNALS_FILE = "backtesting_signals_file"
+    BACKTESTING_SIGNALS_DELIVERY_DELAY = "backtesting_signals_delivery_delay"
+    SIGNAL_TIMESTAMP = "timestamp"
 
     def __init__(self, config, exchange_manager):
         super().__init__(config, exchange_manager)
@@ -59,6 +67,25 @@ class RemoteTradingSignalsTradingMode(trading_modes.AbstractTradingMode):
             title="Round to minimal size orders if missing funds according to signal. "
                   "Used when copy signals require a volume that doesn't meet the minimal exchange order size."
         )
+        self.UI.user_input(
+            RemoteTradingSignalsModeConsumer.MAX_CONCURRENT_ORDER_ACTIONS_CONFIG_KEY,
+            common_enums.UserInputTypes.INT, RemoteTradingSignalsModeConsumer.DEFAULT_MAX_CONCURRENT_ORDER_ACTIONS,
+            inputs, min_val=1,
+            title="Maximum concurrent order actions: maximum number of orders being created, edited or cancelled "
+                  "on the exchange at the same time when applying a signal.",
+        )
+        self.UI.user_input(
+            self.BACKTESTING_SIGNALS_FILE, common_enums.UserInputTypes.TEXT, "", inputs,
+            title="Backtesting signals file: path to a recorded signals stream to replay in backtesting. "
+                  "Only used in backtesting.",
+        )
+        self.UI.user_input(
+            self.BACKTESTING_SIGNALS_DELIVERY_DELAY, common_enums.UserInputTypes.FLOAT, 0, inputs,
+            min_val=0,
+            title="Backtesting signals delivery delay: simulated delay in seconds between a signal emission and "
+                  "its reception. Signals are replayed on candles closes: the effective delay is rounded up to "
+                  "the next candle close. Only used in backtesting.",
+        )
 
     @classmethod
     def get_supported_exchange_types(cls) -> list:
@@ -90,8 +117,7 @@ class RemoteTradingSignalsTradingMode(trading_modes.AbstractTradingMode):
             self.exchange_manager
         )
         if self.exchange_manager.is_backtesting:
-            # TODO: create and return producer simulator with this bot id
-            raise NotImplementedError("signal producer simulator is not implemented")
+            # signals are replayed by producers from the recorded signals file
             return []
         if created:
             # only subscribe once to the signal channel
@@ -130,7 +156,7 @@ class RemoteTradingSignalsTradingMode(trading_modes.AbstractTradingMode):
 
     @staticmethod
     def is_backtestable():
-        return False
+        return True
 
     def is_following_trading_signals(self):
         return True
@@ -143,6 +169,8 @@ class RemoteTradingSignalsTradingMode(trading_modes.AbstractTradingMode):
 class RemoteTradingSignalsModeConsumer(trading_modes.AbstractTradingModeConsumer):
     MAX_VOLUME_PER_BUY_ORDER_CONFIG_KEY = "max_volume"
     ROUND_TO_MINIMAL_SIZE_IF_NECESSARY_CONFIG_KEY = "round_to_minimal_size_if_necessary"
+    MAX_CONCURRENT_ORDER_ACTIONS_CONFIG_KEY = "max_concurrent_order_actions"
+    DEFAULT_MAX_CONCURRENT_ORDER_ACTIONS = 10
 
     def __init__(self, trading_mode):
         super().__init__(trading_mode)
@@ -150,12 +178,18 @@ class RemoteTradingSignalsModeConsumer(trading_modes.AbstractTradingModeConsumer
             decimal.Decimal(f"{self.trading_mode.trading_config.get(self.MAX_VOLUME_PER_BUY_ORDER_CONFIG_KEY, 100)}")
         self.ROUND_TO_MINIMAL_SIZE_IF_NECESSARY = \
             self.trading_mode.trading_config.get(self.ROUND_TO_MINIMAL_SIZE_IF_NECESSARY_CONFIG_KEY)
+        self.MAX_CONCURRENT_ORDER_ACTIONS = self.trading_mode.trading_config.get(
+            self.MAX_CONCURRENT_ORDER_ACTIONS_CONFIG_KEY, self.DEFAULT_MAX_CONCURRENT_ORDER_ACTIONS
+        )
 
     async def init_user_inputs(self, should_clear_inputs):
         self.MAX_VOLUME_PER_BUY_ORDER = \
             decimal.Decimal(f"{self.trading_mode.trading_config.get(self.MAX_VOLUME_PER_BUY_ORDER_CONFIG_KEY, 100)}")
         self.ROUND_TO_MINIMAL_SIZE_IF_NECESSARY = \
             self.trading_mode.trading_config.get(self.ROUND_TO_MINIMAL_SIZE_IF_NECESSARY_CONFIG_KEY)
+        self.MAX_CONCURRENT_ORDER_ACTIONS = self.trading_mode.trading_config.get(
+            self.MAX_CONCURRENT_ORDER_ACTIONS_CONFIG_KEY, self.DEFAULT_MAX_CONCURRENT_ORDER_ACTIONS
+        )
 
     async def internal_callback(self, trading_mode_name, cryptocurrency, symbol, time_frame, final_note, state,
                                 data):
@@ -192,31 +226,83 @@ class RemoteTradingSignalsModeConsumer(trading_modes.AbstractTradingModeConsumer
             order.add_to_order_group(order_group)
 
     async def _cancel_orders(self, orders_descriptions, symbol):
-        cancelled_count = 0
-        for _, order in self.get_open_order_from_description(orders_descriptions, symbol):
-            try:
-                await self._cancel_order_on_exchange(order)
-            except (errors.OrderCancelError, errors.UnexpectedExchangeSideOrderStateError) as err:
-                self.logger.warning(f"Skipping order cancel: {err} ({err.__class__.__name__})")
-            cancelled_count += 1
-        return cancelled_count
+        return len(await self._run_order_actions([
+            (order, functools.partial(self._cancel_order, order), True)
+            for _, order in self.get_open_order_from_description(orders_descriptions, symbol)
+        ]))
+
+    async def _cancel_order(self, order):
+        try:
+            await self._cancel_order_on_exchange(order)
+        except (errors.OrderCancelError, errors.UnexpectedExchangeSideOrderStateError) as err:
+            self.logger.warning(f"Skipping order cancel: {err} ({err.__class__.__name__})")
 
     async def _edit_orders(self, orders_descriptions, symbol):
-        edited_count = 0
-        for order_description, order in self.get_open_order_from_description(orders_descriptions, symbol):
-            edited_price = order_description[trading_enums.TradingSignalOrdersAttrs.UPDATED_LIMIT_PRICE.value]
-            edited_stop_price = order_description[trading_enums.TradingSignalOrdersAttrs.UPDATED_STOP_PRICE.value]
-            edited_quantity, _, _ = await self._get_quantity_from_signal_percent(
-                order_description, order.side, symbol, order.reduce_only, True
-            )
-            await self._edit_order_on_exchange(
+        return len(await self._run_order_actions([
+            (
                 order,
-                edited_quantity=decimal.Decimal(edited_quantity) if edited_quantity else None,
-                edited_price=decimal.Decimal(edited_price) if edited_price else None,
-                edited_stop_price=decimal.Decimal(edited_stop_price) if edited_stop_price else None
+                functools.partial(self._edit_order, order_description, order, symbol),
+                self._is_independent_edit(order_description)
             )
-            edited_count += 1
-        return edited_count
+            for order_description, order in self.get_open_order_from_description(orders_descriptions, symbol)
+        ]))
+
+    async def _edit_order(self, order_description, order, symbol):
+        edited_price = order_description[trading_enums.TradingSignalOrdersAttrs.UPDATED_LIMIT_PRICE.value]
+        edited_stop_price = order_description[trading_enums.TradingSignalOrdersAttrs.UPDATED_STOP_PRICE.value]
+        edited_quantity, _, _ = await self._get_quantity_from_signal_percent(
+            order_description, order.side, symbol, order.reduce_only, True
+        )
+        await self._edit_order_on_exchange(
+            order,
+            edited_quantity=decimal.Decimal(edited_quantity) if edited_quantity else None,
+            edited_price=decimal.Decimal(edited_price) if edited_price else None,
+            edited_stop_price=decimal.Decimal(edited_stop_price) if edited_stop_price else None
+        )
+
+    def _is_independent_edit(self, order_description) -> bool:
+        if self.exchange_manager.is_future:
+            # futures order sizes depend on the available margin and positions
+            return False
+        quantity_type, quantity = script_keywords.parse_quantity(
+            order_description[trading_enums.TradingSignalOrdersAttrs.UPDATED_TARGET_AMOUNT.value]
+        )
+        # % amounts are computed from total holdings, which are not impacted by other orders edits
+        return quantity is None or quantity_type is script_keywords.QuantityType.PERCENT
+
+    async def _run_order_actions(self, order_actions: list) -> list:
+        """
+        Run order actions concurrently, at most self.MAX_CONCURRENT_ORDER_ACTIONS at the same time.
+        Actions that are not independent or that are on an order that already has a pending action wait for
+        every previous action to complete, which gives the same result as running actions one by one.
+        :param order_actions: list of (order, coroutine function to call, is independent) tuples
+        :return: the actions results, following order_actions order
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_ORDER_ACTIONS)
+
+        async def _run_action(action):
+            async with semaphore:
+                return await action()
+
+        batches = []
+        is_batch_closed = True
+        batch_order_ids = set()
+        for order, action, is_independent in order_actions:
+            if is_batch_closed or not is_independent or order.order_id in batch_order_ids:
+                batches.append([])
+                batch_order_ids = set()
+            batches[-1].append(action)
+            batch_order_ids.add(order.order_id)
+            # a dependent action runs alone
+            is_batch_closed = not is_independent
+        results = []
+        for batch in batches:
+            batch_results = await asyncio.gather(*(_run_action(action) for action in batch), return_exceptions=True)
+            for result in batch_results:
+                if isinstance(result, Exception):
+                    raise result
+            results += batch_results
+        return results
 
     async def _get_quantity_from_signal_percent(self, order_description, side, symbol, reduce_only, update_amount):
         quantity_type, quantity = script_keywords.parse_quantity(
@@ -422,12 +508,26 @@ class RemoteTradingSignalsModeConsumer(trading_modes.AbstractTradingModeConsumer
         # create orders
         already_handled_order_ids = self.exchange_manager.exchange_personal_data.orders_manager\
             .get_all_active_and_pending_orders_id()
+        to_create_order_ids = []
+        order_actions = []
         for order_id, order_with_param in to_create_orders.items():
             if order_id in already_handled_order_ids:
                 self.logger.debug(f"Ignored order with order id {order_id}: order already handled")
                 continue
-            created_orders[order_id] = \
-                await self._create_order_on_exchange(order_with_param[0], params=order_with_param[1])
+            to_create_order_ids.append(order_id)
+            order_actions.append((
+                order_with_param[0],
+                functools.partial(self._create_order_on_exchange, order_with_param[0], params=order_with_param[1]),
+                True
+            ))
+        # each order quantity is already computed: orders can be created concurrently
+        created_orders.update(zip(to_create_order_ids, await self._run_order_actions(order_actions)))
+        if self.exchange_manager.is_backtesting:
+            self.trading_mode.producers[0].update_created_orders_slippage([
+                (order, order_description_by_id[order_id])
+                for order_id, order in created_orders.items()
+                if order is not None
+            ])
         # handle chained orders
         created_chained_orders_count = 0
         for order_description in orders_descriptions:
@@ -450,22 +550,40 @@ class RemoteTradingSignalsModeConsumer(trading_modes.AbstractTradingModeConsumer
 
     def get_open_order_from_description(self, order_descriptions, symbol):
         found_orders = []
+        # index open orders once for every description
+        open_orders_by_id = {}
+        open_orders_by_price = {}
+        for index, order in enumerate(
+            self.exchange_manager.exchange_personal_data.orders_manager.get_open_orders(symbol=symbol)
+        ):
+            open_orders_by_id.setdefault(order.order_id, []).append(order)
+            open_orders_by_price.setdefault(order.origin_price, []).append((index, order))
         for order_description in order_descriptions:
             # filter orders using order_id
             if accurate_orders := [
                 (order_description, order)
-                for order in self.exchange_manager.exchange_personal_data.orders_manager.get_open_orders(symbol=symbol)
-                if order.order_id == order_description[trading_enums.TradingSignalOrdersAttrs.ORDER_ID.value]
+                for order in open_orders_by_id.get(
+                    order_description[trading_enums.TradingSignalOrdersAttrs.ORDER_ID.value], []
+                )
             ]:
                 found_orders += accurate_orders
                 continue
             # 2nd chance: use order type and price as these are kept between bot restarts (loaded from exchange)
+            prices = {
+                order_description[trading_enums.TradingSignalOrdersAttrs.STOP_PRICE.value],
+                order_description[trading_enums.TradingSignalOrdersAttrs.LIMIT_PRICE.value],
+            }
             orders = [
                 (order_description, order)
-                for order in self.exchange_manager.exchange_personal_data.orders_manager.get_open_orders(symbol=symbol)
-                if (order.origin_price == order_description[trading_enums.TradingSignalOrdersAttrs.STOP_PRICE.value] or
-                    order.origin_price == order_description[trading_enums.TradingSignalOrdersAttrs.LIMIT_PRICE.value])
-                    and self._is_compatible_order_type(order, order_description)
+                for _, order in sorted(
+                    (
+                        indexed_order
+                        for price in prices
+                        for indexed_order in open_orders_by_price.get(price, [])
+                    ),
+                    key=lambda indexed_order: indexed_order[0]
+                )
+                if self._is_compatible_order_type(order, order_description)
             ]
             if orders:
                 found_orders += orders
@@ -571,10 +689,99 @@ class RemoteTradingSignalsModeConsumer(trading_modes.AbstractTradingModeConsumer
 
 class RemoteTradingSignalsModeProducer(trading_modes.AbstractTradingModeProducer):
 
+    def __init__(self, channel, config, trading_mode, exchange_manager):
+        super().__init__(channel, config, trading_mode, exchange_manager)
+        # (timestamp, signal) recorded signals to replay in backtesting, sorted by timestamp
+        self.recorded_signals = collections.deque()
+        # replayed signals statistics
+        self.replayed_signals_count = 0
+        self.total_delivery_delay = 0
+        self.compared_prices_count = 0
+        self.total_price_slippage_percent = trading_constants.ZERO
+
+    def on_reload_config(self):
+        """
+        Called at constructor and after the associated trading mode's reload_config.
+        Implement if necessary
+        """
+        self.signals_file = \
+            self.trading_mode.trading_config.get(RemoteTradingSignalsTradingMode.BACKTESTING_SIGNALS_FILE)
+        self.signals_delivery_delay = \
+            self.trading_mode.trading_config.get(RemoteTradingSignalsTradingMode.BACKTESTING_SIGNALS_DELIVERY_DELAY) \
+            or 0
+
+    async def inner_start(self) -> None:
+        if self.exchange_manager.is_backtesting and self.signals_file:
+            self.recorded_signals = collections.deque(self._load_recorded_signals(self.signals_file))
+            self.logger.info(f"Loaded {len(self.recorded_signals)} {self.trading_mode.symbol} signals to replay "
+                             f"from {self.signals_file}")
+        await super().inner_start()
+
+    def _load_recorded_signals(self, signals_file) -> list:
+        recorded_signals = []
+        for recorded_signal in json_util.read_file(signals_file):
+            signal = commons_signals.Signal(
+                recorded_signal[common_enums.SignalsAttrs.TOPIC.value],
+                recorded_signal[common_enums.SignalsAttrs.CONTENT.value],
+            )
+            if signal.content.get(trading_enums.TradingSignalOrdersAttrs.SYMBOL.value) == self.trading_mode.symbol:
+                recorded_signals.append((recorded_signal[RemoteTradingSignalsTradingMode.SIGNAL_TIMESTAMP], signal))
+        return sorted(recorded_signals, key=lambda timestamp_and_signal: timestamp_and_signal[0])
+
     def get_channels_registration(self):
+        if self.recorded_signals:
+            # replay recorded signals according to backtesting candles
+            return [self.TOPIC_TO_CHANNEL_NAME[common_enums.ActivationTopics.FULL_CANDLES.value]]
         # trading mode is waking up this producer directly from signal channel
         return []
 
+    async def ohlcv_callback(self, exchange: str, exchange_id: str, cryptocurrency: str, symbol: str,
+                             time_frame: str, candle: dict, init_call: bool = False):
+        current_time = self.exchange_manager.exchange.get_exchange_current_time()
+        while self.recorded_signals and \
+                self.recorded_signals[0][0] + self.signals_delivery_delay <= current_time:
+            signal_time, signal = self.recorded_signals.popleft()
+            # signals are replayed on candles: the effective delivery delay is rounded up to the next candle close
+            self._update_replay_statistics(current_time - signal_time)
+            await self.signal_callback(signal)
+
+    def _update_replay_statistics(self, delivery_delay):
+        self.replayed_signals_count += 1
+        self.total_delivery_delay += delivery_delay
+
+    def update_created_orders_slippage(self, created_orders_and_descriptions):
+        """
+        Compare the price of orders created from signals to the price of the signal provider
+        :param created_orders_and_descriptions: list of (created order, signal order description) tuples
+        """
+        for order, order_description in created_orders_and_descriptions:
+            provider_price = order_description.get(trading_enums.TradingSignalOrdersAttrs.CURRENT_PRICE.value)
+            # filled orders: use the fill price, open orders: use the market price when the order got created
+            follower_price = order.filled_price if order.is_filled() else order.created_last_price
+            if not provider_price or not follower_price:
+                continue
+            provider_price = decimal.Decimal(str(provider_price))
+            # positive slippage: follower price is worse than the signal provider one
+            slippage_percent = (follower_price - provider_price) * trading_constants.ONE_HUNDRED / provider_price
+            if order.side is trading_enums.TradeOrderSide.SELL:
+                slippage_percent = -slippage_percent
+            self.compared_prices_count += 1
+            self.total_price_slippage_percent += slippage_percent
+
+    def _log_statistics(self):
+        if not self.replayed_signals_count:
+            return
+        average_slippage = self.total_price_slippage_percent / self.compared_prices_count \
+            if self.compared_prices_count else trading_constants.ZERO
+        self.logger.info(
+            f"Replayed signals statistics on {self.exchange_name} for {self.trading_mode.symbol}: "
+            f"{self.replayed_signals_count} replayed signals, average delivery delay: "
+            f"{self.total_delivery_delay / self.replayed_signals_count:.2f} seconds (configured: "
+            f"{self.signals_delivery_delay} seconds, rounded up to candles closes), average follower price slippage "
+            f"compared to signal provider prices: {float(average_slippage):.4f}% "
+            f"(on {self.compared_prices_count} created orders, positive means worse than provider)."
+        )
+
     async def signal_callback(self, signal):
         exchange_type = signal.content[trading_enums.TradingSignalOrdersAttrs.EXCHANGE_TYPE.value]
         if exchange_type == exchanges.get_exchange_type(self.exchange_manager).value:
@@ -602,5 +809,7 @@ class RemoteTradingSignalsModeProducer(trading_modes.AbstractTradingModeProducer
 
     async def stop(self):
         if self.trading_mode is not None:
+            if self.exchange_manager.is_backtesting:
+                self._log_statistics()
             self.trading_mode.flush_trading_mode_consumers()
         await super().stop()
@@ -13,6 +13,7 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import asyncio
 import decimal
 import pytest
 import mock
@@ -162,7 +163,7 @@ async def test_handle_signal_orders_no_triggering_order(
 
 
 async def test_handle_signal_orders_reduce_quantity_create_order(local_trader, mocked_buy_market_signal):
-    _, consumer, trader = local_trader
+    producer, consumer, trader = local_trader
     symbol = mocked_buy_market_signal.content[
         trading_enums.TradingSignalOrdersAttrs.SYMBOL.value
     ]
@@ -182,6 +183,10 @@ async def test_handle_signal_orders_reduce_quantity_create_order(local_trader, m
     # can buy max 2, should buy 1.5, buy one because of config
     assert trades[0].origin_quantity == decimal.Decimal("1")
     assert trades[0].origin_price == decimal.Decimal("1000")
+    # bought at 1000 while the provider price was 1000.69: negative slippage
+    assert producer.compared_prices_count == 1
+    assert producer.total_price_slippage_percent == \
+        (decimal.Decimal("1000") - decimal.Decimal("1000.69")) * 100 / decimal.Decimal("1000.69")
 
 
 async def test_handle_signal_orders_reduce_quantity_edit_order(local_trader, mocked_buy_limit_signal):
@@ -388,6 +393,90 @@ async def test_handle_signal_create_orders_not_enough_total_funds_even_for_min_o
     assert exchange_manager.exchange_personal_data.orders_manager.get_open_orders() == []
 
 
+async def test_run_order_actions(local_trader):
+    _, consumer, _ = local_trader
+    consumer.MAX_CONCURRENT_ORDER_ACTIONS = 2
+    running = []
+    max_running = []
+    calls = []
+
+    def _action(name, error=None):
+        async def _run():
+            running.append(name)
+            max_running.append(len(running))
+            calls.append(name)
+            await asyncio.sleep(0)
+            running.remove(name)
+            if error:
+                raise error
+            return name
+        return _run
+
+    def _order(order_id):
+        return mock.Mock(order_id=order_id)
+
+    # independent actions: run concurrently up to MAX_CONCURRENT_ORDER_ACTIONS
+    assert await consumer._run_order_actions([
+        (_order(str(i)), _action(i), True)
+        for i in range(5)
+    ]) == [0, 1, 2, 3, 4]
+    assert max(max_running) == 2
+    max_running.clear()
+
+    # dependent actions and actions on the same order run alone
+    assert await consumer._run_order_actions([
+        (_order("1"), _action(1), True),
+        (_order("1"), _action(2), True),
+        (_order("2"), _action(3), False),
+        (_order("3"), _action(4), True),
+    ]) == [1, 2, 3, 4]
+    assert max(max_running) == 1
+    max_running.clear()
+    calls.clear()
+
+    # errors are raised once the actions batch is completed
+    with pytest.raises(errors.OrderCancelError):
+        await consumer._run_order_actions([
+            (_order("1"), _action(1, errors.OrderCancelError), True),
+            (_order("2"), _action(2), True),
+            (_order("3"), _action(3), False),
+        ])
+    assert calls == [1, 2]
+
+
+async def test_get_open_order_from_description(local_trader):
+    _, consumer, trader = local_trader
+    order_1 = mock.Mock(order_id="1", origin_price=decimal.Decimal("10"))
+    order_2 = mock.Mock(order_id="2", origin_price=decimal.Decimal("20"))
+    order_3 = mock.Mock(order_id="3", origin_price=decimal.Decimal("10"))
+
+    def _description(order_id, stop_price=None, limit_price=None):
+        return {
+            trading_enums.TradingSignalOrdersAttrs.ORDER_ID.value: order_id,
+            trading_enums.TradingSignalOrdersAttrs.STOP_PRICE.value: stop_price,
+            trading_enums.TradingSignalOrdersAttrs.LIMIT_PRICE.value: limit_price,
+        }
+
+    desc_1 = _description("1")
+    desc_2 = _description("unknown", limit_price=10)
+    desc_3 = _description("unknown", stop_price=20, limit_price=10)
+    desc_4 = _description("unknown", limit_price=30)
+    with mock.patch.object(
+        trader.exchange_manager.exchange_personal_data.orders_manager, "get_open_orders",
+        mock.Mock(return_value=[order_1, order_2, order_3])
+    ) as get_open_orders_mock, mock.patch.object(
+        consumer, "_is_compatible_order_type", mock.Mock(side_effect=lambda order, _: order is not order_3)
+    ):
+        assert consumer.get_open_order_from_description([desc_1, desc_2, desc_3, desc_4], "BTC/USDT") == [
+            (desc_1, order_1),
+            (desc_2, order_1),
+            (desc_3, order_1),
+            (desc_3, order_2),
+        ]
+        # open orders are fetched only once
+        get_open_orders_mock.assert_called_once_with(symbol="BTC/USDT")
+
+
 async def test_send_alert_notification(local_trader):
     _, consumer, _ = local_trader
     with mock.patch.object(services_api, "send_notification", mock.AsyncMock()) as send_notification_mock:
@@ -13,6 +13,8 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import decimal
+import json
 import pytest
 import mock
 
@@ -45,3 +47,75 @@ async def test_signal_callback(local_trader, mocked_bundle_stop_loss_in_sell_lim
         mocked_bundle_stop_loss_in_sell_limit_signal.content[trading_enums.TradingSignalOrdersAttrs.EXCHANGE_TYPE.value] = trading_enums.ExchangeTypes.MARGIN.value
         await producer.signal_callback(mocked_bundle_stop_loss_in_sell_limit_signal)
         submit_trading_evaluation_mock.assert_not_called()
+
+
+async def test_load_recorded_signals(local_trader, mocked_sell_limit_signal, tmp_path):
+    producer, _, _ = local_trader
+    other_symbol_signal = {
+        **mocked_sell_limit_signal.content, trading_enums.TradingSignalOrdersAttrs.SYMBOL.value: "ETH/USDT"
+    }
+    signals_file = tmp_path / "signals.json"
+    signals_file.write_text(json.dumps([
+        {"timestamp": 20, "topic": "moonmoon", "content": mocked_sell_limit_signal.content},
+        {"timestamp": 30, "topic": "moonmoon", "content": other_symbol_signal},
+        {"timestamp": 10, "topic": "moonmoon", "content": mocked_sell_limit_signal.content},
+    ]))
+    recorded_signals = producer._load_recorded_signals(str(signals_file))
+    # other symbols signals are ignored, signals are sorted by timestamp
+    assert [timestamp for timestamp, _ in recorded_signals] == [10, 20]
+    assert all(
+        signal.topic == "moonmoon" and signal.content == mocked_sell_limit_signal.content
+        for _, signal in recorded_signals
+    )
+
+
+async def test_ohlcv_callback(local_trader, mocked_sell_limit_signal):
+    producer, _, trader = local_trader
+    producer.signals_delivery_delay = 5
+    producer.recorded_signals.extend([(10, mocked_sell_limit_signal), (20, mocked_sell_limit_signal)])
+    candle = [0] * 6
+    with mock.patch.object(producer, "signal_callback", new=mock.AsyncMock()) as signal_callback_mock, \
+         mock.patch.object(trader.exchange_manager.exchange, "get_exchange_current_time",
+                           mock.Mock(return_value=14)):
+        # delivery delay not elapsed
+        await producer.ohlcv_callback("binance", "123", "BTC", "BTC/USDT:USDT", "1h", candle)
+        signal_callback_mock.assert_not_called()
+
+    with mock.patch.object(producer, "signal_callback", new=mock.AsyncMock()) as signal_callback_mock, \
+         mock.patch.object(trader.exchange_manager.exchange, "get_exchange_current_time",
+                           mock.Mock(return_value=30)):
+        await producer.ohlcv_callback("binance", "123", "BTC", "BTC/USDT:USDT", "1h", candle)
+        assert signal_callback_mock.call_count == 2
+        assert len(producer.recorded_signals) == 0
+        assert producer.replayed_signals_count == 2
+        assert producer.total_delivery_delay == 20 + 10
+        # prices are compared using created orders, not replay candles
+        assert producer.compared_prices_count == 0
+        assert producer.total_price_slippage_percent == trading_constants.ZERO
+
+
+async def test_update_created_orders_slippage(local_trader, mocked_sell_limit_signal):
+    producer, _, _ = local_trader
+    provider_price = decimal.Decimal(str(
+        mocked_sell_limit_signal.content[trading_enums.TradingSignalOrdersAttrs.CURRENT_PRICE.value]
+    ))
+    filled_buy_order = mock.Mock(
+        side=trading_enums.TradeOrderSide.BUY, is_filled=mock.Mock(return_value=True),
+        filled_price=provider_price + 10, created_last_price=provider_price
+    )
+    open_sell_order = mock.Mock(
+        side=trading_enums.TradeOrderSide.SELL, is_filled=mock.Mock(return_value=False),
+        filled_price=trading_constants.ZERO, created_last_price=provider_price + 100
+    )
+    no_price_description = {
+        **mocked_sell_limit_signal.content, trading_enums.TradingSignalOrdersAttrs.CURRENT_PRICE.value: None
+    }
+    producer.update_created_orders_slippage([
+        (filled_buy_order, mocked_sell_limit_signal.content),
+        (open_sell_order, mocked_sell_limit_signal.content),
+        (filled_buy_order, no_price_description),
+    ])
+    assert producer.compared_prices_count == 2
+    # bought 10 USDT above the provider price: positive slippage, sold 100 USDT above: negative slippage
+    assert producer.total_price_slippage_percent == \
+        decimal.Decimal("10") * 100 / provider_price + decimal.Decimal("-100") * 100 / provider_price
@@ -19,12 +19,12 @@ import dataclasses
 import math
 import asyncio
 import decimal
+import functools
 
 import async_channel.constants as channel_constants
 import octobot_commons.constants as commons_constants
 import octobot_commons.enums as commons_enums
 import octobot_commons.symbols.symbol_util as symbol_util
-import octobot_commons.data_util as data_util
 import octobot_trading.api as trading_api
 import octobot_trading.modes as trading_modes
 import octobot_trading.exchange_channel as exchanges_channel
@@ -35,6 +35,15 @@ import octobot_trading.errors as trading_errors
 import octobot_trading.exchanges.util as exchange_util
 
 
+@functools.lru_cache(maxsize=None)
+def _get_decimal_min_max_amounts(min_max_amounts):
+    # symbol markets limits rarely change: only convert them once
+    return tuple(
+        None if value is None else decimal.Decimal(str(value))
+        for value in min_max_amounts
+    )
+
+
 class StrategyModes(enum.Enum):
     NEUTRAL = "neutral"
     MOUNTAIN = "mountain"
@@ -48,6 +57,11 @@ class ForceResetOrdersException(Exception):
     pass
 
 
+class ReservedFundsException(trading_errors.MissingFunds):
+    # raised when funds are missing due to other orders being created at the same time
+    pass
+
+
 INCREASING = "increasing_towards_current_price"
 DECREASING = "decreasing_towards_current_price"
 STABLE = "stable_towards_current_price"
@@ -55,6 +69,10 @@ MULTIPLIER = "multiplier"
 
 ONE_PERCENT_DECIMAL = decimal.Decimal("1.01")
 TEN_PERCENT_DECIMAL = decimal.Decimal("1.1")
+LAST_ORDER_QUANTITY_RATIO_DECIMAL = decimal.Decimal("0.999")
+MISSING_ORDERS_AROUND_SPREAD_THRESHOLD = decimal.Decimal("0.5")
+MISSING_ORDERS_COUNT_ERROR_THRESHOLD = decimal.Decimal("2.5")
+MISSING_ORDERS_COUNT_THRESHOLD = decimal.Decimal("1.5")
 
 StrategyModeMultipliersDetails = {
     StrategyModes.FLAT: {
@@ -122,12 +140,18 @@ class StaggeredOrdersTradingMode(trading_modes.AbstractTradingMode):
     CONFIG_IGNORE_EXCHANGE_FEES = "ignore_exchange_fees"
     ENABLE_UPWARDS_PRICE_FOLLOW = "enable_upwards_price_follow"
     CONFIG_USE_FIXED_VOLUMES_FOR_MIRROR_ORDERS = "use_fixed_volume_for_mirror_orders"
+    CONFIG_MAX_CONCURRENT_ORDERS_CREATION = "max_concurrent_orders_creation"
     CONFIG_DEFAULT_SPREAD_PERCENT = 1.5
+    CONFIG_DEFAULT_MAX_CONCURRENT_ORDERS_CREATION = 10
     CONFIG_DEFAULT_INCREMENT_PERCENT = 0.5
     REQUIRE_TRADES_HISTORY = True   # set True when this trading mode needs the trade history to operate
     SUPPORTS_INITIAL_PORTFOLIO_OPTIMIZATION = True  # set True when self._optimize_initial_portfolio is implemented
     SUPPORTS_HEALTH_CHECK = False   # set True when self.health_check is implemented
 
+    def __init__(self, config, exchange_manager):
+        super().__init__(config, exchange_manager)
+        self.order_consumer = None
+
     def init_user_inputs(self, inputs: dict) -> None:
         """
         Called right before starting the tentacle, should define all the tentacle's user inputs unless
@@ -206,6 +230,17 @@ class StaggeredOrdersTradingMode(trading_modes.AbstractTradingMode):
                   "This mode allows staggered orders to operate on user created orders. "
                   "Can't work on trading simulator.",
         )
+        self.UI.user_input(
+            self.CONFIG_MAX_CONCURRENT_ORDERS_CREATION, commons_enums.UserInputTypes.INT,
+            self.CONFIG_DEFAULT_MAX_CONCURRENT_ORDERS_CREATION, inputs,
+            min_val=1,
+            title="Max concurrent orders creation: maximum number of orders being created on the exchange at the "
+                  "same time when creating the grid.",
+        )
+
+    def get_max_concurrent_orders_creation(self) -> int:
+        return self.trading_config.get(self.CONFIG_MAX_CONCURRENT_ORDERS_CREATION,
+                                       self.CONFIG_DEFAULT_MAX_CONCURRENT_ORDERS_CREATION)
 
     def get_current_state(self) -> (str, float):
         order = self.exchange_manager.exchange_personal_data.orders_manager.get_open_orders(self.symbol)
@@ -228,12 +263,12 @@ class StaggeredOrdersTradingMode(trading_modes.AbstractTradingMode):
     async def create_consumers(self) -> list:
         consumers = await super().create_consumers()
         # order consumer: filter by symbol not be triggered only on this symbol's orders
-        order_consumer = await exchanges_channel.get_chan(trading_personal_data.OrdersChannel.get_name(),
-                                                          self.exchange_manager.id).new_consumer(
+        self.order_consumer = await exchanges_channel.get_chan(trading_personal_data.OrdersChannel.get_name(),
+                                                               self.exchange_manager.id).new_consumer(
             self._order_notification_callback,
             symbol=self.symbol if self.symbol else channel_constants.CHANNEL_WILDCARD
         )
-        return consumers + [order_consumer]
+        return consumers + [self.order_consumer]
 
     async def _order_notification_callback(self, exchange, exchange_id, cryptocurrency, symbol, order,
                                            update_type, is_from_bot):
@@ -246,6 +281,7 @@ class StaggeredOrdersTradingMode(trading_modes.AbstractTradingMode):
         ):
             async with self.producers[0].get_lock():
                 await self.producers[0].order_filled_callback(order)
+        await self.producers[0].create_notified_fills_mirror_orders()
 
     @classmethod
     def get_is_symbol_wildcard(cls) -> bool:
@@ -385,6 +421,7 @@ class StaggeredOrdersTradingMode(trading_modes.AbstractTradingMode):
 
 class StaggeredOrdersTradingModeConsumer(trading_modes.AbstractTradingModeConsumer):
     ORDER_DATA_KEY = "order_data"
+    ORDERS_DATA_KEY = "orders_data"
     CURRENT_PRICE_KEY = "current_price"
     SYMBOL_MARKET_KEY = "symbol_market"
 
@@ -406,19 +443,100 @@ class StaggeredOrdersTradingModeConsumer(trading_modes.AbstractTradingModeConsum
         # use dict default getter: can't afford missing data
         data = kwargs["data"]
         if not self.skip_orders_creation:
-            order_data = data[self.ORDER_DATA_KEY]
             current_price = data[self.CURRENT_PRICE_KEY]
             symbol_market = data[self.SYMBOL_MARKET_KEY]
+            if self.ORDERS_DATA_KEY in data:
+                return await self.create_orders(data[self.ORDERS_DATA_KEY], current_price, symbol_market)
+            order_data = data[self.ORDER_DATA_KEY]
             return await self.create_order(order_data, current_price, symbol_market)
         else:
-            self.logger.info(f"Skipped {data.get(self.ORDER_DATA_KEY, '')}")
+            self.logger.info(f"Skipped {data.get(self.ORDERS_DATA_KEY, data.get(self.ORDER_DATA_KEY, ''))}")
 
-    async def create_order(self, order_data, current_price, symbol_market):
+    async def create_orders(self, orders_data, current_price, symbol_market):
+        """
+        Create orders concurrently, at most trading_mode.get_max_concurrent_orders_creation() at the same time.
+        Orders skipped because of funds reserved by other orders being created are then created again one by one,
+        using the up-to-date portfolio. Other failed orders are not retried as they might have been created on the
+        exchange: missing orders are created by the next health check. Created orders are returned in the
+        orders_data order.
+        """
+        semaphore = asyncio.Semaphore(self.trading_mode.get_max_concurrent_orders_creation())
+        # funds of the orders being created and not yet registered: {order_id: (currency, amount)}
+        reserved_funds = {}
+
+        async def _create_order(order_data):
+            async with semaphore:
+                if self.skip_orders_creation:
+                    self.logger.info(f"Skipped {order_data}")
+                    return []
+                return await self.create_order(order_data, current_price, symbol_market, reserved_funds=reserved_funds)
+
+        created_orders_by_index = await asyncio.gather(
+            *(_create_order(order_data) for order_data in orders_data), return_exceptions=True
+        )
+        reserved_funds_orders_indexes = []
+        for index, (order_data, result) in enumerate(zip(orders_data, created_orders_by_index)):
+            if isinstance(result, ReservedFundsException):
+                reserved_funds_orders_indexes.append(index)
+            elif not isinstance(result, list):
+                if isinstance(result, BaseException):
+                    self.logger.error(f"Failed to create order: {result} ({result.__class__.__name__}). "
+                                      f"Order: {order_data}")
+                created_orders_by_index[index] = []
+        if reserved_funds_orders_indexes:
+            retried_orders = await self._create_reserved_funds_orders(
+                [orders_data[index] for index in reserved_funds_orders_indexes], current_price, symbol_market
+            )
+            for index, created_orders in zip(reserved_funds_orders_indexes, retried_orders):
+                created_orders_by_index[index] = created_orders
+        return [
+            created_order
+            for created_orders in created_orders_by_index
+            for created_order in created_orders
+        ]
+
+    async def _create_reserved_funds_orders(self, orders_data, current_price, symbol_market):
+        """
+        :return: the created orders of each orders_data element
+        """
+        self.logger.info(f"Creating {len(orders_data)} {self.trading_mode.symbol} orders skipped because of "
+                         f"concurrently created orders")
+        created_orders = []
+        for order_data in orders_data:
+            if self.skip_orders_creation:
+                self.logger.info(f"Skipped {order_data}")
+                created_orders.append([])
+                continue
+            try:
+                created_orders.append(await self.create_order(order_data, current_price, symbol_market) or [])
+            except trading_errors.MissingFunds as e:
+                self.logger.error(f"Failed to create order: {e} ({e.__class__.__name__}). Order: {order_data}")
+                created_orders.append([])
+        return created_orders
+
+    def _get_reserved_funds(self, reserved_funds, currency):
+        orders_manager = self.exchange_manager.exchange_personal_data.orders_manager
+        for order_id in list(reserved_funds):
+            if orders_manager.has_order(order_id):
+                # registered order: its funds are now locked in portfolio
+                reserved_funds.pop(order_id)
+        return sum(
+            (amount for reserved_currency, amount in reserved_funds.values() if reserved_currency == currency),
+            trading_constants.ZERO
+        )
+
+    async def create_order(self, order_data, current_price, symbol_market, reserved_funds=None):
         created_order = None
         currency, market = symbol_util.parse_symbol(order_data.symbol).base_and_quote()
+        # when creating orders concurrently, missing funds can be due to other orders being created: raise
+        # to create the order again once the other ones are created
+        is_concurrent_creation = reserved_funds is not None
+        reserved_funds = {} if reserved_funds is None else reserved_funds
         try:
-            base_available = trading_api.get_portfolio_currency(self.exchange_manager, currency).available
-            quote_available = trading_api.get_portfolio_currency(self.exchange_manager, market).available
+            base_available = trading_api.get_portfolio_currency(self.exchange_manager, currency).available - \
+                self._get_reserved_funds(reserved_funds, currency)
+            quote_available = trading_api.get_portfolio_currency(self.exchange_manager, market).available - \
+                self._get_reserved_funds(reserved_funds, market)
             selling = order_data.side == trading_enums.TradeOrderSide.SELL
             quantity = trading_personal_data.decimal_adapt_order_quantity_because_fees(
                 self.exchange_manager, order_data.symbol,
@@ -431,21 +549,21 @@ class StaggeredOrdersTradingModeConsumer(trading_modes.AbstractTradingModeConsum
                     quantity,
                     order_data.price,
                     symbol_market):
+                missing_funds_message = None
                 if selling:
                     if base_available < order_quantity:
-                        self.logger.warning(
-                            f"Skipping {order_data.symbol} {order_data.side.value} "
-                            f"[{self.exchange_manager.exchange_name}] order creation of "
-                            f"{order_quantity} at {float(order_price)}: "
+                        missing_funds_message = \
                             f"not enough {currency}: available: {base_available}, required: {order_quantity}"
-                        )
-                        return []
                 elif quote_available < order_quantity * order_price:
+                    missing_funds_message = f"not enough {market}: available: {quote_available}, " \
+                                            f"required: {order_quantity * order_price}"
+                if missing_funds_message is not None:
+                    if is_concurrent_creation and created_order is None:
+                        raise ReservedFundsException(missing_funds_message)
                     self.logger.warning(
                         f"Skipping {order_data.symbol} {order_data.side.value} "
                         f"[{self.exchange_manager.exchange_name}] order creation of "
-                        f"{order_quantity} at {float(order_price)}: "
-                        f"not enough {market}: available: {quote_available}, required: {order_quantity * order_price}"
+                        f"{order_quantity} at {float(order_price)}: {missing_funds_message}"
                     )
                     return []
                 order_type = trading_enums.TraderOrderType.SELL_LIMIT if selling \
@@ -461,7 +579,15 @@ class StaggeredOrdersTradingModeConsumer(trading_modes.AbstractTradingModeConsum
                 )
                 # disable instant fill to avoid looping order fill in simulator
                 current_order.allow_instant_fill = False
-                created_order = await self.trading_mode.create_order(current_order)
+                reserved_funds[current_order.order_id] = (
+                    currency if selling else market,
+                    order_quantity if selling else order_quantity * order_price
+                )
+                try:
+                    created_order = await self.trading_mode.create_order(current_order)
+                finally:
+                    # released as soon as the order is registered, otherwise once creation is over
+                    reserved_funds.pop(current_order.order_id, None)
             if not created_order:
                 self.logger.warning(
                     f"No order created for {order_data} (quantity: {quantity}): "
@@ -489,6 +615,8 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
     max_price = "max_price"
     PRICE_FETCHING_TIMEOUT = 60
     MISSING_MIRROR_ORDERS_MARKET_REBALANCE_TIMEOUT = 60
+    # mirror orders due within this delay are created together
+    MIRROR_ORDERS_COALESCING_WINDOW = 0.1
     # health check once every 3 days
     HEALTH_CHECK_INTERVAL_SECS = commons_constants.DAYS_TO_SECONDS * 3
     # recent filled allowed time delay to consider as pending order_filled callback
@@ -521,6 +649,8 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
         self.scheduled_health_check = None
         self.sell_volume_per_order = self.buy_volume_per_order = self.starting_price = trading_constants.ZERO
         self.mirror_orders_tasks = []
+        # [(mirror order, filled price, creation time)] waiting for the next mirror orders creation
+        self.pending_mirror_orders = []
         self.mirroring_pause_task = None
         self.allow_order_funds_redispatch = False
         self._expect_missing_orders = False
@@ -720,7 +850,8 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
         await self.create_state(self._get_new_state_price(), ignore_mirror_orders_only, ignore_available_funds)
 
     def _get_new_state_price(self):
-        return decimal.Decimal(str(self.current_price if self.starting_price == 0 else self.starting_price))
+        price = self.current_price if self.starting_price == 0 else self.starting_price
+        return price if isinstance(price, decimal.Decimal) else decimal.Decimal(str(price))
 
     async def create_state(self, current_price, ignore_mirror_orders_only, ignore_available_funds):
         if current_price is not None:
@@ -761,15 +892,20 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
         volume = self._compute_mirror_order_volume(now_selling, filled_price, price, filled_volume, fee)
         new_order = OrderData(new_side, volume, price, self.symbol, False, associated_entry_id)
         self.logger.debug(f"Creating mirror order: {new_order} after filled order: {filled_order}")
-        if self.mirror_order_delay == 0 or trading_api.get_is_backtesting(self.exchange_manager):
-            await self._lock_portfolio_and_create_order_when_possible(new_order, filled_price)
+        if trading_api.get_is_backtesting(self.exchange_manager):
+            # backtesting time is not the event loop time: mirror orders of the fills notified together are
+            # created together, once these fills are processed (see create_notified_fills_mirror_orders)
+            self.pending_mirror_orders.append((new_order, filled_price, 0))
         else:
-            # create order after waiting time
-            self.mirror_orders_tasks.append(asyncio.get_event_loop().call_later(
-                self.mirror_order_delay,
-                asyncio.create_task,
-                self._lock_portfolio_and_create_order_when_possible(new_order, filled_price)
-            ))
+            # create order after waiting time: mirror orders due within MIRROR_ORDERS_COALESCING_WINDOW
+            # after this one will be created at the same time
+            self.pending_mirror_orders.append(
+                (new_order, filled_price, asyncio.get_event_loop().time() + self.mirror_order_delay)
+            )
+            self.mirror_orders_tasks = [task for task in self.mirror_orders_tasks if not task.done()]
+            self.mirror_orders_tasks.append(asyncio.create_task(self._create_pending_mirror_orders_after(
+                self.mirror_order_delay + self.MIRROR_ORDERS_COALESCING_WINDOW
+            )))
 
     def _compute_mirror_order_volume(self, now_selling, filled_price, target_price, filled_volume, paid_fees: dict):
         # use target volumes if set
@@ -801,10 +937,57 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
             fees_in_base = new_order_quantity * self.max_fees
         return new_order_quantity - fees_in_base
 
-    async def _lock_portfolio_and_create_order_when_possible(self, new_order, filled_price):
+    async def create_notified_fills_mirror_orders(self):
+        """
+        In backtesting, create pending mirror orders once every notified order update has been processed
+        """
+        if self.pending_mirror_orders and trading_api.get_is_backtesting(self.exchange_manager) \
+                and not self._has_pending_order_notifications():
+            await self._create_pending_mirror_orders()
+
+    def _has_pending_order_notifications(self) -> bool:
+        order_consumer = self.trading_mode.order_consumer
+        return order_consumer is not None and not order_consumer.queue.empty()
+
+    async def _create_pending_mirror_orders_after(self, delay):
+        await asyncio.sleep(delay)
+        await self._create_pending_mirror_orders()
+
+    async def _create_pending_mirror_orders(self):
+        # wait for mirroring pauses before locking not to block orders refresh and health checks
         await asyncio.wait_for(self.allowed_mirror_orders.wait(), timeout=None)
+        # don't create mirror orders while orders are being refreshed
+        async with self.get_lock():
+            await self._lock_portfolio_and_create_pending_mirror_orders()
+
+    async def _lock_portfolio_and_create_pending_mirror_orders(self):
         async with self.exchange_manager.exchange_personal_data.portfolio_manager.portfolio.lock:
-            await self._create_order(new_order, filled_price)
+            # only create mirror orders which waited for their delay
+            now = asyncio.get_event_loop().time()
+            to_create_mirror_orders = [
+                pending_mirror_order
+                for pending_mirror_order in self.pending_mirror_orders
+                if pending_mirror_order[2] <= now
+            ]
+            if not to_create_mirror_orders:
+                return
+            self.pending_mirror_orders = [
+                pending_mirror_order
+                for pending_mirror_order in self.pending_mirror_orders
+                if pending_mirror_order[2] > now
+            ]
+            if len(to_create_mirror_orders) > 1:
+                self.logger.info(f"Creating {len(to_create_mirror_orders)} {self.symbol} mirror orders at once")
+            for side in dict.fromkeys(new_order.side for new_order, _, _ in to_create_mirror_orders):
+                side_mirror_orders = [
+                    (new_order, filled_price)
+                    for new_order, filled_price, _ in to_create_mirror_orders
+                    if new_order.side is side
+                ]
+                # use the most recent filled price of this side mirrored orders as current price
+                await self._create_orders_batch(
+                    [new_order for new_order, _ in side_mirror_orders], side_mirror_orders[-1][1], side
+                )
 
     async def _handle_staggered_orders(self, current_price, ignore_mirror_orders_only, ignore_available_funds):
         self._ensure_current_price_in_limit_parameters(current_price)
@@ -1246,14 +1429,13 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
                         else:
                             previous_o = o
                     if following_o is None or previous_o.side == following_o.side:
-                        decimal_missing_order_price = decimal.Decimal(str(missing_order_price))
                         # missing order between similar orders
                         quantity = self._get_surrounded_missing_order_quantity(
-                            previous_o, following_o, max_quant_per_order, decimal_missing_order_price, recent_trades,
+                            previous_o, following_o, max_quant_per_order, missing_order_price, recent_trades,
                             current_price, sorted_orders
                         )
                         orders.append(OrderData(missing_order_side, quantity,
-                                                decimal_missing_order_price, self.symbol, False))
+                                                missing_order_price, self.symbol, False))
                         self.logger.debug(f"Creating missing orders not around spread: {orders[-1]} "
                                           f"for {self.symbol}")
                     else:
@@ -1266,8 +1448,6 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
                 order_limiting_currency_available_amount = trading_api.get_portfolio_currency(
                     self.exchange_manager, order_limiting_currency
                 ).available
-                decimal_order_limiting_currency_available_amount = decimal.Decimal(
-                    str(order_limiting_currency_available_amount))
                 portfolio_total = trading_api.get_portfolio_currency(self.exchange_manager,
                                                                      order_limiting_currency).total
                 order_limiting_currency_amount = portfolio_total
@@ -1294,16 +1474,15 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
                                 order_quantity = self._get_spread_missing_order_quantity(
                                     average_order_quantity, side, i, orders_count, price, selling,
                                     limiting_amount_from_this_order,
-                                    decimal_order_limiting_currency_available_amount, recent_trades, sorted_orders,
+                                    order_limiting_currency_available_amount, recent_trades, sorted_orders,
                                     current_price
                                 )
                                 if price is not None and limiting_amount_from_this_order > 0 and \
                                         price - increment_window <= missing_order_price <= price + increment_window:
                                     found_order = True
                                     if order_quantity is not None:
-                                        orders.append(OrderData(side, decimal.Decimal(str(order_quantity)),
-                                                                decimal.Decimal(str(missing_order_price)), self.symbol,
-                                                                False))
+                                        orders.append(OrderData(side, order_quantity, missing_order_price,
+                                                                self.symbol, False))
                                         added_missing_order = True
                                         self.logger.debug(f"Creating missing order around spread {orders[-1]} "
                                                           f"for {self.symbol}")
@@ -1337,14 +1516,10 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
         quantity_from_trades = self._get_quantity_from_recent_trades(
             order_price, max_quant_per_order, recent_trades, current_price, selling
         )
-        return quantity_from_trades or \
-            decimal.Decimal(str(
-                min(
-                    data_util.mean([previous_order.origin_quantity, following_order.origin_quantity])
-                    if following_order else previous_order.origin_quantity,
-                    max_quant_per_order / order_price
-                )
-            )
+        return quantity_from_trades or min(
+            (previous_order.origin_quantity + following_order.origin_quantity) / 2
+            if following_order else previous_order.origin_quantity,
+            max_quant_per_order / order_price
         )
 
     def _get_spread_missing_order_quantity(
@@ -1558,7 +1733,7 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
                                     inferred_spread = self.flat_spread or self.spread * increment / self.increment
                                     missing_orders_count = (delta_spread - inferred_spread) / increment
                                     # should be 0 when no order is missing
-                                    if float(missing_orders_count) > 0.5:
+                                    if missing_orders_count > MISSING_ORDERS_AROUND_SPREAD_THRESHOLD:
                                         # missing orders around spread point: symmetrical orders were not created when
                                         # orders were filled => re-create them
                                         next_missing_order_price = previous_order.origin_price + increment
@@ -1612,14 +1787,15 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
                         delta_increment = order.origin_price - previous_order.origin_price
                         # skip not-yet-updated orders
                         if previous_order.side == order.side:
-                            missing_orders_count = float(delta_increment / increment)
-                            if missing_orders_count > 2.5 and not self._expect_missing_orders:
+                            missing_orders_count = delta_increment / increment
+                            if missing_orders_count > MISSING_ORDERS_COUNT_ERROR_THRESHOLD \
+                                    and not self._expect_missing_orders:
                                 self.logger.warning(f"Error when analyzing orders for {self.symbol}: "
                                                     f"missing_orders_count > 2.5.")
                                 if not self._is_just_closed_order(previous_order.origin_price + increment,
                                                                   recently_closed_trades):
                                     return None, self.ERROR, None
-                            elif missing_orders_count > 1.5:
+                            elif missing_orders_count > MISSING_ORDERS_COUNT_THRESHOLD:
                                 if len(sorted_orders) < self.operational_depth and \
                                    (not self._skip_order_restore_on_recently_closed_orders or (
                                        self._skip_order_restore_on_recently_closed_orders and not recently_closed_trades
@@ -1641,8 +1817,8 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
                 else:
                     start_price = lower_bound
                     end_price = sorted_orders[0].origin_price
-                missing_orders_count = float((end_price - start_price) / increment)
-                if missing_orders_count > 1.5:
+                missing_orders_count = (end_price - start_price) / increment
+                if missing_orders_count > MISSING_ORDERS_COUNT_THRESHOLD:
                     last_order_price = sorted_orders[-1 if only_buy else 0].origin_price
                     order_price = last_order_price + increment if only_buy else last_order_price - increment
                     lowest_sell = lower_bound + self.flat_spread - self.flat_increment
@@ -1765,8 +1941,8 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
             return self._get_orders_count_from_fixed_volume(selling, current_price, holdings, orders_count)
 
     def _use_variable_orders_volume(self, side):
-        return (self.sell_volume_per_order == decimal.Decimal(0) and side is trading_enums.TradeOrderSide.SELL) \
-               or self.buy_volume_per_order == decimal.Decimal(0)
+        return (self.sell_volume_per_order == trading_constants.ZERO and side is trading_enums.TradeOrderSide.SELL) \
+               or self.buy_volume_per_order == trading_constants.ZERO
 
     def _get_orders_count_from_fixed_volume(self, selling, current_price, holdings, orders_count):
         volume_in_currency = self.sell_volume_per_order if selling else current_price * self.buy_volume_per_order
@@ -1788,7 +1964,7 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
                 and self.min_max_order_details[self.min_cost] is not None:
             min_quantity = max(self.min_max_order_details[self.min_quantity],
                                self.min_max_order_details[self.min_cost] / current_price)
-            min_quantity = min_quantity * decimal.Decimal(TEN_PERCENT_DECIMAL)    # increase min quantity by 10% to be sure to be
+            min_quantity = min_quantity * TEN_PERCENT_DECIMAL    # increase min quantity by 10% to be sure to be
             # able to create orders in minimal funds conditions
             adapted_min_order_quantity = trading_personal_data.decimal_adapt_quantity(
                 self.symbol_market, min_order_quantity
@@ -1837,7 +2013,7 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
 
     def _get_quantity_from_iteration(self, average_order_quantity, mode, side,
                                      iteration, max_iteration, price, starting_bound):
-        multiplier_price_ratio = 1
+        multiplier_price_ratio = trading_constants.ONE
         min_quantity, max_quantity = self._get_min_max_quantity(average_order_quantity, mode)
         delta = max_quantity - min_quantity
         if max_iteration == 1:
@@ -1846,25 +2022,24 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
         else:
             if iteration >= max_iteration:
                 raise trading_errors.NotSupported
-            iterations_progress = iteration / (max_iteration - 1)
+            iterations_progress = decimal.Decimal(iteration) / (max_iteration - 1)
             if StrategyModeMultipliersDetails[mode][side] == INCREASING:
-                multiplier_price_ratio = 1 - iterations_progress
+                multiplier_price_ratio = trading_constants.ONE - iterations_progress
             elif StrategyModeMultipliersDetails[mode][side] == DECREASING:
                 multiplier_price_ratio = iterations_progress
             elif StrategyModeMultipliersDetails[mode][side] == STABLE:
-                multiplier_price_ratio = 0
+                multiplier_price_ratio = trading_constants.ZERO
             if price <= 0:
                 return None
-            quantity = (min_quantity +
-                                   (decimal.Decimal(str(delta)) * decimal.Decimal(str(multiplier_price_ratio))))
+            quantity = min_quantity + delta * multiplier_price_ratio
             # when self.quote_volume_per_order is set, keep the same volume everywhere
             scaled_quantity = quantity * (starting_bound / price if self._use_variable_orders_volume(side)
                                           else trading_constants.ONE)
 
         # reduce last order quantity to avoid python float representation issues
         if iteration == max_iteration - 1 and self._use_variable_orders_volume(side):
-            scaled_quantity = scaled_quantity * decimal.Decimal("0.999")
-            quantity = quantity * decimal.Decimal("0.999")
+            scaled_quantity = scaled_quantity * LAST_ORDER_QUANTITY_RATIO_DECIMAL
+            quantity = quantity * LAST_ORDER_QUANTITY_RATIO_DECIMAL
         if self._is_valid_order_quantity_for_exchange(scaled_quantity, price):
             return scaled_quantity
         if self._is_valid_order_quantity_for_exchange(quantity, price):
@@ -1905,13 +2080,13 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
         max_quantity = average_order_quantity * (1 + mode_multiplier / 2)
         return min_quantity, max_quantity
 
-    async def _create_order(self, order, current_price):
+    async def _create_orders_batch(self, orders, current_price, side):
         data = {
-            StaggeredOrdersTradingModeConsumer.ORDER_DATA_KEY: order,
+            StaggeredOrdersTradingModeConsumer.ORDERS_DATA_KEY: orders,
             StaggeredOrdersTradingModeConsumer.CURRENT_PRICE_KEY: current_price,
             StaggeredOrdersTradingModeConsumer.SYMBOL_MARKET_KEY: self.symbol_market,
         }
-        state = trading_enums.EvaluatorStates.LONG if order.side is trading_enums.TradeOrderSide.BUY else trading_enums.EvaluatorStates.SHORT
+        state = trading_enums.EvaluatorStates.LONG if side is trading_enums.TradeOrderSide.BUY else trading_enums.EvaluatorStates.SHORT
         await self.submit_trading_evaluation(cryptocurrency=self.trading_mode.cryptocurrency,
                                              symbol=self.trading_mode.symbol,
                                              time_frame=None,
@@ -1919,8 +2094,12 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
                                              data=data)
 
     async def _create_not_virtual_orders(self, orders_to_create, current_price):
+        # orders of each side are created concurrently by the consumer, keep orders_to_create sides order
+        for side in dict.fromkeys(order.side for order in orders_to_create):
+            await self._create_orders_batch(
+                [order for order in orders_to_create if order.side is side], current_price, side
+            )
         for order in orders_to_create:
-            await self._create_order(order, current_price)
             base, quote = symbol_util.parse_symbol(order.symbol).base_and_quote()
             # keep track of the required funds
             volume = order.quantity if order.side is trading_enums.TradeOrderSide.SELL \
@@ -1930,19 +2109,13 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
 
     def _refresh_symbol_data(self, symbol_market):
         min_quantity, max_quantity, min_cost, max_cost, min_price, max_price = \
-            trading_personal_data.get_min_max_amounts(symbol_market)
-        self.min_max_order_details[self.min_quantity] = None if min_quantity is None \
-            else decimal.Decimal(str(min_quantity))
-        self.min_max_order_details[self.max_quantity] = None if max_quantity is None \
-            else decimal.Decimal(str(max_quantity))
-        self.min_max_order_details[self.min_cost] = None if min_cost is None \
-            else decimal.Decimal(str(min_cost))
-        self.min_max_order_details[self.max_cost] = None if max_cost is None \
-            else decimal.Decimal(str(max_cost))
-        self.min_max_order_details[self.min_price] = None if min_price is None \
-            else decimal.Decimal(str(min_price))
-        self.min_max_order_details[self.max_price] = None if max_price is None \
-            else decimal.Decimal(str(max_price))
+            _get_decimal_min_max_amounts(trading_personal_data.get_min_max_amounts(symbol_market))
+        self.min_max_order_details[self.min_quantity] = min_quantity
+        self.min_max_order_details[self.max_quantity] = max_quantity
+        self.min_max_order_details[self.min_cost] = min_cost
+        self.min_max_order_details[self.max_cost] = max_cost
+        self.min_max_order_details[self.min_price] = min_price
+        self.min_max_order_details[self.max_price] = max_price
 
     @classmethod
     def get_should_cancel_loaded_orders(cls):
@@ -37,6 +37,7 @@ import octobot_trading.enums as trading_enums
 import octobot_trading.exchanges as exchanges
 import octobot_trading.personal_data as trading_personal_data
 import octobot_trading.constants as trading_constants
+import octobot_trading.errors as trading_errors
 import octobot_trading.modes
 
 import tentacles.Trading.Mode.staggered_orders_trading_mode.staggered_orders_trading as staggered_orders_trading
@@ -491,7 +492,7 @@ async def test_use_existing_orders_only():
         producer.use_existing_orders_only = True
         assert producer.flat_increment is None
         assert producer.flat_spread is None
-        with mock.patch.object(producer, '_create_order', new=mock.AsyncMock()) as mocked_producer_create_order:
+        with mock.patch.object(producer, '_create_orders_batch', new=mock.AsyncMock()) as mocked_producer_create_order:
             trading_api.force_set_mark_price(exchange_manager, symbol, 4000)
             await producer._ensure_staggered_orders()
             # price info: create trades
@@ -1133,20 +1134,200 @@ async def test_order_fill_callback_with_mirror_delay():
         assert len(open_orders) == producer.operational_depth
 
         # closest to centre buy order is filled => bought btc
+        producer.allowed_mirror_orders.set()
         producer.mirror_order_delay = 0.1
         to_fill_order = open_orders[-2]
         in_backtesting = "tentacles.Trading.Mode.staggered_orders_trading_mode.staggered_orders_trading.trading_api.get_is_backtesting"
         with mock.patch(in_backtesting, return_value=False), \
-             mock.patch.object(producer, "_create_order") as producer_create_order_mock:
+             mock.patch.object(producer, "_create_orders_batch") as producer_create_order_mock:
             await _fill_order(to_fill_order, exchange_manager, producer=producer)
             assert len(producer.mirror_orders_tasks)
             producer_create_order_mock.assert_not_called()
             await asyncio.sleep(0.05)
             producer_create_order_mock.assert_not_called()
-            await asyncio.sleep(0.1)
+            await asyncio.wait_for(producer.mirror_orders_tasks[-1], 1)
             producer_create_order_mock.assert_called_once()
 
 
+async def test_order_fill_callback_without_mirror_delay():
+    async with _get_tools("BTC/USD", fees=0) as tools:
+        producer, _, exchange_manager = tools
+        # create orders
+        price = 100
+        producer.mode = staggered_orders_trading.StrategyModes.NEUTRAL
+        trading_api.force_set_mark_price(exchange_manager, producer.symbol, price)
+
+        await producer._ensure_staggered_orders()
+        await asyncio.create_task(_wait_for_orders_creation(producer.operational_depth))
+
+        open_orders = trading_api.get_open_orders(exchange_manager)
+        producer.allowed_mirror_orders.set()
+        to_fill_orders = sorted(
+            (order for order in open_orders if order.side is trading_enums.TradeOrderSide.BUY),
+            key=lambda order: order.origin_price
+        )[-2:]
+        in_backtesting = "tentacles.Trading.Mode.staggered_orders_trading_mode.staggered_orders_trading.trading_api.get_is_backtesting"
+        with mock.patch(in_backtesting, return_value=False), \
+             mock.patch.object(producer, "_create_orders_batch", mock.AsyncMock()) as create_orders_batch_mock:
+            for to_fill_order in to_fill_orders:
+                await _fill_order(to_fill_order, exchange_manager, producer=producer)
+            # no delay: mirror orders are created after the coalescing window, using the last filled price
+            assert len(producer.pending_mirror_orders) == 2
+            create_orders_batch_mock.assert_not_called()
+            await asyncio.wait_for(asyncio.gather(*producer.mirror_orders_tasks), 1)
+            assert producer.pending_mirror_orders == []
+            create_orders_batch_mock.assert_awaited_once()
+            assert [order.associated_entry_id for order in create_orders_batch_mock.mock_calls[0].args[0]] == \
+                [order.order_id for order in to_fill_orders]
+            assert create_orders_batch_mock.mock_calls[0].args[1] == to_fill_orders[-1].origin_price
+
+
+async def test_order_fill_callback_backtesting_price_gap():
+    async with _get_tools("BTC/USD", fees=0) as tools:
+        producer, _, exchange_manager = tools
+        # create orders
+        price = 100
+        producer.mode = staggered_orders_trading.StrategyModes.NEUTRAL
+        trading_api.force_set_mark_price(exchange_manager, producer.symbol, price)
+
+        await producer._ensure_staggered_orders()
+        await asyncio.create_task(_wait_for_orders_creation(producer.operational_depth))
+
+        open_orders = trading_api.get_open_orders(exchange_manager)
+        assert len(open_orders) == producer.operational_depth
+        producer.allowed_mirror_orders.set()
+        # price gap: the 5 closest to centre sell orders are filled by the same price update
+        to_fill_orders = sorted(
+            (order for order in open_orders if order.side is trading_enums.TradeOrderSide.SELL),
+            key=lambda order: order.origin_price
+        )[:5]
+        with mock.patch.object(producer, "_create_orders_batch",
+                               mock.AsyncMock(wraps=producer._create_orders_batch)) as create_orders_batch_mock:
+            # fills are notified while the producer is busy: they are waiting in the orders channel queue
+            async with producer.get_lock():
+                for to_fill_order in to_fill_orders:
+                    await to_fill_order.on_fill(force_fill=True)
+                await asyncio_tools.wait_asyncio_next_cycle()
+                create_orders_batch_mock.assert_not_called()
+            for _ in range(10):
+                await asyncio_tools.wait_asyncio_next_cycle()
+            # a single mirror orders pass for the whole sweep
+            create_orders_batch_mock.assert_awaited_once()
+            assert [order.associated_entry_id for order in create_orders_batch_mock.mock_calls[0].args[0]] == \
+                [order.order_id for order in to_fill_orders]
+            assert create_orders_batch_mock.mock_calls[0].args[1] == to_fill_orders[-1].origin_price
+            assert create_orders_batch_mock.mock_calls[0].args[2] is trading_enums.TradeOrderSide.BUY
+        await asyncio.create_task(_wait_for_orders_creation(5))
+        assert producer.pending_mirror_orders == []
+        open_orders = trading_api.get_open_orders(exchange_manager)
+        assert len(open_orders) == producer.operational_depth
+        assert sorted(
+            order.associated_entry_ids[0] for order in open_orders if order.associated_entry_ids
+        ) == sorted(order.order_id for order in to_fill_orders)
+
+
+async def test_create_pending_mirror_orders_during_mirroring_pause():
+    async with _get_tools("BTC/USD", fees=0) as tools:
+        producer, _, exchange_manager = tools
+        producer.pending_mirror_orders = [(
+            staggered_orders_trading.OrderData(trading_enums.TradeOrderSide.BUY, decimal.Decimal(1),
+                                               decimal.Decimal(90), producer.symbol, False),
+            decimal.Decimal(100),
+            0
+        )]
+        producer.allowed_mirror_orders.clear()
+        with mock.patch.object(producer, "_create_orders_batch", mock.AsyncMock()) as create_orders_batch_mock:
+            task = asyncio.create_task(producer._create_pending_mirror_orders_after(0))
+            await _wait_for_orders_creation(3)
+            # producer lock is not held while mirror orders are paused
+            assert not producer.get_lock().locked()
+            create_orders_batch_mock.assert_not_called()
+            producer.allowed_mirror_orders.set()
+            await asyncio.wait_for(task, 1)
+            create_orders_batch_mock.assert_awaited_once()
+        assert producer.pending_mirror_orders == []
+
+
+async def test_order_fill_callback_coalesce_mirror_orders():
+    async with _get_tools("BTC/USD", fees=0) as tools:
+        producer, _, exchange_manager = tools
+        # create orders
+        price = 100
+        producer.mode = staggered_orders_trading.StrategyModes.NEUTRAL
+        trading_api.force_set_mark_price(exchange_manager, producer.symbol, price)
+
+        await producer._ensure_staggered_orders()
+        await asyncio.create_task(_wait_for_orders_creation(producer.operational_depth))
+
+        open_orders = trading_api.get_open_orders(exchange_manager)
+        assert len(open_orders) == producer.operational_depth
+
+        producer.allowed_mirror_orders.set()
+        producer.mirror_order_delay = 0.2
+        # price gap: the 5 closest to centre buy orders are filled at once
+        to_fill_orders = sorted(
+            (order for order in open_orders if order.side is trading_enums.TradeOrderSide.BUY),
+            key=lambda order: order.origin_price
+        )[-5:]
+        in_backtesting = "tentacles.Trading.Mode.staggered_orders_trading_mode.staggered_orders_trading.trading_api.get_is_backtesting"
+        with mock.patch(in_backtesting, return_value=False), \
+             mock.patch.object(producer, "_create_orders_batch",
+                               mock.AsyncMock(wraps=producer._create_orders_batch)) as create_orders_batch_mock:
+            start_time = asyncio.get_event_loop().time()
+            for to_fill_order in to_fill_orders:
+                await _fill_order(to_fill_order, exchange_manager, producer=producer)
+            assert len(producer.pending_mirror_orders) == 5
+            assert len(producer.mirror_orders_tasks) == 5
+            create_orders_batch_mock.assert_not_called()
+            await asyncio.wait_for(asyncio.gather(*producer.mirror_orders_tasks), 5)
+            await asyncio.create_task(_wait_for_orders_creation(5))
+            sweep_handling_time = asyncio.get_event_loop().time() - start_time
+            # all the mirror orders are due at the same time: they are created together
+            create_orders_batch_mock.assert_called_once()
+            assert [order.associated_entry_id for order in create_orders_batch_mock.mock_calls[0].args[0]] == \
+                [order.order_id for order in to_fill_orders]
+            assert create_orders_batch_mock.mock_calls[0].args[1] == to_fill_orders[-1].origin_price
+            assert create_orders_batch_mock.mock_calls[0].args[2] is trading_enums.TradeOrderSide.SELL
+        assert producer.pending_mirror_orders == []
+        # configured delay is respected
+        assert producer.mirror_order_delay <= sweep_handling_time < 1
+        open_orders = trading_api.get_open_orders(exchange_manager)
+        assert len(open_orders) == producer.operational_depth
+        assert sorted(
+            order.associated_entry_ids[0] for order in open_orders if order.associated_entry_ids
+        ) == sorted(order.order_id for order in to_fill_orders)
+
+
+async def test_lock_portfolio_and_create_pending_mirror_orders():
+    async with _get_tools("BTC/USD", fees=0) as tools:
+        producer, _, exchange_manager = tools
+        producer.allowed_mirror_orders.set()
+        now = asyncio.get_event_loop().time()
+        buy_1 = staggered_orders_trading.OrderData(trading_enums.TradeOrderSide.BUY, decimal.Decimal(1),
+                                                   decimal.Decimal(90), producer.symbol, False)
+        sell_1 = staggered_orders_trading.OrderData(trading_enums.TradeOrderSide.SELL, decimal.Decimal(1),
+                                                    decimal.Decimal(110), producer.symbol, False)
+        buy_2 = staggered_orders_trading.OrderData(trading_enums.TradeOrderSide.BUY, decimal.Decimal(1),
+                                                   decimal.Decimal(92), producer.symbol, False)
+        sell_2 = staggered_orders_trading.OrderData(trading_enums.TradeOrderSide.SELL, decimal.Decimal(1),
+                                                    decimal.Decimal(111), producer.symbol, False)
+        producer.pending_mirror_orders = [
+            (buy_1, decimal.Decimal(100), now - 1),
+            (sell_1, decimal.Decimal(98), now - 1),
+            (buy_2, decimal.Decimal(102), now - 1),
+            # not due yet
+            (sell_2, decimal.Decimal(99), now + 10),
+        ]
+        with mock.patch.object(producer, "_create_orders_batch", mock.AsyncMock()) as create_orders_batch_mock:
+            await producer._lock_portfolio_and_create_pending_mirror_orders()
+            # each side uses its own filled prices
+            assert create_orders_batch_mock.mock_calls == [
+                mock.call([buy_1, buy_2], decimal.Decimal(102), trading_enums.TradeOrderSide.BUY),
+                mock.call([sell_1], decimal.Decimal(98), trading_enums.TradeOrderSide.SELL),
+            ]
+        assert producer.pending_mirror_orders == [(sell_2, decimal.Decimal(99), now + 10)]
+
+
 async def test_compute_mirror_order_volume():
     async with _get_tools("BTC/USD", fees=0) as tools:
         producer, _, exchange_manager = tools
@@ -1410,6 +1591,184 @@ async def test_create_new_orders():
         with pytest.raises(KeyError):
             await consumer.create_new_orders(symbol, None, None)
 
+        # orders batch
+        to_create_orders = [
+            staggered_orders_trading.OrderData(side, decimal.Decimal("0.1"), price - i, symbol, False)
+            for i in range(3)
+        ]
+        data = {
+            consumer.ORDERS_DATA_KEY: to_create_orders,
+            consumer.CURRENT_PRICE_KEY: price,
+            consumer.SYMBOL_MARKET_KEY: symbol_market
+        }
+        created_orders = await consumer.create_new_orders(symbol, None, None, data=data)
+        assert [order.origin_price for order in created_orders] == [order.price for order in to_create_orders]
+
+
+async def test_create_orders_concurrently():
+    symbol = "BTC/USD"
+    async with _get_tools(symbol) as tools:
+        producer, consumer, exchange_manager = tools
+        _, _, _, _, symbol_market = await trading_personal_data.get_pre_order_data(exchange_manager,
+                                                                                   symbol=producer.symbol,
+                                                                                   timeout=1)
+        consumer.trading_mode.trading_config[
+            staggered_orders_trading.StaggeredOrdersTradingMode.CONFIG_MAX_CONCURRENT_ORDERS_CREATION
+        ] = 5
+        in_flight_orders = []
+        max_in_flight_orders = 0
+        origin_create_order = consumer.trading_mode.create_order
+
+        async def _latency_create_order(order, *args, **kwargs):
+            nonlocal max_in_flight_orders
+            in_flight_orders.append(order)
+            max_in_flight_orders = max(max_in_flight_orders, len(in_flight_orders))
+            try:
+                # simulated exchange latency
+                await asyncio.sleep(0.05)
+                return await origin_create_order(order, *args, **kwargs)
+            finally:
+                in_flight_orders.remove(order)
+
+        price = decimal.Decimal(1000)
+        to_create_orders = [
+            staggered_orders_trading.OrderData(
+                trading_enums.TradeOrderSide.SELL, decimal.Decimal("0.1"), price + i, symbol, False
+            )
+            for i in range(20)
+        ]
+        with mock.patch.object(consumer.trading_mode, "create_order",
+                               mock.AsyncMock(side_effect=_latency_create_order)) as create_order_mock:
+            start_time = asyncio.get_event_loop().time()
+            created_orders = await consumer.create_orders(to_create_orders, price, symbol_market)
+            # 20 orders with 5 orders in flight: 4 sequential round trips instead of 20
+            assert asyncio.get_event_loop().time() - start_time < 20 * 0.05 / 2
+            assert max_in_flight_orders == 5
+            assert create_order_mock.call_count == 20
+        assert len(created_orders) == 20
+        assert len(trading_api.get_open_orders(exchange_manager)) == 20
+        # created orders funds are all locked: 10 BTC - 20 * 0.1 BTC
+        assert trading_api.get_portfolio_currency(exchange_manager, "BTC").available == decimal.Decimal(8)
+
+        # in flight orders funds are taken into account: only the first 8 BTC can be sold
+        to_create_orders = [
+            staggered_orders_trading.OrderData(
+                trading_enums.TradeOrderSide.SELL, decimal.Decimal(3), price + i, symbol, False
+            )
+            for i in range(3)
+        ]
+        with mock.patch.object(consumer.trading_mode, "create_order",
+                               mock.AsyncMock(side_effect=_latency_create_order)) as create_order_mock:
+            created_orders = await consumer.create_orders(to_create_orders, price, symbol_market)
+            assert create_order_mock.call_count == 2
+        assert len(created_orders) == 2
+
+
+async def test_create_orders_failed_orders():
+    symbol = "BTC/USD"
+    async with _get_tools(symbol) as tools:
+        producer, consumer, exchange_manager = tools
+        _, _, _, _, symbol_market = await trading_personal_data.get_pre_order_data(exchange_manager,
+                                                                                   symbol=producer.symbol,
+                                                                                   timeout=1)
+        origin_create_order = consumer.trading_mode.create_order
+        price = decimal.Decimal(1000)
+
+        async def _failing_create_order(order, *args, **kwargs):
+            if order.origin_price == price + 1:
+                # the order might have been created on the exchange
+                raise trading_errors.FailedRequest("timeout")
+            if order.origin_price == price + 2:
+                raise trading_errors.MissingFunds("exchange error")
+            return await origin_create_order(order, *args, **kwargs)
+
+        to_create_orders = [
+            staggered_orders_trading.OrderData(
+                trading_enums.TradeOrderSide.SELL, decimal.Decimal("0.1"), price + i, symbol, False
+            )
+            for i in range(4)
+        ]
+        with mock.patch.object(consumer.trading_mode, "create_order",
+                               mock.AsyncMock(side_effect=_failing_create_order)) as create_order_mock:
+            created_orders = await consumer.create_orders(to_create_orders, price, symbol_market)
+            # failed orders are not created again to avoid duplicates
+            assert create_order_mock.call_count == 4
+        assert [order.origin_price for order in created_orders] == [price, price + 3]
+
+
+async def test_create_orders_reserved_funds_orders():
+    symbol = "BTC/USD"
+    async with _get_tools(symbol) as tools:
+        producer, consumer, exchange_manager = tools
+        _, _, _, _, symbol_market = await trading_personal_data.get_pre_order_data(exchange_manager,
+                                                                                   symbol=producer.symbol,
+                                                                                   timeout=1)
+        origin_create_order = consumer.trading_mode.create_order
+        price = decimal.Decimal(1000)
+
+        async def _failing_create_order(order, *args, **kwargs):
+            if order.origin_price == price + 1:
+                await asyncio.sleep(0.1)
+                raise trading_errors.FailedRequest("timeout")
+            return await origin_create_order(order, *args, **kwargs)
+
+        # 10 BTC available: 4 + 4 + 4 BTC
+        to_create_orders = [
+            staggered_orders_trading.OrderData(
+                trading_enums.TradeOrderSide.SELL, decimal.Decimal(4), price + i, symbol, False
+            )
+            for i in range(3)
+        ]
+        with mock.patch.object(consumer.trading_mode, "create_order",
+                               mock.AsyncMock(side_effect=_failing_create_order)) as create_order_mock:
+            created_orders = await consumer.create_orders(to_create_orders, price, symbol_market)
+            # 3rd order funds are reserved by the 2nd order: it is created again once the 2nd order failed
+            assert create_order_mock.call_count == 3
+            assert [call.args[0].origin_price for call in create_order_mock.mock_calls] == \
+                [price, price + 1, price + 2]
+        # created orders are returned in the requested order
+        assert [order.origin_price for order in created_orders] == [price, price + 2]
+
+
+async def test_create_orders_releases_registered_orders_funds():
+    symbol = "BTC/USD"
+    async with _get_tools(symbol) as tools:
+        producer, consumer, exchange_manager = tools
+        _, _, _, _, symbol_market = await trading_personal_data.get_pre_order_data(exchange_manager,
+                                                                                   symbol=producer.symbol,
+                                                                                   timeout=1)
+        consumer.trading_mode.trading_config[
+            staggered_orders_trading.StaggeredOrdersTradingMode.CONFIG_MAX_CONCURRENT_ORDERS_CREATION
+        ] = 2
+        origin_create_order = consumer.trading_mode.create_order
+        registered_event = asyncio.Event()
+        price = decimal.Decimal(1000)
+
+        async def _create_order(order, *args, **kwargs):
+            if order.origin_price == price:
+                created_order = await origin_create_order(order, *args, **kwargs)
+                # order is registered and its funds are locked but its creation is not over yet
+                registered_event.set()
+                await asyncio.sleep(0.1)
+                return created_order
+            await registered_event.wait()
+            return await origin_create_order(order, *args, **kwargs)
+
+        # 10 BTC available: 4 + 4 + 2 BTC
+        to_create_orders = [
+            staggered_orders_trading.OrderData(
+                trading_enums.TradeOrderSide.SELL, quantity, price + i, symbol, False
+            )
+            for i, quantity in enumerate((decimal.Decimal(4), decimal.Decimal(4), decimal.Decimal(2)))
+        ]
+        with mock.patch.object(consumer.trading_mode, "create_order",
+                               mock.AsyncMock(side_effect=_create_order)) as create_order_mock:
+            created_orders = await consumer.create_orders(to_create_orders, price, symbol_market)
+            # the 3rd order is created while the 1st one is still being created: its funds are not counted twice
+            assert create_order_mock.call_count == 3
+        assert [order.origin_price for order in created_orders] == [price, price + 1, price + 2]
+        assert trading_api.get_portfolio_currency(exchange_manager, "BTC").available == trading_constants.ZERO
+
 
 async def test_ensure_current_price_in_limit_parameters():
     symbol = "BTC/USD"